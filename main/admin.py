@@ -1,3 +1,42 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DatasetRelease, SlowTile
+
+
+# 느린 타일 (main/slow_tiles.py 가 기록) — 읽기 전용, 느린 순
+@admin.register(SlowTile)
+class SlowTileAdmin(admin.ModelAdmin):
+    list_display = ("duration_ms", "db_ms", "endpoint", "z", "x", "y", "query", "size", "features", "has_explain", "created")
+    list_filter = ("endpoint", "z")
+    search_fields = ("endpoint", "layers", "query")
+    date_hierarchy = "created"
+    readonly_fields = [f.name for f in SlowTile._meta.fields]
+
+    @admin.display(boolean=True, description="EXPLAIN")
+    def has_explain(self, obj):
+        return bool(obj.explain)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# 데이터셋 릴리스 (manage.py swap_dataset 이 기록) — 읽기 전용
+@admin.register(DatasetRelease)
+class DatasetReleaseAdmin(admin.ModelAdmin):
+    list_display = ("name", "version", "table", "active", "changed_tiles", "activated")
+    list_filter = ("name", "active")
+    readonly_fields = [f.name for f in DatasetRelease._meta.fields]
+    exclude = ("tiles",)
+
+    @admin.display(description="changed tiles")
+    def changed_tiles(self, obj):
+        return "all" if obj.tiles is None else len(obj.tiles)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,21 @@
+# main/async_urls.py
+# settings.ASYNC_VIEWS=True (ASGI 배포) 일 때 main/urls.py 보다 먼저 include 되어
+# 타일/이격/VWorld 경로를 비동기 뷰로 가로챈다. 나머지(TileJSON, 페이지)는 main/urls.py 그대로.
+from django.urls import path, re_path
+
+from . import async_views
+from .vector_layers import LAYERS
+
+urlpatterns = [
+    path("api/geocode/", async_views.vworld_geocode),
+    path("vwtiles/<str:layer>/<int:z>/<int:y>/<int:x>.<str:ext>", async_views.vworld_wmts_proxy),
+
+    path("tiles/composite/<int:z>/<int:x>/<int:y>.pbf", async_views.composite_tile),
+
+    re_path(r'^geojson/road_setback/?$', async_views.road_setback_geojson),
+    re_path(r'^geojson/resi_setback/?$', async_views.resi_setback_geojson),
+] + [
+    # 레이어 레지스트리와 같은 경로 (이격은 url_path 에 <int:dist> 포함)
+    path(f"tiles/{cls.url_path}/<int:z>/<int:x>/<int:y>.pbf", async_views.layer_tile, {"layer_id": layer_id})
+    for layer_id, cls in LAYERS.items()
+]
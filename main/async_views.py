@@ -0,0 +1,291 @@
+# main/async_views.py
+# ASGI 전용 비동기 뷰 — settings.ASYNC_VIEWS=True 일 때 main/async_urls.py 가 같은 URL 로 연결
+#  - DB: psycopg AsyncConnectionPool (main/db_pool.py)
+#  - 외부 API: httpx.AsyncClient (main/vworld.py)
+#  - 레이어별 동시 실행 수 제한(ASYNC_LAYER_CONCURRENCY) — 느린 레이어가 풀을 독점하지 않게
+# 레이어 SQL 생성(queryset 컴파일, 아카이브 조회)은 동기 코드라 sync_to_async 로 감싼다.
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseServerError,
+    JsonResponse, StreamingHttpResponse,
+)
+from vectortiles import settings as vt_settings
+
+from . import coverage, lean, metrics, slow_tiles, tile_archive, tile_http, vworld, wmts_cache
+from .db_pool import aopen_server_cursor, get_async_pool
+from .mvt import feature_count
+from .setbacks import parse_dist, setback_features_sql
+from .vector_layers import LAYERS, VECTOR_LAYERS, union_tile_sql
+from .views import (
+    FEATURE_COLLECTION_HEAD, FEATURE_COLLECTION_TAIL, GEOJSON_FETCH_SIZE,
+    composite_layer_ids, setback_geojson_args, tile_cache_key, wmts_timing,
+)
+
+_semaphores = {}
+
+
+def _limit(name):
+    sem = _semaphores.get(name)
+    if sem is None:
+        sem = _semaphores[name] = asyncio.Semaphore(getattr(settings, "ASYNC_LAYER_CONCURRENCY", 4))
+    return sem
+
+
+async def _fetch_tile(layer_id, sql, params):
+    async with _limit(layer_id):
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            cur = await conn.execute(sql, params, prepare=True)
+            row = (await cur.fetchone())[0]
+    return bytes(row) if row else b""
+
+
+# ---------------------------------------------------------------------
+# MVT
+# ---------------------------------------------------------------------
+def _make_layers(layer_classes, request, z, dist=None):
+    layers = []
+    for cls in layer_classes:
+        lyr = cls()
+        lyr.request = request
+        lyr.zoom = z
+        if dist is not None:
+            lyr.dist = dist
+        layers.append(lyr)
+    return layers
+
+
+def _cache_key(layers, z, x, y):
+    """(캐시 키, 데이터 버전) — 동기 뷰와 같은 정규화 키 + 타일 버전"""
+    version = tile_http.dataset_version(layers)
+    return f"a{tile_cache_key(layers, z, x, y)}:v={tile_http.tile_version(layers, z, x, y)}", version
+
+
+def _prepare(layers, z, x, y):
+    """(아카이브 타일 bytes 목록, [(레이어 id, (sql, params)), ...])"""
+    archived, parts = [], []
+    for lyr in layers:
+        if not lyr.check_in_zoom_levels(z) or not coverage.may_contain(lyr.id, z, x, y):
+            continue
+        data = (
+            tile_archive.read_tile(lyr.id, z, x, y, tile_http.dataset_version([lyr]))
+            if lyr.is_archivable() and not lyr.is_lean() else None
+        )
+        if data is None:
+            parts.append((lyr.id, lyr.get_tile_sql(x, y, z)))
+        else:
+            archived.append(data)
+    return archived, parts
+
+
+async def _tile_response(request, layer_classes, z, x, y, dist=None, label=None):
+    content_type = vt_settings.VECTOR_TILES_CONTENT_TYPE
+    label = label or ",".join(c.id for c in layer_classes)
+    if dist is None and await sync_to_async(coverage.tile_is_empty)([c.id for c in layer_classes], z, x, y):
+        metrics.count_cache(label, "empty")
+        return coverage.empty_tile_response(content_type)
+    timing = metrics.start()
+    layers = _make_layers(layer_classes, request, z, dist)
+    with metrics.phase("cache"):
+        cache_key, version = await sync_to_async(_cache_key)(layers, z, x, y)
+        cached = await cache.aget(cache_key)
+    content, parts = None, []
+    if cached is None:
+        with metrics.phase("encode", exclude=("db",)):
+            archived, parts = await sync_to_async(_prepare)(layers, z, x, y)
+            # 라이브 레이어는 각자 커넥션으로 병렬 실행 (db 는 병렬 구간의 경과 시간)
+            with metrics.phase("db"):
+                rendered = await asyncio.gather(*(_fetch_tile(lid, sql, params) for lid, (sql, params) in parts))
+            content = b"".join(archived + list(rendered))
+        # 압축은 CPU 작업 — 이벤트 루프 밖에서
+        cached = await sync_to_async(tile_http.cache_entry, thread_sensitive=False)(content)
+        with metrics.phase("cache"):
+            await cache.aset(cache_key, cached, min(lyr.cache_ttl for lyr in layers))
+    metrics.count_cache(label, "miss" if content is not None else "hit")
+    response = tile_http.tile_response(request, cached, version, content_type)
+    metrics.observe(label, timing, content=content)
+    if content is not None:
+        lean.sample_savings(layers, z, x, y)
+    if parts and slow_tiles.is_slow(timing):
+        queries = [q for _, q in parts]
+        slow_tiles.check(
+            label, timing, request, queries[0] if len(queries) == 1 else union_tile_sql(queries),
+            layers=[lyr.id for lyr in layers], z=z, x=x, y=y,
+            size=len(content), features=feature_count(content),
+        )
+    return metrics.with_server_timing(response, timing)
+
+
+async def layer_tile(request, layer_id, z, x, y, dist=None):
+    cls = LAYERS.get(layer_id)
+    if cls is None:
+        raise Http404("unknown layer")
+    if dist is not None:
+        try:
+            parse_dist(dist)
+        except Exception:
+            return HttpResponseBadRequest("invalid dist")
+    return await _tile_response(request, [cls], z, x, y, dist=dist)
+
+
+async def composite_tile(request, z, x, y):
+    layer_ids = composite_layer_ids(request)
+    if not layer_ids:
+        return HttpResponseBadRequest("invalid layers")
+    return await _tile_response(request, [VECTOR_LAYERS[lid] for lid in layer_ids], z, x, y, label="composite")
+
+
+# ---------------------------------------------------------------------
+# 이격 GeoJSON (비동기 스트리밍)
+# ---------------------------------------------------------------------
+class _AsyncFeatureStream:
+    """
+    views._FeatureStream 의 비동기판 — release() 가 커서/커넥션/세마포어를 한 번만 돌려준다.
+    __iter__ 가 없어 StreamingHttpResponse 는 비동기 이터레이터로 쓰고, close() 는 resource closer 로
+    등록된다. ASGI 핸들러는 response.close() 를 sync_to_async 스레드에서 부르므로 async_to_sync 로 정리한다.
+    """
+    def __init__(self, cur, release, first_rows, done):
+        self.cur, self.release, self.first_rows, self.done = cur, release, first_rows, done
+        self.size, self.features = len(FEATURE_COLLECTION_HEAD) + len(FEATURE_COLLECTION_TAIL), 0
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            yield FEATURE_COLLECTION_HEAD
+            rows, sep = self.first_rows, ""
+            while rows:
+                chunk = sep + ",".join(r[0] for r in rows)
+                self.size += len(chunk)
+                self.features += len(rows)
+                yield chunk
+                sep = ","
+                rows = await self.cur.fetchmany(GEOJSON_FETCH_SIZE)
+            yield FEATURE_COLLECTION_TAIL
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.release()
+        finally:
+            self.done(self.size, self.features)
+
+    def close(self):
+        if not self.closed:
+            async_to_sync(self.aclose)()
+
+
+async def setback_geojson(request, kind):
+    try:
+        dist, bbox, dissolve, z = setback_geojson_args(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if bbox is None:
+        return JsonResponse({"type": "FeatureCollection", "features": []})
+
+    label = f"{kind}_setback_geojson"
+    timing = metrics.start()
+    with metrics.phase("encode"):
+        sql, params = await sync_to_async(setback_features_sql)(kind, dist, bbox, dissolve=dissolve, z=z)
+    # 세마포어 → 커넥션 → 커서(트랜잭션) 순으로 잡고, 중간에 실패/취소되면 잡은 것만 되돌린다
+    sem = _limit(label)
+    await sem.acquire()
+    try:
+        with metrics.phase("db"):
+            cur, close = await aopen_server_cursor(sql, params, name="setback_geojson")
+    except Exception as e:
+        sem.release()
+        return JsonResponse({"error": f"DB error: {e}"}, status=500)
+    except BaseException:
+        sem.release()
+        raise
+
+    async def release():
+        try:
+            await close()
+        finally:
+            sem.release()
+
+    try:
+        with metrics.phase("db"):
+            first_rows = await cur.fetchmany(GEOJSON_FETCH_SIZE)
+    except Exception as e:
+        await release()
+        return JsonResponse({"error": f"DB error: {e}"}, status=500)
+    except BaseException:
+        await release()
+        raise
+
+    def done(size, features):
+        metrics.observe(label, timing, size=size, features=features)
+        slow_tiles.check(label, timing, request, (sql, params), layers=[f"{kind}_setback"],
+                         size=size, features=features)
+
+    response = StreamingHttpResponse(
+        _AsyncFeatureStream(cur, release, first_rows, done),
+        content_type="application/json",
+    )
+    return metrics.with_server_timing(response, timing)
+
+
+async def road_setback_geojson(request):
+    return await setback_geojson(request, "road")
+
+
+async def resi_setback_geojson(request):
+    return await setback_geojson(request, "resi")
+
+
+# ---------------------------------------------------------------------
+# VWorld 프록시
+# ---------------------------------------------------------------------
+async def vworld_geocode(request):
+    query = request.GET.get("q")
+    addr_type = request.GET.get("type", "ROAD")
+    key = settings.VWORLD_KEY
+
+    if not key:
+        return JsonResponse({"error": "VWORLD_KEY is not set"}, status=500)
+    if not query:
+        return JsonResponse({"error": "missing query"}, status=400)
+    timing = metrics.start()
+    try:
+        async with _limit("vworld_geocode"):
+            result = await vworld.get_geocoder().ageocode(query, addr_type, key)
+        response = JsonResponse(result)
+    except Exception as e:
+        response = JsonResponse({"error": str(e)}, status=502)
+    metrics.observe("vworld_geocode", timing, size=len(response.content))
+    return metrics.with_server_timing(response, timing)
+
+
+async def vworld_wmts_proxy(request, layer, z, y, x, ext):
+    key = getattr(settings, "VWORLD_KEY", "")
+    if not key:
+        return HttpResponseServerError("VWORLD_KEY not set")
+    if layer not in wmts_cache.LAYERS or ext not in wmts_cache.EXTS:
+        return HttpResponseBadRequest("invalid layer/ext")
+    timing = metrics.start()
+    try:
+        async with _limit("vworld_wmts"):
+            t0 = timing.elapsed()
+            # 타일 한 장은 작으므로 스레드에서 통째로 읽어 응답 (비동기 경로에서 동기 파일 이터레이터 회피)
+            body, ctype, status, state = await wmts_cache.get_cache().aread_tile(layer, z, y, x, ext, key)
+    except Exception as e:
+        return HttpResponseServerError(str(e))
+    wmts_timing(timing, state, timing.elapsed() - t0)
+    if body is None:
+        resp = HttpResponse(status=status, content_type=ctype)
+    else:
+        resp = HttpResponse(body, content_type=ctype or "image/png")
+        resp["Cache-Control"] = "public, max-age=86400"
+        resp["X-Tile-Cache"] = state
+    metrics.observe("vworld_wmts", timing, size=len(body) if body is not None else None)
+    return metrics.with_server_timing(resp, timing)
@@ -0,0 +1,244 @@
+# main/bench.py
+# 타일 렌더링 벤치마크 — 합성 fixture + 측정 대상/통계
+#   load_bench_fixture : filter 스키마와 같은 모양의 결정적 합성 데이터를 적재
+#   bench_tiles        : 레이어/이격/복합 경로를 z10~18, 밀도(dense/sparse/empty)별로 측정
+# fixture 는 난수 대신 hashtext(i) 로 속성/모양을 정하므로 몇 번을 적재해도 같은 데이터다.
+import math
+import time
+
+import mercantile
+from django.db import connection
+from django.test import RequestFactory
+
+from .models import (
+    OwnerRaw, OwnerSubdiv, Jimok, Yongdo, Road, ResiSetback,
+    Nonglim, NongupJinheung, JayeonNogji, GaebalJingheung, NongupSeisanGiban,
+)
+from .mvt import feature_count
+from .setbacks import setback_features_sql
+from .tables import table_name
+from .vector_layers import LAYERS, VECTOR_LAYERS, fetch_tile, union_tile_sql
+
+# fixture 범위 (lon/lat) — 서쪽 절반은 조밀, 동쪽 절반은 필지 20%
+FIXTURE_BOUNDS = (126.80, 36.40, 126.92, 36.50)
+# 데이터가 없는 범위 (서해)
+EMPTY_BOUNDS = (125.95, 36.40, 126.07, 36.50)
+
+PARCEL_STEP = 50  # m, 필지 격자 간격 (--scale 로 조절)
+
+# 용도지역 fixture: 모델 -> (개수, 최소 반경 m, 최대 반경 m)
+ZONING_FIXTURE = {
+    Yongdo:            (40, 300, 1500),
+    Nonglim:           (30, 400, 1500),
+    NongupJinheung:    (20, 300, 1000),
+    JayeonNogji:       (15, 200, 800),
+    GaebalJingheung:   (5, 100, 300),     # 작은 조각
+    NongupSeisanGiban: (20, 200, 900),
+}
+
+GEOM_TYPES = {
+    "MULTIPOLYGON": "MultiPolygon",
+    "POLYGON": "Polygon",
+    "MULTILINESTRING": "MultiLineString",
+    "LINESTRING": "LineString",
+}
+
+
+def _h(salt):
+    """i 와 salt 로 정해지는 0 이상 정수 (SQL 식)"""
+    return f"abs(hashtext(i || ':{salt}')::bigint)"
+
+
+def _mod(expr, n):
+    # SQL 의 % 는 파라미터 자리표시자와 겹치므로 mod() 로 쓴다
+    return f"mod({expr}, {n})"
+
+
+# ---------------------------------------------------------------------
+# fixture
+# ---------------------------------------------------------------------
+def fixture_table(model):
+    return f'filter."{table_name(model._meta.db_table)}"'
+
+
+def create_table_sql(model):
+    cols = []
+    for f in model._meta.concrete_fields:
+        if f.name == "geom":
+            cols.append(f'geom geometry({GEOM_TYPES[f.geom_type]}, {f.srid})')
+        elif f.get_internal_type() == "IntegerField":
+            cols.append(f'"{f.column}" integer' + (" PRIMARY KEY" if f.primary_key else ""))
+        else:
+            cols.append(f'"{f.column}" text')
+    return f"CREATE TABLE {fixture_table(model)} ({', '.join(cols)})"
+
+
+FIXTURE_MODELS = (
+    OwnerRaw, OwnerSubdiv, Jimok, Yongdo, Road, ResiSetback,
+    Nonglim, NongupJinheung, JayeonNogji, GaebalJingheung, NongupSeisanGiban,
+)
+
+
+def fixture_statements(extent, scale=1.0):
+    """extent = 5186 (xmin, ymin, xmax, ymax) -> [(sql, params), ...]"""
+    xmin, ymin, xmax, ymax = extent
+    step = PARCEL_STEP / math.sqrt(scale)
+    nx, ny = int((xmax - xmin) // step), int((ymax - ymin) // step)
+    w, hgt = xmax - xmin, ymax - ymin
+    stmts = []
+
+    # 필지(소유) — 팔각형~원형 (정점 수 다양), 동쪽 절반은 20% 만
+    stmts.append((f"""
+        INSERT INTO {fixture_table(OwnerRaw)} (gid, a2, a5, a20, a8, geom)
+        SELECT i + 1,
+               ({_mod(_h('n'), 900)} + 1)::text,
+               {_mod(_h('s'), 20)}::text,
+               (ARRAY['전','답','임','대','도','구','잡'])[{_mod(_h('j'), 7)} + 1],
+               (ARRAY['개인','국유지','도유지','군유지','법인','종중'])[{_mod(_h('o'), 6)} + 1],
+               ST_Multi(ST_Buffer(
+                 ST_SetSRID(ST_MakePoint(%s + (mod(i, %s) + 0.5) * %s, %s + (i / %s + 0.5) * %s), 5186),
+                 %s * 0.45, 'quad_segs=' || ({_mod(_h('q'), 8)} + 2)))
+        FROM generate_series(0, %s - 1) AS i
+        WHERE mod(i, %s) < %s / 2 OR {_mod(_h('d'), 5)} = 0""",
+        [xmin, nx, step, ymin, nx, step, step, nx * ny, nx, nx]))
+    stmts.append((f"""
+        INSERT INTO {fixture_table(OwnerSubdiv)} (gid, a20, a8, geom)
+        SELECT gid, a20, a8, geom FROM {fixture_table(OwnerRaw)}""", []))
+    stmts.append((f"""
+        INSERT INTO {fixture_table(Jimok)} (gid, pnu, jibun, a20, geom)
+        SELECT gid, '4413' || lpad(gid::text, 15, '0'), a2 || '-' || a5 || a20, a20, geom
+        FROM {fixture_table(OwnerRaw)}""", []))
+
+    # 용도지역 — 원형 조각
+    for model, (count, rmin, rmax) in ZONING_FIXTURE.items():
+        stmts.append((f"""
+            INSERT INTO {fixture_table(model)} (gid, geom)
+            SELECT i + 1, ST_Multi(ST_Buffer(
+                     ST_SetSRID(ST_MakePoint(%s + {_mod(_h('x'), 10000)} / 10000.0 * %s,
+                                             %s + {_mod(_h('y'), 10000)} / 10000.0 * %s), 5186),
+                     %s + {_mod(_h('r'), 1000)} / 1000.0 * %s, 16))
+            FROM generate_series(0, %s - 1) AS i""",
+            [xmin, w, ymin, hgt, rmin, rmax - rmin, count]))
+
+    # 도로 — 400m 간격 가로/세로 polyline (정점 20개, 흔들림)
+    stmts.append((f"""
+        INSERT INTO {fixture_table(Road)} (gid, geom)
+        SELECT k + 1, ST_Multi(ST_MakeLine(pt ORDER BY j))
+        FROM (
+          SELECT k, j, CASE WHEN mod(k, 2) = 0
+                   THEN ST_SetSRID(ST_MakePoint(%s + j * %s / 19.0, %s + (k / 2) * 400 + mod(hashtext(k || ':' || j), 20)), 5186)
+                   ELSE ST_SetSRID(ST_MakePoint(%s + (k / 2) * 400 + mod(hashtext(k || ':' || j), 20), %s + j * %s / 19.0), 5186)
+                 END AS pt
+          FROM generate_series(0, %s - 1) AS k, generate_series(0, 19) AS j
+        ) AS p
+        GROUP BY k""",
+        [xmin, w, ymin, xmin, ymin, hgt, 2 * int(max(w, hgt) // 400)]))
+
+    # 주거(건물) — 12~22m 사각형
+    stmts.append((f"""
+        INSERT INTO {fixture_table(ResiSetback)} (gid, geom)
+        SELECT i + 1, ST_Multi(ST_Expand(
+                 ST_SetSRID(ST_MakePoint(%s + {_mod(_h('x'), 10000)} / 10000.0 * %s,
+                                         %s + {_mod(_h('y'), 10000)} / 10000.0 * %s), 5186),
+                 6 + {_mod(_h('r'), 5)}))
+        FROM generate_series(0, %s - 1) AS i""",
+        [xmin, w, ymin, hgt, int(3000 * scale)]))
+    return stmts
+
+
+# ---------------------------------------------------------------------
+# 측정 대상
+# ---------------------------------------------------------------------
+DENSITIES = {
+    "dense": (FIXTURE_BOUNDS[0], FIXTURE_BOUNDS[1],
+              (FIXTURE_BOUNDS[0] + FIXTURE_BOUNDS[2]) / 2, FIXTURE_BOUNDS[3]),
+    "sparse": ((FIXTURE_BOUNDS[0] + FIXTURE_BOUNDS[2]) / 2, FIXTURE_BOUNDS[1],
+               FIXTURE_BOUNDS[2], FIXTURE_BOUNDS[3]),
+    "empty": EMPTY_BOUNDS,
+}
+
+
+def sample_tiles(bounds, z, count):
+    """bounds 안 타일을 고르게 count 개 (결정적)"""
+    tiles = sorted(mercantile.tiles(*bounds, zooms=[z]), key=lambda t: (t.x, t.y))
+    stride = max(1, len(tiles) // count)
+    return tiles[::stride][:count]
+
+
+def _layer(cls, params=None, dist=None):
+    lyr = cls()
+    lyr.request = RequestFactory().get("/", params or {})
+    if dist is not None:
+        lyr.dist = dist
+    return lyr
+
+
+def _mvt(layers):
+    def run(z, x, y):
+        live = []
+        for lyr in layers:
+            lyr.zoom = z
+            if lyr.check_in_zoom_levels(z):
+                live.append(lyr.get_tile_sql(x, y, z))
+        if not live:
+            return b""
+        return fetch_tile(*(live[0] if len(live) == 1 else union_tile_sql(live)))
+    return run
+
+
+def _geojson(kind, dist):
+    def run(z, x, y):
+        b = mercantile.bounds(x, y, z)
+        sql, params = setback_features_sql(kind, dist, (b.west, b.south, b.east, b.north), z=z)
+        with connection.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        return rows
+    return run
+
+
+def targets(dists=(100,)):
+    """{이름: (종류, fn(z, x, y))} — 종류 mvt 는 bytes, geojson 은 Feature 행 목록을 돌려준다"""
+    result = {lid: ("mvt", _mvt([_layer(cls)])) for lid, cls in VECTOR_LAYERS.items()}
+    result["owner[jm=답,전]"] = ("mvt", _mvt([_layer(VECTOR_LAYERS["owner"], {"jm": "답,전"})]))
+    result["owner[lean]"] = ("mvt", _mvt([_layer(VECTOR_LAYERS["owner"], {"lean": "1"})]))
+    result["jimok[lean]"] = ("mvt", _mvt([_layer(VECTOR_LAYERS["jimok"], {"lean": "1"})]))
+    for dist in dists:
+        for cls in (LAYERS["road_setback"], LAYERS["resi_setback"]):
+            result[f"{cls.id}/{dist}"] = ("mvt", _mvt([_layer(cls, dist=dist)]))
+            result[f"{cls.id}/{dist}?dissolve=1"] = ("mvt", _mvt([_layer(cls, {"dissolve": "1"}, dist)]))
+        for kind in ("road", "resi"):
+            result[f"geojson/{kind}_setback/{dist}"] = ("geojson", _geojson(kind, dist))
+    result["composite[all]"] = ("mvt", _mvt([_layer(cls) for cls in VECTOR_LAYERS.values()]))
+    return result
+
+
+def measure(kind, fn, z, x, y):
+    """(ms, bytes, features)"""
+    t0 = time.perf_counter()
+    out = fn(z, x, y)
+    ms = (time.perf_counter() - t0) * 1000
+    if kind == "mvt":
+        return ms, len(out), feature_count(out)
+    return ms, sum(len(r[0]) for r in out), len(out)
+
+
+def percentile(values, p):
+    """nearest-rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples):
+    """[(ms, bytes, features), ...] -> dict"""
+    ms = [s[0] for s in samples]
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+        "bytes_mean": round(sum(s[1] for s in samples) / len(samples), 1),
+        "features_mean": round(sum(s[2] for s in samples) / len(samples), 1),
+    }
@@ -0,0 +1,222 @@
+# main/coverage.py
+# 레이어별 타일 커버리지 인덱스 — 데이터가 없는 타일은 PostGIS 를 건너뛴다
+#  - 기준 줌(z14)에서 geometry 가 걸치는 타일 (x, y) 집합을 만들어
+#    {COVERAGE_DIR}/{layer_id}.json 에 저장 (manage.py build_coverage 또는 자동 재생성)
+#  - z14 미만은 부모 타일 피라미드, z14 이상은 조상 z14 타일로 판정
+#  - 타일 버퍼(tile_buffer/tile_extent)만큼 넓혀 판정하므로 경계 선/면이 잘리지 않는다
+#  - 원본 테이블이 다시 적재되면(pg_class oid/relfilenode, pg_stat 행 변경 수) 지문이
+#    달라져 인덱스를 쓰지 않고 백그라운드에서 다시 만든다
+import json
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+from .tables import table_fingerprint, table_name
+from .vector_layers import LOD_LEVELS, VECTOR_LAYERS
+
+COVERAGE_ZOOM = 14
+HALF_WORLD = 20037508.342789244  # EPSG:3857 반경
+
+_indexes = {}       # layer_id -> CoverageIndex (또는 None)
+_checked = {}       # layer_id -> 마지막 지문 확인 시각
+_building = set()   # 백그라운드 재생성 중인 layer_id
+_lock = threading.Lock()
+
+
+def coverage_path(layer_id):
+    return os.path.join(settings.COVERAGE_DIR, f"{layer_id}.json")
+
+
+def buffer_fraction(cls):
+    return cls.tile_buffer / cls.tile_extent
+
+
+class CoverageIndex:
+    def __init__(self, tiles, fingerprint, zoom=COVERAGE_ZOOM, buffer=256 / 4096):
+        self.fingerprint = fingerprint
+        self.zoom = zoom
+        self.buffer = buffer
+        self.base = frozenset((x, y) for x, y in tiles)
+        self.pyramid = self._build_pyramid()
+
+    def _span(self, i, z):
+        """z 줌 타일 중 버퍼 포함 범위가 기준 줌 타일 i 와 겹치는 것들 (한 축)"""
+        s = 1 << (self.zoom - z)
+        x = i // s
+        return [c for c in (x - 1, x, x + 1)
+                if 0 <= c < (1 << z) and (c - self.buffer) * s < i + 1 and (c + 1 + self.buffer) * s > i]
+
+    def _build_pyramid(self):
+        pyramid = {}
+        for z in range(self.zoom):
+            tiles = pyramid[z] = set()
+            for i, j in self.base:
+                for x in self._span(i, z):
+                    for y in self._span(j, z):
+                        tiles.add((x, y))
+        return pyramid
+
+    def may_contain(self, z, x, y):
+        if z < self.zoom:
+            return (x, y) in self.pyramid[z]
+        # 버퍼 포함 범위가 걸치는 기준 줌 타일 중 하나라도 있으면 렌더링
+        s = 1 << (z - self.zoom)
+        lo_x, hi_x = math.floor((x - self.buffer) / s), math.floor((x + 1 + self.buffer) / s)
+        lo_y, hi_y = math.floor((y - self.buffer) / s), math.floor((y + 1 + self.buffer) / s)
+        return any(
+            (i, j) in self.base
+            for i in range(lo_x, hi_x + 1)
+            for j in range(lo_y, hi_y + 1)
+        )
+
+    def to_json(self):
+        return {"zoom": self.zoom, "buffer": self.buffer, "fingerprint": self.fingerprint,
+                "tiles": sorted(self.base)}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["tiles"], data["fingerprint"], data["zoom"], data["buffer"])
+
+
+# ---------------------------------------------------------------------
+# 생성
+# ---------------------------------------------------------------------
+def source_table(layer_id):
+    return table_name(VECTOR_LAYERS[layer_id].model._meta.db_table)
+
+
+def lod_margin(cls):
+    """LOD 단순화 허용오차(m) 최대값 — 단순화본이 원본 밖으로 나가는 만큼 여유"""
+    levels = LOD_LEVELS.get(cls.lod_key, (None, ()))[1]
+    return max((tol for _, tol in levels), default=0)
+
+
+def touched_tiles(geom_sql, margin=0, zoom=COVERAGE_ZOOM):
+    """
+    geom_sql(5186 geom 컬럼 하나를 돌려주는 SELECT)의 geometry 가 margin(m, 5186 기준) 안에서
+    걸치는 zoom 타일 (x, y) 목록
+    """
+    size = 2 * HALF_WORLD / (1 << zoom)
+    n = 1 << zoom
+    with connection.cursor() as cur:
+        cur.execute(f"""
+            WITH src AS ({geom_sql}), g AS (
+                SELECT ST_Expand(ST_Transform(ST_Subdivide(geom, 256), 3857), %(m)s) AS g
+                FROM src WHERE geom IS NOT NULL AND NOT ST_IsEmpty(geom)
+            ), b AS (
+                SELECT GREATEST(floor((ST_XMin(g) + %(h)s) / %(s)s)::int, 0) AS x0,
+                       LEAST(floor((ST_XMax(g) + %(h)s) / %(s)s)::int, %(n)s - 1) AS x1,
+                       GREATEST(floor((%(h)s - ST_YMax(g)) / %(s)s)::int, 0) AS y0,
+                       LEAST(floor((%(h)s - ST_YMin(g)) / %(s)s)::int, %(n)s - 1) AS y1
+                FROM g
+            )
+            SELECT DISTINCT x, y
+            FROM b, generate_series(b.x0, b.x1) AS x, generate_series(b.y0, b.y1) AS y""",
+            # 3857 은 충남 위도에서 약 1.25배 늘어나므로 여유도 같이 늘린다
+            {"m": margin * 1.25, "h": HALF_WORLD, "s": size, "n": n},
+        )
+        return cur.fetchall()
+
+
+def build_index(layer_id, zoom=COVERAGE_ZOOM):
+    cls = VECTOR_LAYERS[layer_id]
+    name = source_table(layer_id)
+    fingerprint = table_fingerprint(name)
+    if fingerprint is None:
+        raise LookupError(f"filter.{name} 없음")
+    tiles = touched_tiles(f'SELECT geom FROM filter."{name}"', lod_margin(cls), zoom)
+    return CoverageIndex(tiles, fingerprint, zoom, buffer_fraction(cls))
+
+
+def save_index(layer_id, index):
+    os.makedirs(settings.COVERAGE_DIR, exist_ok=True)
+    path = coverage_path(layer_id)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index.to_json(), f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_index(layer_id):
+    try:
+        with open(coverage_path(layer_id), encoding="utf-8") as f:
+            return CoverageIndex.from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def rebuild(layer_id):
+    index = build_index(layer_id)
+    save_index(layer_id, index)
+    with _lock:
+        _indexes[layer_id] = index
+        _checked[layer_id] = time.monotonic()
+    return index
+
+
+def _rebuild_in_background(layer_id):
+    def run():
+        try:
+            rebuild(layer_id)
+        except Exception:
+            pass
+        finally:
+            connection.close()
+            with _lock:
+                _building.discard(layer_id)
+
+    with _lock:
+        if layer_id in _building:
+            return
+        _building.add(layer_id)
+    threading.Thread(target=run, name=f"coverage-{layer_id}", daemon=True).start()
+
+
+# ---------------------------------------------------------------------
+# 조회 (타일 뷰)
+# ---------------------------------------------------------------------
+def get_index(layer_id):
+    """지문이 맞는 인덱스, 없거나 낡았으면 None (→ 평소처럼 렌더링)"""
+    if not getattr(settings, "COVERAGE_DIR", None) or layer_id not in VECTOR_LAYERS:
+        return None
+    now = time.monotonic()
+    if now - _checked.get(layer_id, -math.inf) < settings.COVERAGE_CHECK_SECONDS:
+        return _indexes.get(layer_id)
+
+    _checked[layer_id] = now
+    index = _indexes.get(layer_id) or load_index(layer_id)
+    try:
+        fingerprint = table_fingerprint(source_table(layer_id))
+    except Exception:
+        fingerprint = None
+    if index is not None and fingerprint is not None and index.fingerprint != fingerprint:
+        # 다른 프로세스가 이미 새로 만들었을 수 있다
+        index = load_index(layer_id)
+    if index is None or fingerprint is None or index.fingerprint != fingerprint:
+        index = None
+        if fingerprint is not None and settings.COVERAGE_AUTO_REBUILD:
+            _rebuild_in_background(layer_id)
+    _indexes[layer_id] = index
+    return index
+
+
+def may_contain(layer_id, z, x, y):
+    index = get_index(layer_id)
+    return index is None or index.may_contain(z, x, y)
+
+
+def tile_is_empty(layer_ids, z, x, y):
+    """모든 레이어가 이 타일에 데이터가 없다고 확인되면 True"""
+    return bool(layer_ids) and not any(may_contain(lid, z, x, y) for lid in layer_ids)
+
+
+def empty_tile_response(content_type):
+    """확인된 빈 타일 — DB 없이 204, 브라우저/CDN 에 오래 캐시"""
+    response = HttpResponse(status=204, content_type=content_type)
+    response["Cache-Control"] = f"public, max-age={settings.EMPTY_TILE_MAX_AGE}"
+    return response
@@ -0,0 +1,239 @@
+# main/datasets.py
+# 데이터셋 릴리스 레지스트리 — 논리 이름(owner, road, ...) -> 현재 물리 테이블 (filter 스키마)
+#  - 월별 원본은 테이블명에 릴리스 날짜가 붙는다 (..._202508). 코드에는 기본 릴리스(RELEASE_TABLES)만 두고
+#    새 릴리스는 manage.py swap_dataset 으로 레지스트리(DatasetRelease)에 올린다.
+#  - 활성 릴리스가 바뀌면 모델 _meta.db_table 을 새 테이블로 다시 묶는다
+#    (프로세스마다 TILE_VERSION_CHECK_SECONDS 주기로 확인)
+#  - 릴리스마다 바뀐 geometry 가 걸친 z14 타일 목록을 남긴다. 타일 서버 캐시 키의 버전은
+#    "이 타일을 마지막으로 건드린 릴리스" 라서, 교체 뒤에도 안 바뀐 타일은 캐시를 그대로 쓴다.
+#    TileJSON ?v= (브라우저 immutable 캐시)는 활성 릴리스 버전을 쓴다.
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+SCHEMA = "filter"
+
+# 기본 릴리스 (레지스트리에 행이 없을 때) — 논리 이름은 레이어 id 와 같게
+RELEASE_TABLES = {
+    "owner": "1.2_ownerinfo_chungnam_al_d160_44_20250907_combined",
+    "yongdo": "1.7_yongdo_lsmd_cont_uq112_44_202508",
+    "road": "3.4_road_lsmd_cont_ui101_44_202508",
+    "resi": "3.4_f_fac_building_44_202509",
+    "nonglim": "1.7.2_nonglim_al_d126_00_20250904",
+    "nongupjinheung": "1.7.2.1_nongupjinheung_al_d036_00_20250904",
+    "jayeonnogji": "1.7.4_jayeon_al_d127_00_20250904",
+    "gaebaljingheung": "1.7.5_gaebaljingeuing_al_d137_00_20250904",
+    "nongupseisangiban": "1.7.6_nongup_etc_al_d035_00_20250904",
+}
+
+_lock = threading.Lock()
+_state = {
+    "at": -math.inf,   # 마지막 확인 시각
+    "last_id": None,   # 레지스트리 최신 릴리스 id (바뀌었을 때만 다시 읽는다)
+    "active": {},      # 논리 이름 -> 활성 DatasetRelease
+    "history": {},     # 논리 이름 -> [(릴리스, 변경 타일 CoverageIndex 또는 None=전체), ...] 최신 순
+}
+
+
+def db_table(name):
+    """models.py Meta.db_table — 기본 릴리스"""
+    return f'"{SCHEMA}"."{RELEASE_TABLES[name]}"'
+
+
+def dataset_models():
+    from .models import (
+        GaebalJingheung, JayeonNogji, Nonglim, NongupJinheung, NongupSeisanGiban,
+        OwnerRaw, ResiSetback, Road, Yongdo,
+    )
+    return {
+        "owner": OwnerRaw, "yongdo": Yongdo, "road": Road, "resi": ResiSetback,
+        "nonglim": Nonglim, "nongupjinheung": NongupJinheung, "jayeonnogji": JayeonNogji,
+        "gaebaljingheung": GaebalJingheung, "nongupseisangiban": NongupSeisanGiban,
+    }
+
+
+# ---------------------------------------------------------------------
+# 레지스트리 읽기 (프로세스 캐시)
+# ---------------------------------------------------------------------
+def refresh(force=False):
+    now = time.monotonic()
+    if not force and now - _state["at"] < settings.TILE_VERSION_CHECK_SECONDS:
+        return
+    _state["at"] = now
+    from .models import DatasetRelease
+
+    try:
+        last_id = DatasetRelease.objects.order_by("-id").values_list("id", flat=True).first()
+        if last_id == _state["last_id"] and not force:
+            return
+        releases = list(DatasetRelease.objects.order_by("name", "-id"))
+    except Exception:
+        # 마이그레이션 전 — 기본 릴리스로
+        return
+    _load(releases, last_id)
+
+
+def _load(releases, last_id):
+    from .coverage import CoverageIndex
+
+    active, history = {}, {}
+    for rel in releases:
+        if rel.active:
+            active[rel.name] = rel
+        index = None if rel.tiles is None else CoverageIndex(rel.tiles, rel.version, rel.zoom)
+        history.setdefault(rel.name, []).append((rel, index))
+    with _lock:
+        _state.update(last_id=last_id, active=active, history=history)
+    _bind()
+
+
+def _bind():
+    """모델 Meta.db_table 을 활성 릴리스 테이블로 (쿼리는 실행 때마다 _meta 를 읽는다)"""
+    for name, model in dataset_models().items():
+        model._meta.db_table = f'"{SCHEMA}"."{physical_table(name)}"'
+
+
+def physical_table(name):
+    rel = _state["active"].get(name)
+    return rel.table if rel is not None else RELEASE_TABLES[name]
+
+
+def qualified(name):
+    """SQL 에 바로 쓰는 filter."테이블" """
+    refresh()
+    return f'{SCHEMA}."{physical_table(name)}"'
+
+
+def dataset_for_table(table):
+    """물리 테이블 -> 레지스트리에 활성 릴리스가 있는 논리 이름 (없으면 None)"""
+    for name, rel in _state["active"].items():
+        if rel.table == table:
+            return name
+    return None
+
+
+def release_token(table):
+    """활성 릴리스 버전 (TileJSON ?v=, Cache-Control) — 레지스트리 밖 테이블이면 None"""
+    name = dataset_for_table(table)
+    if name is None:
+        return None
+    rel = _state["active"][name]
+    return f"{name}@{rel.version}#{rel.id}"
+
+
+def tile_token(table, z, x, y):
+    """
+    (논리 이름, 이 타일을 마지막으로 건드린 릴리스 id) — 레지스트리 밖 테이블이면 None.
+    물리 테이블명 대신 논리 이름을 쓰므로 교체해도 안 건드린 타일의 캐시 키는 그대로다.
+    """
+    name = dataset_for_table(table)
+    if name is None:
+        return None
+    history = _state["history"].get(name, ())
+    for rel, index in history:
+        if index is None or index.may_contain(z, x, y):
+            return name, rel.id
+    # 남아 있는 가장 오래된 릴리스 (그 이전 기록은 DATASET_RELEASE_KEEP 로 지워짐)
+    return name, history[-1][0].id
+
+
+# ---------------------------------------------------------------------
+# 릴리스 교체 (swap_dataset)
+# ---------------------------------------------------------------------
+def table_columns(table, schema=SCHEMA):
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = %s",
+            [schema, table],
+        )
+        return {r[0] for r in cur.fetchall()}
+
+
+def missing_columns(name, table, schema=SCHEMA):
+    """모델이 읽는 컬럼 중 새 테이블에 없는 것"""
+    model = dataset_models()[name]
+    return sorted({f.column for f in model._meta.concrete_fields} - table_columns(table, schema))
+
+
+def affected_layers(name):
+    """이 데이터셋을 원본 모델로 쓰는 레이어 id"""
+    from .vector_layers import VECTOR_LAYERS
+
+    model = dataset_models()[name]
+    return [lid for lid, cls in VECTOR_LAYERS.items() if cls.model is model]
+
+
+def change_margin(name):
+    """바뀐 geometry 주변으로 타일 내용이 달라질 수 있는 거리 (m) — LOD 허용오차, 이격거리"""
+    from .coverage import lod_margin
+    from .setbacks import MAX_DIST, SETBACK_SOURCES
+    from .vector_layers import VECTOR_LAYERS
+
+    margin = max((lod_margin(VECTOR_LAYERS[lid]) for lid in affected_layers(name)), default=0)
+    if name in SETBACK_SOURCES.values():
+        margin = max(margin, MAX_DIST)
+    return margin
+
+
+def changed_index(name, old, new):
+    """old -> new (스키마 포함 테이블) 에서 바뀐 feature 가 걸친 타일 (coverage.CoverageIndex)"""
+    from .coverage import CoverageIndex, touched_tiles
+
+    tiles = touched_tiles(changed_geometry_sql(name, old, new), change_margin(name))
+    return CoverageIndex(tiles, new)
+
+
+def changed_geometry_sql(name, old, new):
+    """
+    두 릴리스(스키마 포함 테이블)에서 행 내용(모델 컬럼 + geometry)이 다른 feature 의 geom (양쪽 모두) SELECT.
+    gid 가 다시 매겨지면 전부 바뀐 것으로 잡힌다 — 그래도 결과는 맞다.
+    """
+    model = dataset_models()[name]
+    cols = ", ".join(
+        "ST_AsEWKB(t.geom)" if f.column == "geom" else f't."{f.column}"'
+        for f in model._meta.concrete_fields
+    )
+    row_hash = f"md5(ROW({cols})::text)"
+    return f"""
+        WITH o AS (SELECT {row_hash} AS h, t.geom FROM {old} AS t),
+             n AS (SELECT {row_hash} AS h, t.geom FROM {new} AS t),
+             gone AS (SELECT h FROM o EXCEPT SELECT h FROM n),
+             added AS (SELECT h FROM n EXCEPT SELECT h FROM o)
+        SELECT o.geom FROM o JOIN gone USING (h)
+        UNION ALL
+        SELECT n.geom FROM n JOIN added USING (h)"""
+
+
+def activate(name, table, version, tiles, zoom):
+    """새 활성 릴리스 기록. tiles=None 이면 전체 무효화 (바뀐 범위를 모를 때)."""
+    from django.db import transaction
+    from .models import DatasetRelease
+
+    with transaction.atomic():
+        previous = DatasetRelease.objects.filter(name=name, active=True).first()
+        DatasetRelease.objects.filter(name=name, active=True).update(active=False)
+        rel = DatasetRelease.objects.create(
+            name=name, table=table, version=version, zoom=zoom, active=True,
+            previous_table=previous.table if previous else RELEASE_TABLES[name],
+            tiles=None if tiles is None else sorted(tiles),
+        )
+    keep = getattr(settings, "DATASET_RELEASE_KEEP", 12)
+    old_ids = list(DatasetRelease.objects.filter(name=name).order_by("-id").values_list("id", flat=True)[keep:])
+    if old_ids:
+        DatasetRelease.objects.filter(id__in=old_ids).delete()
+    refresh(force=True)
+    return rel
+
+
+def invalidate_archives(name, index):
+    """교체 후 이 데이터셋 레이어의 아카이브 타일 중 바뀐 것 삭제 -> {레이어 id: 지운 타일 수}"""
+    from . import tile_archive, tile_http
+    from .vector_layers import VECTOR_LAYERS
+
+    return {
+        lid: tile_archive.invalidate(lid, index, tile_http.dataset_version([VECTOR_LAYERS[lid]()]))
+        for lid in affected_layers(name)
+    }
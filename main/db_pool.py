@@ -0,0 +1,247 @@
+# main/db_pool.py
+# PostGIS 커넥션 풀 (psycopg 3 / psycopg_pool)
+#  - 동기(WSGI) 타일/이격 경로용 ConnectionPool, 비동기(ASGI)용 AsyncConnectionPool
+#  - 타일 SQL 은 prepare=True 로 실행 → 커넥션마다 한 번만 PREPARE 하고 재사용
+#    (SQL 문자열은 레이어/LOD 테이블별로 고정, 타일 좌표/필터만 파라미터)
+#  - 접속 정보는 settings.DATABASES["default"] 를 그대로 사용
+import asyncio
+import threading
+
+from django.conf import settings
+from django.db import connection
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from . import metrics
+
+# 커넥션당 준비해 둘 문장 수 (레이어 x LOD 단계 x 필터 조합)
+PREPARED_MAX = 256
+
+
+def conninfo(alias="default"):
+    db = settings.DATABASES[alias]
+    return make_conninfo(
+        dbname=db["NAME"],
+        user=db.get("USER") or None,
+        password=db.get("PASSWORD") or None,
+        host=db.get("HOST") or None,
+        port=db.get("PORT") or None,
+    )
+
+
+def _configure(conn):
+    conn.prepared_max = PREPARED_MAX
+
+
+async def _aconfigure(conn):
+    conn.prepared_max = PREPARED_MAX
+
+
+def _pool_kwargs():
+    return {
+        "min_size": getattr(settings, "DB_POOL_MIN_SIZE", 2),
+        "max_size": getattr(settings, "DB_POOL_MAX_SIZE", 20),
+        "timeout": getattr(settings, "DB_POOL_TIMEOUT", 10),
+        "kwargs": {"autocommit": True},
+    }
+
+
+# ---------------------------------------------------------------------
+# 동기 풀 (프로세스당 하나)
+# ---------------------------------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled():
+    return getattr(settings, "TILE_DB_POOL", False)
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(conninfo(), configure=_configure, name="tiles", **_pool_kwargs())
+    return _pool
+
+
+def fetch_one(sql, params):
+    """단일 값 SELECT (타일 bytea). 풀이 꺼져 있으면 Django 커넥션 사용."""
+    with metrics.phase("db"):
+        if not pool_enabled():
+            with connection.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchone()[0]
+        with get_pool().connection() as conn:
+            return conn.execute(sql, params, prepare=True).fetchone()[0]
+
+
+def _stream_cursor(conn, name):
+    """
+    트랜잭션 안의 이름 있는 커서 -> (cursor, end).
+    autocommit 커넥션에서 이름 있는 커서는 WITH HOLD 가 되어 COMMIT 때 결과 전체를 먼저 만들어 둔다
+    (첫 fetchmany 가 쿼리 완료까지 밀리고 메모리/임시파일이 결과 크기만큼) → 잠깐 autocommit 을 끄고
+    end() 에서 ROLLBACK(읽기 전용이라 끝내기만) 후 되돌린다. 이미 트랜잭션 중이면 그대로 쓴다.
+    """
+    own_tx = conn.autocommit
+    if own_tx:
+        conn.autocommit = False
+    try:
+        cur = conn.cursor(name=name)
+    except Exception:
+        if own_tx:
+            conn.autocommit = True
+        raise
+
+    def end():
+        try:
+            cur.close()
+        finally:
+            if own_tx:
+                try:
+                    conn.rollback()
+                finally:
+                    conn.autocommit = True
+
+    return cur, end
+
+
+def open_server_cursor(sql, params, name="stream"):
+    """
+    서버사이드(이름 있는) 커서를 트랜잭션 안에서 열어 실행까지 한 뒤 (cursor, close) 반환.
+    close() 는 커서를 닫고 트랜잭션을 끝낸 뒤 커넥션을 풀에 돌려준다 (두 번 불러도 된다).
+    """
+    if not pool_enabled():
+        # Django 커넥션의 psycopg 커넥션을 직접 — chunked_cursor() 는 autocommit 이면 WITH HOLD
+        connection.ensure_connection()
+        conn, release = connection.connection, None
+    else:
+        pool = get_pool()
+        conn = pool.getconn()
+        release = pool.putconn
+
+    try:
+        cur, end = _stream_cursor(conn, name)
+    except Exception:
+        if release:
+            release(conn)
+        raise
+
+    closed = []
+
+    def close():
+        if closed:
+            return
+        closed.append(True)
+        try:
+            end()
+        finally:
+            if release:
+                release(conn)
+
+    try:
+        cur.execute(sql, params)
+    except Exception:
+        close()
+        raise
+    return cur, close
+
+
+def _stats_of(pool):
+    stats = pool.get_stats()
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    queued = stats.get("requests_queued", 0)
+    stats["in_use"] = in_use
+    stats["saturation"] = round(in_use / pool.max_size, 4) if pool.max_size else 0.0
+    stats["avg_wait_ms"] = round(stats.get("requests_wait_ms", 0) / queued, 2) if queued else 0.0
+    return stats
+
+
+def pool_stats():
+    """풀 포화도/대기시간 — /api/dbpool/stats/"""
+    return {
+        "sync": _stats_of(_pool) if _pool is not None else None,
+        "async": _stats_of(_async_pool) if _async_pool is not None else None,
+    }
+
+
+# ---------------------------------------------------------------------
+# 비동기 풀 (이벤트 루프당 하나, 첫 요청 때 연다)
+# ---------------------------------------------------------------------
+_async_pool = None
+_async_opening = None
+
+
+async def _open_async_pool():
+    global _async_pool
+    pool = AsyncConnectionPool(
+        conninfo(), configure=_aconfigure, open=False, name="tiles-async", **_pool_kwargs()
+    )
+    await pool.open()
+    _async_pool = pool
+    return pool
+
+
+async def get_async_pool():
+    global _async_opening
+    if _async_pool is not None:
+        return _async_pool
+    if _async_opening is None:
+        _async_opening = asyncio.ensure_future(_open_async_pool())
+    return await _async_opening
+
+
+async def _astream_cursor(conn, name):
+    """_stream_cursor 의 비동기판 (AsyncConnection) -> (cursor, async end)"""
+    own_tx = conn.autocommit
+    if own_tx:
+        await conn.set_autocommit(False)
+    try:
+        cur = conn.cursor(name=name)
+    except Exception:
+        if own_tx:
+            await conn.set_autocommit(True)
+        raise
+
+    async def end():
+        try:
+            await cur.close()
+        finally:
+            if own_tx:
+                try:
+                    await conn.rollback()
+                finally:
+                    await conn.set_autocommit(True)
+
+    return cur, end
+
+
+async def aopen_server_cursor(sql, params, name="stream"):
+    """open_server_cursor 의 비동기판 — 비동기 풀에서 -> (cursor, async close)"""
+    pool = await get_async_pool()
+    conn = await pool.getconn()
+    try:
+        cur, end = await _astream_cursor(conn, name)
+    except BaseException:
+        await pool.putconn(conn)
+        raise
+
+    closed = []
+
+    async def close():
+        if closed:
+            return
+        closed.append(True)
+        try:
+            await end()
+        finally:
+            await pool.putconn(conn)
+
+    try:
+        await cur.execute(sql, params)
+    except BaseException:
+        # 취소(CancelledError)여도 커넥션은 돌려준다
+        await close()
+        raise
+    return cur, close
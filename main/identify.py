@@ -0,0 +1,138 @@
+# main/identify.py
+# 지점/PNU 식별 — 필지 + 소유 속성 + 걸친 용도지역 + 도로/주거 이격 거리를 SQL 한 번에
+#   타일에는 필터/스타일용 속성만 싣고, 상세(지번 a2/a5 등)는 클릭 시 여기서 가져온다.
+#   결과는 PNU 단위로 캐시 (키에 관련 테이블 버전 포함 → 재적재 시 자동 무효화)
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from . import datasets, tile_http
+from .models import Jimok
+from .setbacks import MAX_DIST, SETBACK_SOURCES, STANDARD_DISTANCES, source_table
+from .suitability import RESULT_NAME, RESULT_TABLE
+from .tables import table_exists, table_name
+from .vector_layers import VECTOR_LAYERS
+
+# 필지와 겹치는 gid 를 돌려줄 용도지역 레이어
+ZONING_LAYERS = ("yongdo", "nonglim", "nongupjinheung", "jayeonnogji", "gaebaljingheung", "nongupseisangiban")
+
+JIMOK_TABLE = f'filter."{table_name(Jimok._meta.db_table)}"'
+
+
+def _owner_table():
+    # 원본 소유 데이터셋은 릴리스마다 테이블이 바뀐다 (main/datasets.py)
+    return datasets.qualified("owner")
+
+
+def _zoning_tables():
+    return {lid: f'filter."{table_name(VECTOR_LAYERS[lid].model._meta.db_table)}"' for lid in ZONING_LAYERS}
+
+
+def source_tables():
+    names = [table_name(JIMOK_TABLE), table_name(_owner_table())]
+    names += [table_name(t) for t in _zoning_tables().values()]
+    names += [table_name(source_table(kind)) for kind in SETBACK_SOURCES]
+    if table_exists(RESULT_NAME):
+        names.append(RESULT_NAME)
+    return names
+
+
+def identify_sql(pnu=None, lon=None, lat=None):
+    """필지 하나에 대한 JSON 텍스트 한 행 (없으면 0행)"""
+    if pnu is not None:
+        parcel_where, params = "j.pnu = %s", [pnu]
+    else:
+        parcel_where = "ST_Intersects(j.geom, ST_Transform(ST_SetSRID(ST_MakePoint(%s, %s), 4326), 5186))"
+        params = [lon, lat]
+
+    zoning = ", ".join(
+        f"'{lid}', (SELECT COALESCE(json_agg(z.gid ORDER BY z.gid), '[]'::json) "
+        f"FROM {table} AS z WHERE ST_Intersects(z.geom, p.geom))"
+        for lid, table in _zoning_tables().items()
+    )
+    # 원천 geom 에서 필지까지 최소 거리 (MAX_DIST 밖이면 NULL)
+    distances = ", ".join(
+        f"'{kind}', (SELECT min(ST_Distance(s.geom, p.geom)) FROM {source_table(kind)} AS s "
+        f"WHERE ST_DWithin(s.geom, p.geom, %s))"
+        for kind in SETBACK_SOURCES
+    )
+    params += [MAX_DIST] * len(SETBACK_SOURCES)
+
+    suitability = "NULL::json"
+    if table_exists(RESULT_NAME):
+        suitability = (
+            f"(SELECT json_object_agg(s.scenario, s.usable_area) FROM {RESULT_TABLE} AS s "
+            f"WHERE s.pnu = p.pnu AND s.scenario NOT LIKE '%%\\_\\_new')"
+        )
+
+    sql = f"""
+        WITH p AS (
+          SELECT j.gid, j.pnu, j.jibun, j.a20, j.geom
+          FROM {JIMOK_TABLE} AS j
+          WHERE {parcel_where}
+          LIMIT 1
+        )
+        SELECT json_build_object(
+                 'parcel', json_build_object(
+                   'gid', p.gid, 'pnu', p.pnu, 'jibun', p.jibun, 'a20', p.a20,
+                   'area', round(ST_Area(p.geom)::numeric, 1),
+                   'centroid', ST_AsGeoJSON(ST_Transform(ST_PointOnSurface(p.geom), 4326), 7)::json
+                 ),
+                 'owner', (
+                   SELECT json_build_object('a2', o.a2, 'a5', o.a5, 'a20', o.a20, 'a8', o.a8)
+                   FROM {_owner_table()} AS o
+                   WHERE ST_Intersects(o.geom, ST_PointOnSurface(p.geom))
+                   LIMIT 1
+                 ),
+                 'zoning', json_build_object({zoning}),
+                 'setback_distance', json_build_object({distances}),
+                 'suitability', {suitability}
+               )::text
+        FROM p
+    """
+    return sql, params
+
+
+def _with_setbacks(result):
+    """이격 거리 → 해당 필지에 걸치는 표준 이격거리 목록 (예: 도로 80m 이면 [100, 200, 300])"""
+    result["setbacks"] = {
+        kind: [d for d in STANDARD_DISTANCES if dist is not None and dist <= d]
+        for kind, dist in result["setback_distance"].items()
+    }
+    return result
+
+
+def _run(sql, params):
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        row = cur.fetchone()
+    return None if row is None else _with_setbacks(json.loads(row[0]))
+
+
+def _cache_key(pnu):
+    return f"identify:{pnu}:v={tile_http.tables_version(source_tables())}"
+
+
+def _store(result):
+    pnu = result["parcel"]["pnu"]
+    if pnu:
+        cache.set(_cache_key(pnu), result, settings.IDENTIFY_CACHE_TIMEOUT)
+    return result
+
+
+def identify_pnu(pnu):
+    key = _cache_key(pnu)
+    result = cache.get(key)
+    if result is None:
+        result = _run(*identify_sql(pnu=pnu))
+        if result is not None:
+            _store(result)
+    return result
+
+
+def identify_point(lon, lat):
+    # 좌표로는 PNU 를 모르므로 조회 후 결과를 PNU 키로 캐시 (이후 ?pnu= 는 캐시 적중)
+    result = _run(*identify_sql(lon=lon, lat=lat))
+    return None if result is None else _store(result)
@@ -0,0 +1,103 @@
+# main/lean.py
+# 경량 타일 모드 (?lean=1) — 레이어 설정 LAYER_CONFIG[...]["lean"]
+#  - 빈 문자열 속성은 NULL 로 (ST_AsMVT 는 NULL 속성을 싣지 않는다)
+#  - 레이어 설정의 drop 속성(클릭 시 /api/identify/ 로 보는 상세)은 빼기
+#  - 범주 속성(a20 지목, a8 소유구분)은 정수 코드로 — 코드표는 TileJSON vector_layers[].codes
+#    코드표에 없는 값은 "{속성}_s" 에 원래 문자열로 (클라이언트는 둘 중 있는 쪽을 쓴다)
+#  - 저줌은 tile extent 를 낮춰 좌표 정밀도/varint 크기를 줄인다 (LEAN_EXTENT)
+#  - 일부 타일은 백그라운드에서 전체 모드로도 렌더링해 레이어별 절감 bytes 를 /metrics 로
+import copy
+import random
+import threading
+
+from django.conf import settings
+
+from . import metrics
+
+# 지목 28종 (공간정보관리법 시행령 제58조)
+JIMOK_CODES = (
+    "전", "답", "과수원", "목장용지", "임야", "광천지", "염전", "대", "공장용지", "학교용지",
+    "주차장", "주유소용지", "창고용지", "도로", "철도용지", "제방", "하천", "구거", "유지", "양어장",
+    "수도용지", "공원", "체육용지", "유원지", "종교용지", "사적지", "묘지", "잡종지",
+)
+# 소유구분
+OWNER_CODES = (
+    "개인", "국유지", "도유지", "군유지", "시유지", "법인", "종중", "종교단체", "기타단체", "외국인", "기타",
+)
+
+# (이 줌 이하, extent) — 나머지 줌은 레이어 tile_extent (4096)
+LEAN_EXTENT = ((11, 1024), (13, 2048))
+
+_TEXT_FIELDS = ("TextField", "CharField")
+
+
+def requested(request):
+    return request is not None and request.GET.get("lean") in ("1", "true")
+
+
+def extent_for(zoom, spec, default):
+    for max_zoom, extent in spec.get("extent", LEAN_EXTENT):
+        if zoom is not None and zoom <= max_zoom:
+            return min(extent, default)
+    return default
+
+
+def tile_fields(fields, spec):
+    return tuple(f for f in fields if f not in spec.get("drop", ()))
+
+
+def wrap_sql(sql, params, model, fields, spec):
+    """
+    레이어 feature SELECT(속성 + geom_prepared)를 감싸 경량 속성으로 바꾼 (sql, params).
+    컬럼 이름은 그대로 두므로 ST_AsMVT 의 속성 키도 같다.
+    """
+    codes = spec.get("codes", {})
+    cols, extra = [], []
+    for f in fields:
+        col = f's."{f}"'
+        if f in codes:
+            cols.append(f'array_position(%s::text[], {col}) - 1 AS "{f}"')
+            cols.append(f'CASE WHEN array_position(%s::text[], {col}) IS NULL THEN NULLIF({col}, \'\') END AS "{f}_s"')
+            extra += [list(codes[f]), list(codes[f])]
+        elif model._meta.get_field(f).get_internal_type() in _TEXT_FIELDS:
+            cols.append(f'NULLIF({col}, \'\') AS "{f}"')
+        else:
+            cols.append(col)
+    cols.append("s.geom_prepared")
+    # 바깥 SELECT 의 자리표시자가 안쪽 SQL 보다 앞에 온다
+    return f"SELECT {', '.join(cols)} FROM ({sql}) AS s", extra + list(params)
+
+
+def tilejson_codes(spec):
+    return {f: list(values) for f, values in spec.get("codes", {}).items()}
+
+
+# ---------------------------------------------------------------------
+# 절감량 표본 — 경량 타일을 렌더링한 요청 중 LEAN_SAVINGS_SAMPLE 비율만
+# ---------------------------------------------------------------------
+def sample_savings(layers, z, x, y):
+    rate = getattr(settings, "LEAN_SAVINGS_SAMPLE", 0.02)
+    targets = [lyr for lyr in layers if lyr.is_lean()]
+    if not targets or random.random() >= rate:
+        return False
+    threading.Thread(target=_measure, args=(targets, z, x, y), daemon=True).start()
+    return True
+
+
+def _measure(layers, z, x, y):
+    from django.db import connection
+    from .vector_layers import fetch_tile
+
+    try:
+        for lyr in layers:
+            full = copy.copy(lyr)
+            full.lean_override = False
+            lean_bytes = len(fetch_tile(*lyr.get_tile_sql(x, y, z)))
+            full_bytes = len(fetch_tile(*full.get_tile_sql(x, y, z)))
+            metrics.LEAN_BYTES.inc((lyr.id, "lean"), lean_bytes)
+            metrics.LEAN_BYTES.inc((lyr.id, "full"), full_bytes)
+            metrics.LEAN_BYTES.inc((lyr.id, "saved"), full_bytes - lean_bytes)
+    except Exception:
+        pass
+    finally:
+        connection.close()
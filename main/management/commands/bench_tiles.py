@@ -0,0 +1,110 @@
+# main/management/commands/bench_tiles.py
+# 타일 렌더링 벤치마크 — load_bench_fixture 로 적재한 DB 에서 실행
+#   대상: VECTOR_LAYERS 각 레이어, owner 필터, 도로/주거 이격 MVT(+dissolve)·GeoJSON, 복합 타일
+#   줌(기본 10~18) x 밀도(dense/sparse/empty) 마다 p50/p95 지연, 평균 bytes/feature 수
+#   서버 캐시/아카이브/커버리지를 거치지 않고 SQL 렌더링 경로만 잰다.
+#
+# 예) DB_NAME=autosolar_bench python manage.py bench_tiles --output bench/base.json
+#     DB_NAME=autosolar_bench python manage.py bench_tiles --targets owner,composite[all] \
+#         --compare bench/base.json --fail-over 20
+import datetime
+import json
+import os
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main import bench
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "레이어/이격/복합 타일 렌더링 지연·크기·feature 수 측정 → JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--targets", default="", help="쉼표 구분 대상 이름 (기본: 전체)")
+        parser.add_argument("--minzoom", type=int, default=10)
+        parser.add_argument("--maxzoom", type=int, default=18)
+        parser.add_argument("--densities", default=",".join(bench.DENSITIES))
+        parser.add_argument("--tiles", type=int, default=8, help="줌/밀도당 타일 수")
+        parser.add_argument("--repeat", type=int, default=3, help="타일당 반복 횟수")
+        parser.add_argument("--dists", default="100,75", help="이격거리 (표준/비표준)")
+        parser.add_argument("--output", default="bench_results.json")
+        parser.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+        parser.add_argument("--fail-over", type=float, default=None,
+                            help="p95 가 이 %% 이상 느려진 항목이 있으면 실패")
+
+    def handle(self, *args, **opts):
+        try:
+            dists = [int(d) for d in opts["dists"].split(",") if d.strip()]
+        except ValueError:
+            raise CommandError("invalid --dists")
+        all_targets = bench.targets(dists)
+        names = [v.strip() for v in opts["targets"].split(",") if v.strip()] or list(all_targets)
+        unknown = [n for n in names if n not in all_targets]
+        if unknown:
+            raise CommandError(f"unknown targets: {', '.join(unknown)} (가능: {', '.join(all_targets)})")
+        densities = [d.strip() for d in opts["densities"].split(",") if d.strip()]
+        if any(d not in bench.DENSITIES for d in densities):
+            raise CommandError("invalid --densities")
+
+        results = []
+        for name in names:
+            kind, fn = all_targets[name]
+            for z in range(opts["minzoom"], opts["maxzoom"] + 1):
+                for density in densities:
+                    tiles = bench.sample_tiles(bench.DENSITIES[density], z, opts["tiles"])
+                    fn(z, tiles[0].x, tiles[0].y)  # 워밍업 (prepare, 캐시)
+                    samples = [
+                        bench.measure(kind, fn, z, t.x, t.y)
+                        for t in tiles for _ in range(opts["repeat"])
+                    ]
+                    row = {"target": name, "zoom": z, "density": density, **bench.summarize(samples)}
+                    results.append(row)
+                    self.stdout.write(
+                        f"{name:<32} z{z:<2} {density:<6} p50 {row['p50_ms']:>9.2f}ms "
+                        f"p95 {row['p95_ms']:>9.2f}ms {row['bytes_mean']:>10.0f}B {row['features_mean']:>8.1f}f"
+                    )
+
+        report = {
+            "meta": {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "git": _git_rev(),
+                "database": connection.settings_dict["NAME"],
+                "tiles": opts["tiles"], "repeat": opts["repeat"], "dists": dists,
+            },
+            "results": results,
+        }
+        if os.path.dirname(opts["output"]):
+            os.makedirs(os.path.dirname(opts["output"]), exist_ok=True)
+        with open(opts["output"], "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        self.stdout.write(self.style.SUCCESS(f"saved {opts['output']}"))
+
+        if opts["compare"]:
+            self.compare(opts["compare"], results, opts["fail_over"])
+
+    def compare(self, path, results, fail_over):
+        with open(path, encoding="utf-8") as f:
+            base = {(r["target"], r["zoom"], r["density"]): r for r in json.load(f)["results"]}
+        regressions = []
+        self.stdout.write(f"\nvs {path} (p50 / p95 변화율)")
+        for r in results:
+            b = base.get((r["target"], r["zoom"], r["density"]))
+            if b is None:
+                continue
+            d50, d95 = (
+                (r[k] - b[k]) / b[k] * 100 if b[k] else 0.0 for k in ("p50_ms", "p95_ms")
+            )
+            self.stdout.write(f"{r['target']:<32} z{r['zoom']:<2} {r['density']:<6} {d50:+7.1f}% {d95:+7.1f}%")
+            if fail_over is not None and d95 > fail_over:
+                regressions.append(f"{r['target']} z{r['zoom']} {r['density']} ({d95:+.1f}%)")
+        if regressions:
+            raise CommandError("p95 regression: " + ", ".join(regressions))
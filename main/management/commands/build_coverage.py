@@ -0,0 +1,33 @@
+# main/management/commands/build_coverage.py
+# 레이어별 타일 커버리지 인덱스 생성 → {COVERAGE_DIR}/{layer_id}.json
+#   타일 뷰는 여기서 비어 있다고 확인된 타일을 DB 조회 없이 204 로 돌려준다.
+#   원본 테이블을 다시 적재하면 서버가 지문 변화를 보고 알아서 다시 만들지만,
+#   적재 직후 바로 반영하려면 이 커맨드를 실행한다.
+#
+# 예) python manage.py build_coverage
+#     python manage.py build_coverage --layers gaebaljingheung,nonglim
+from django.core.management.base import BaseCommand, CommandError
+
+from main import coverage
+from main.vector_layers import VECTOR_LAYERS
+
+
+class Command(BaseCommand):
+    help = "레이어별 z14 타일 커버리지 인덱스 (재)생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="", help="쉼표 구분 레이어 id (기본: 전체)")
+
+    def handle(self, *args, **opts):
+        layer_ids = [v.strip() for v in opts["layers"].split(",") if v.strip()] or list(VECTOR_LAYERS)
+        unknown = [lid for lid in layer_ids if lid not in VECTOR_LAYERS]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+
+        for lid in layer_ids:
+            try:
+                index = coverage.rebuild(lid)
+            except LookupError as e:
+                self.stderr.write(f"{lid}: {e}")
+                continue
+            self.stdout.write(f"{lid}: z{index.zoom} {len(index.base)} tiles")
@@ -0,0 +1,78 @@
+# main/management/commands/build_filter_indexes.py
+# 필터 컬럼 + geom 복합 GiST 인덱스 (btree_gist) + 조회용 btree 인덱스
+#   owner 타일의 ?jm= / ?own= 필터는 a20 / a8 IN (...) AND geom && 타일범위 로 실행된다.
+#   (a20, geom) 인덱스가 있으면 고른 범주의 행만 공간 탐색하므로
+#   체크박스 조합이 바뀌어도 전체 owner 테이블을 훑지 않는다.
+#
+# 예) python manage.py build_filter_indexes
+#     python manage.py build_filter_indexes --layers owner
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main import tables
+from main.models import FILTER_COLUMNS
+from main.vector_layers import LOD_MODELS, SUBDIV_MODELS, VECTOR_LAYERS
+
+# 필터 외 조회용 btree 인덱스 (테이블명, 컬럼) — /api/identify/?pnu=
+LOOKUP_INDEXES = (
+    ("jimok", "pnu"),
+)
+
+
+def filter_index_ddl(table, columns, index_prefix=None, schema="filter"):
+    """
+    [(인덱스명, CREATE INDEX sql), ...] — table 은 schema(기본 filter)의 테이블명.
+    인덱스명은 tables.index_name 으로 만든다 (긴 릴리스 테이블명도 63바이트 안).
+    """
+    prefix = index_prefix or table
+    names = [tables.index_name(prefix, f"{col}_geom_gix") for col in columns]
+    return [
+        (name, f'CREATE INDEX IF NOT EXISTS "{name}" ON {schema}."{table}" USING gist ("{col}", geom)')
+        for name, col in zip(names, columns)
+    ]
+
+
+def filter_tables(key):
+    """lod_key 를 쓰는 레이어의 원본 + LOD + 분할 테이블명"""
+    models = [cls.model for cls in VECTOR_LAYERS.values() if cls.lod_key == key]
+    models += [model for _, model in LOD_MODELS.get(key, ())]
+    if key in SUBDIV_MODELS:
+        models.append(SUBDIV_MODELS[key])
+    names = []
+    for model in models:
+        name = tables.table_name(model._meta.db_table)
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class Command(BaseCommand):
+    help = "FILTER_COLUMNS 에 정의된 (필터 컬럼, geom) 복합 GiST 인덱스 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="", help="쉼표 구분 키 (기본: 전체)")
+
+    def handle(self, *args, **opts):
+        keys = [k.strip() for k in opts["layers"].split(",") if k.strip()] or list(FILTER_COLUMNS)
+        unknown = [k for k in keys if k not in FILTER_COLUMNS]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+
+        tables.invalidate()
+        with connection.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+            for key in keys:
+                for table in filter_tables(key):
+                    if not tables.table_exists(table):
+                        self.stdout.write(f"filter.{table}: 없음, 건너뜀")
+                        continue
+                    for name, sql in filter_index_ddl(table, FILTER_COLUMNS[key]):
+                        cur.execute(sql)
+                        self.stdout.write(f"filter.{table}: {name}")
+                    cur.execute(f'ANALYZE filter."{table}"')
+
+            for table, col in LOOKUP_INDEXES:
+                if tables.table_exists(table):
+                    name = tables.index_name(table, f"{col}_idx")
+                    cur.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON filter."{table}" ("{col}")')
+                    self.stdout.write(f"filter.{table}: {name}")
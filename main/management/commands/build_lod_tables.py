@@ -0,0 +1,102 @@
+# main/management/commands/build_lod_tables.py
+# 레이어별 LOD 테이블 생성: filter."{key}_s{tol}"
+#   ST_SimplifyPreserveTopology(tol) → ST_Subdivide(max_vertices) → GiST 인덱스
+#   (레이어 설정 subdiv: False 면 ST_Subdivide 없이 단순화만 — 필지 외곽선에 조각 경계가 안 생긴다)
+#   새 테이블(__new)을 다 만든 뒤 한 트랜잭션에서 교체하므로 서비스 중에도 안전.
+#
+# 예) python manage.py build_lod_tables
+#     python manage.py build_lod_tables --layers nonglim,jayeonnogji --max-vertices 128
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from main.models import FILTER_COLUMNS, lod_table_name
+from main.tables import index_name, table_name
+from main.vector_layers import LOD_LEVELS, LOD_SUBDIVIDED
+
+from .build_filter_indexes import filter_index_ddl
+
+# geom_type -> (ST_CollectionExtract 타입, 컬럼 타입)
+GEOM_TYPES = {
+    "MULTIPOLYGON": (3, "MultiPolygon"),
+    "POLYGON": (3, "MultiPolygon"),
+    "MULTILINESTRING": (2, "MultiLineString"),
+    "LINESTRING": (2, "MultiLineString"),
+}
+
+
+class Command(BaseCommand):
+    help = "LAYER_CONFIG 의 lod 단계별 단순화/분할 테이블을 (재)생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="", help="쉼표 구분 LOD 키 (기본: 전체)")
+        parser.add_argument("--max-vertices", type=int, default=256,
+                            help="ST_Subdivide 조각당 최대 정점 수")
+
+    def handle(self, *args, **opts):
+        keys = [k.strip() for k in opts["layers"].split(",") if k.strip()] or list(LOD_LEVELS)
+        unknown = [k for k in keys if k not in LOD_LEVELS]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+
+        for key in keys:
+            base, levels = LOD_LEVELS[key]
+            for _, tol in levels:
+                rows = self.build(key, base, tol, opts["max_vertices"])
+                self.stdout.write(f"filter.{lod_table_name(key, tol)}: {rows} rows")
+
+    def build(self, key, base, tol, max_vertices):
+        extract, col_type = GEOM_TYPES[base._meta.get_field("geom").geom_type]
+        geom, params = "ST_SimplifyPreserveTopology(geom, %s)", [tol]
+        if key in LOD_SUBDIVIDED:
+            geom, params = f"ST_Subdivide({geom}, %s)", [tol, max_vertices]
+        return build_table(
+            lod_table_name(key, tol), base, FILTER_COLUMNS.get(key, ()),
+            f"ST_Multi(ST_CollectionExtract({geom}, {extract}))::geometry({col_type}, 5186)",
+            params,
+        )
+
+
+def build_table(name, base, filter_columns, geom_sql, params, cluster=False):
+    """
+    filter."{name}" 을 base 원본의 (geom 외 컬럼, geom_sql AS geom) 으로 새로 만들어 교체 — 행 수.
+    새 테이블(__new)에 인덱스까지 만든 뒤 한 트랜잭션에서 이름만 바꾼다. build_subdivided 도 쓴다.
+    """
+    cols = ", ".join(
+        f'"{f.column}"' for f in base._meta.concrete_fields if f.name != "geom"
+    )
+    src = f'filter."{table_name(base._meta.db_table)}"'
+    new = f"{name}__new"
+    filter_indexes = filter_index_ddl(new, filter_columns)
+    # (__new 인덱스, 교체 후 인덱스) — 긴 이름은 해시로 줄어 있으므로 접미사를 잘라 내지 않고 다시 만든다
+    renames = [(old, final) for (old, _), (final, _) in zip(filter_indexes, filter_index_ddl(name, filter_columns))]
+    renames += [(index_name(new, suffix), index_name(name, suffix)) for suffix in ("geom_gix", "gid_idx")]
+    geom_gix = index_name(new, "geom_gix")
+
+    with connection.cursor() as cur:
+        if filter_indexes:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        cur.execute(f'DROP TABLE IF EXISTS filter."{new}"')
+        cur.execute(f"""
+            CREATE TABLE filter."{new}" AS
+            SELECT {cols}, {geom_sql} AS geom
+            FROM {src}
+            WHERE geom IS NOT NULL""", params)
+        cur.execute(f'DELETE FROM filter."{new}" WHERE ST_IsEmpty(geom)')
+        cur.execute(f'CREATE INDEX "{geom_gix}" ON filter."{new}" USING gist (geom)')
+        cur.execute(f'CREATE INDEX "{index_name(new, "gid_idx")}" ON filter."{new}" (gid)')
+        for _, sql in filter_indexes:
+            cur.execute(sql)
+        if cluster:
+            # 가까운 조각끼리 같은 페이지에 — 타일 하나가 읽는 페이지 수가 준다
+            cur.execute(f'CLUSTER filter."{new}" USING "{geom_gix}"')
+        cur.execute(f'ANALYZE filter."{new}"')
+        cur.execute(f'SELECT count(*) FROM filter."{new}"')
+        rows = cur.fetchone()[0]
+
+    # 교체 (읽기 중인 타일 요청은 잠깐 대기)
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f'DROP TABLE IF EXISTS filter."{name}"')
+        cur.execute(f'ALTER TABLE filter."{new}" RENAME TO "{name}"')
+        for old, final in renames:
+            cur.execute(f'ALTER INDEX filter."{old}" RENAME TO "{final}"')
+    return rows
@@ -0,0 +1,124 @@
+# main/management/commands/build_setback_tables.py
+# 표준 이격거리별 버퍼/디졸브 테이블 생성 + 증분 갱신
+#   filter."{kind}_setback_{dist}"            : gid 별 버퍼 (src_hash 로 변경 감지)
+#   filter."{kind}_setback_{dist}_dissolved"  : CELL_SIZE 격자 단위로 union 한 버퍼
+# 월간 원본 교체 후 재실행하면 geom 이 바뀐/추가/삭제된 gid 와
+# 그 gid 가 걸친 격자만 다시 계산한다.
+#
+# 예) python manage.py build_setback_tables
+#     python manage.py build_setback_tables --kinds road --dists 50,100 --full
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from main.setbacks import (
+    CELL_SIZE, SETBACK_SOURCES, STANDARD_DISTANCES,
+    buffer_table_name, dissolved_table_name, source_table,
+)
+
+# geom 의 bbox 가 걸친 격자 (cx, cy) — dirty 격자 표시용
+CELLS_OF = """
+    CROSS JOIN LATERAL generate_series(floor(ST_XMin({g}) / {cell})::int, floor(ST_XMax({g}) / {cell})::int) AS cx
+    CROSS JOIN LATERAL generate_series(floor(ST_YMin({g}) / {cell})::int, floor(ST_YMax({g}) / {cell})::int) AS cy
+"""
+
+CELL_ENVELOPE = "ST_MakeEnvelope(d.cx * {cell}, d.cy * {cell}, (d.cx + 1) * {cell}, (d.cy + 1) * {cell}, 5186)"
+
+
+class Command(BaseCommand):
+    help = "표준 이격거리 버퍼/디졸브 테이블을 만들거나 변경분만 갱신"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kinds", default=",".join(SETBACK_SOURCES))
+        parser.add_argument("--dists", default=",".join(str(d) for d in STANDARD_DISTANCES))
+        parser.add_argument("--full", action="store_true", help="기존 테이블을 비우고 전체 재계산")
+
+    def handle(self, *args, **opts):
+        kinds = [k.strip() for k in opts["kinds"].split(",") if k.strip()]
+        try:
+            dists = [int(d) for d in opts["dists"].split(",") if d.strip()]
+        except ValueError:
+            raise CommandError("invalid --dists")
+        for kind in kinds:
+            if kind not in SETBACK_SOURCES:
+                raise CommandError(f"unknown kind: {kind}")
+            for dist in dists:
+                changed, cells = self.refresh(kind, dist, opts["full"])
+                self.stdout.write(f"{buffer_table_name(kind, dist)}: {changed} gids, {cells} cells refreshed")
+
+    def refresh(self, kind, dist, full):
+        src = source_table(kind)
+        buf_name, dis_name = buffer_table_name(kind, dist), dissolved_table_name(kind, dist)
+        buf, dis = f'filter."{buf_name}"', f'filter."{dis_name}"'
+        cells_of = lambda g: CELLS_OF.format(g=g, cell=CELL_SIZE)
+        envelope = CELL_ENVELOPE.format(cell=CELL_SIZE)
+
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {buf} (
+                  gid integer PRIMARY KEY,
+                  src_hash text NOT NULL,
+                  geom geometry(MultiPolygon, 5186)
+                )""")
+            cur.execute(f'CREATE INDEX IF NOT EXISTS "{buf_name}_geom_gix" ON {buf} USING gist (geom)')
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {dis} (
+                  cx integer, cy integer,
+                  geom geometry(MultiPolygon, 5186),
+                  PRIMARY KEY (cx, cy)
+                )""")
+            cur.execute(f'CREATE INDEX IF NOT EXISTS "{dis_name}_geom_gix" ON {dis} USING gist (geom)')
+            if full:
+                cur.execute(f"TRUNCATE {buf}, {dis}")
+
+            # 1) 변경 gid: 신규 / geom 변경 / 원본에서 삭제
+            cur.execute(f"""
+                CREATE TEMP TABLE _src ON COMMIT DROP AS
+                SELECT gid, md5(ST_AsEWKB(geom)) AS h FROM {src}""")
+            cur.execute(f"""
+                CREATE TEMP TABLE _changed ON COMMIT DROP AS
+                SELECT s.gid FROM _src s LEFT JOIN {buf} b USING (gid)
+                 WHERE b.gid IS NULL OR b.src_hash <> s.h
+                UNION
+                SELECT b.gid FROM {buf} b LEFT JOIN _src s USING (gid)
+                 WHERE s.gid IS NULL""")
+            cur.execute("SELECT count(*) FROM _changed")
+            changed = cur.fetchone()[0]
+            if not changed:
+                return 0, 0
+
+            # 2) 이전 버퍼가 걸친 격자 → dirty, 이전 버퍼 삭제
+            cur.execute("CREATE TEMP TABLE _dirty (cx integer, cy integer) ON COMMIT DROP")
+            cur.execute(f"""
+                INSERT INTO _dirty (cx, cy)
+                SELECT cx, cy FROM {buf} b JOIN _changed c USING (gid) {cells_of('b.geom')}""")
+            cur.execute(f"DELETE FROM {buf} b USING _changed c WHERE b.gid = c.gid")
+
+            # 3) 새 버퍼 계산 (변경 gid 만), 새 버퍼가 걸친 격자도 dirty
+            cur.execute(f"""
+                INSERT INTO {buf} (gid, src_hash, geom)
+                SELECT s.gid, md5(ST_AsEWKB(s.geom)), ST_Multi(ST_Buffer(s.geom, %s))
+                FROM {src} s JOIN _changed c USING (gid)
+                WHERE s.geom IS NOT NULL""", [dist])
+            cur.execute(f"""
+                INSERT INTO _dirty (cx, cy)
+                SELECT cx, cy FROM {buf} b JOIN _changed c USING (gid) {cells_of('b.geom')}""")
+
+            # 4) dirty 격자만 다시 디졸브
+            cur.execute("CREATE TEMP TABLE _cells ON COMMIT DROP AS SELECT DISTINCT cx, cy FROM _dirty")
+            cur.execute(f"DELETE FROM {dis} d USING _cells c WHERE d.cx = c.cx AND d.cy = c.cy")
+            cur.execute(f"""
+                INSERT INTO {dis} (cx, cy, geom)
+                SELECT cx, cy, geom FROM (
+                  SELECT d.cx, d.cy,
+                         ST_Multi(ST_CollectionExtract(ST_Intersection(ST_Union(b.geom), {envelope}), 3)) AS geom
+                  FROM _cells d JOIN {buf} b ON b.geom && {envelope}
+                  GROUP BY d.cx, d.cy
+                ) AS u
+                WHERE NOT ST_IsEmpty(geom)""")
+            cur.execute("SELECT count(*) FROM _cells")
+            cells = cur.fetchone()[0]
+
+        with connection.cursor() as cur:
+            cur.execute(f"ANALYZE {buf}")
+            cur.execute(f"ANALYZE {dis}")
+        return changed, cells
@@ -0,0 +1,58 @@
+# main/management/commands/build_subdivided.py
+# 다각형 레이어별 분할 테이블 생성: filter."{key}_subdiv"
+#   원본(단순화 없음) → ST_Subdivide(max_vertices) → GiST 인덱스 → CLUSTER
+#   조각마다 원본 gid(와 속성)를 그대로 두므로 같은 gid 조각을 모으면 원래 feature 가 된다.
+#   최대 해상도 줌(LOD 단계 밖)의 타일은 원본 대신 이 테이블을 읽어
+#   수만 정점짜리 용도지역 폴리곤 전체가 아니라 타일에 걸친 조각만 자른다.
+#   새 테이블(__new)을 다 만든 뒤 한 트랜잭션에서 교체하므로 서비스 중에도 안전.
+#   실행 중인 서버는 테이블 존재 캐시(main/tables.py, TTL 60초)가 만료된 뒤부터 새로 만든 분할
+#   테이블을 읽는다 (재생성은 같은 이름으로 교체라 바로 반영). 이 명령은 별도 프로세스라 서버 캐시를 비울 수 없다.
+#
+# 예) python manage.py build_subdivided
+#     python manage.py build_subdivided --layers nonglim,jayeonnogji --max-vertices 128
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main.models import FILTER_COLUMNS, subdiv_table_name
+from main.tables import table_name
+from main.vector_layers import SUBDIV_SOURCES
+
+from .build_lod_tables import GEOM_TYPES, build_table
+
+
+class Command(BaseCommand):
+    help = "다각형 레이어의 최대 해상도용 분할 테이블 {key}_subdiv 를 (재)생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="", help=f"쉼표 구분 키 (기본: 전체 — {', '.join(SUBDIV_SOURCES)})")
+        parser.add_argument("--max-vertices", type=int, default=256,
+                            help="ST_Subdivide 조각당 최대 정점 수 (8 이상)")
+
+    def handle(self, *args, **opts):
+        keys = [k.strip() for k in opts["layers"].split(",") if k.strip()] or list(SUBDIV_SOURCES)
+        unknown = [k for k in keys if k not in SUBDIV_SOURCES]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+        if opts["max_vertices"] < 8:
+            raise CommandError("--max-vertices 는 8 이상 (ST_Subdivide 제한)")
+
+        for key in keys:
+            base = SUBDIV_SOURCES[key]
+            rows = self.build(key, base, opts["max_vertices"])
+            self.stdout.write(f"filter.{subdiv_table_name(key)}: {rows} rows "
+                              f"(원본 {self.stats(base)}, 조각당 최대 {opts['max_vertices']} 정점)")
+
+    def build(self, key, base, max_vertices):
+        extract, col_type = GEOM_TYPES[base._meta.get_field("geom").geom_type]
+        return build_table(
+            subdiv_table_name(key), base, FILTER_COLUMNS.get(key, ()),
+            f"ST_Multi(ST_CollectionExtract(ST_Subdivide(geom, %s), {extract}))::geometry({col_type}, 5186)",
+            [max_vertices], cluster=True,
+        )
+
+    def stats(self, base):
+        """원본 행 수 / 최대 정점 수 — 분할 효과 확인용"""
+        with connection.cursor() as cur:
+            cur.execute(f'SELECT count(*), max(ST_NPoints(geom)) FROM filter."{table_name(base._meta.db_table)}"')
+            rows, max_points = cur.fetchone()
+        return f"{rows} rows, 최대 {max_points or 0} 정점"
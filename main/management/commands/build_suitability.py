@@ -0,0 +1,68 @@
+# main/management/commands/build_suitability.py
+# 태양광 입지 적합성 계산 → filter.suitability (시나리오 단위)
+#   격자 구획별로 프로세스 풀에서 "{scenario}__new" 로 쌓은 뒤
+#   한 트랜잭션에서 기존 시나리오 행과 교체하므로 계산 중에도 API/타일은 이전 결과를 읽는다.
+#
+# 예) python manage.py build_suitability --road-dist 50 --resi-dist 100 \
+#         --exclude nonglim,nongupjinheung,nongupseisangiban --workers 8
+import multiprocessing
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from main import suitability, tile_archive
+from main.setbacks import parse_dist
+
+
+class Command(BaseCommand):
+    help = "필지별 사용 가능 면적(이격·제외 용도지역 차감)을 계산해 filter.suitability 에 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--road-dist", type=float, default=50, help="도로 이격거리 (m, 0 이면 미적용)")
+        parser.add_argument("--resi-dist", type=float, default=100, help="주거 이격거리 (m, 0 이면 미적용)")
+        parser.add_argument("--exclude", default="nonglim,nongupjinheung,nongupseisangiban",
+                            help=f"쉼표 구분 제외 레이어 ({', '.join(suitability.EXCLUDABLE)})")
+        parser.add_argument("--partition-size", type=int, default=suitability.PARTITION_SIZE)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    def handle(self, *args, **opts):
+        exclude = [v.strip() for v in opts["exclude"].split(",") if v.strip()]
+        unknown = [lid for lid in exclude if lid not in suitability.EXCLUDABLE]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+        try:
+            road_dist, resi_dist = (
+                parse_dist(d) if d else 0 for d in (opts["road_dist"], opts["resi_dist"])
+            )
+            scenario = suitability.scenario_key(road_dist, resi_dist, exclude)
+        except ValueError as e:
+            raise CommandError(f"invalid --road-dist/--resi-dist ({e})")
+
+        staging = f"{scenario}__new"
+        with connection.cursor() as cur:
+            for sql in suitability.DDL:
+                cur.execute(sql)
+            cur.execute(f"DELETE FROM {suitability.RESULT_TABLE} WHERE scenario = %s", [staging])
+
+        cells = suitability.partitions(opts["partition_size"])
+        tasks = [(staging, road_dist, resi_dist, exclude, cell) for cell in cells]
+        self.stdout.write(f"{scenario}: {len(tasks)} partitions, {opts['workers']} workers")
+
+        # 워커는 fork 후 자기 커넥션을 새로 연다
+        connections.close_all()
+        parcels = done = 0
+        with multiprocessing.Pool(opts["workers"], initializer=tile_archive.init_worker) as pool:
+            for count in pool.imap_unordered(suitability.compute_partition, tasks):
+                parcels += count
+                done += 1
+                if done % 50 == 0 or done == len(tasks):
+                    self.stdout.write(f"  {done}/{len(tasks)} partitions, {parcels} parcels")
+
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {suitability.RESULT_TABLE} WHERE scenario = %s", [scenario])
+            cur.execute(f"UPDATE {suitability.RESULT_TABLE} SET scenario = %s WHERE scenario = %s",
+                        [scenario, staging])
+        with connection.cursor() as cur:
+            cur.execute(f"ANALYZE {suitability.RESULT_TABLE}")
+        self.stdout.write(self.style.SUCCESS(f"done: {scenario} ({parcels} parcels)"))
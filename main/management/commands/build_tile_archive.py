@@ -0,0 +1,84 @@
+# main/management/commands/build_tile_archive.py
+# 예) python manage.py build_tile_archive --minzoom 10 --maxzoom 16 --workers 8
+#     python manage.py build_tile_archive --layers road,jimok --restart
+import multiprocessing
+import os
+from collections import defaultdict
+
+import mercantile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from main import tile_archive, tile_http
+from main.vector_layers import VECTOR_LAYERS
+
+
+class Command(BaseCommand):
+    help = "VectorLayer 타일을 MBTiles 아카이브로 미리 렌더링 (중단 후 재실행 시 이어서 진행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="", help="쉼표 구분 레이어 id (기본: 전체)")
+        parser.add_argument("--minzoom", type=int, default=10)
+        parser.add_argument("--maxzoom", type=int, default=16)
+        parser.add_argument("--bounds", default="",
+                            help="minlon,minlat,maxlon,maxlat (기본: 충남 범위)")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--restart", action="store_true", help="기존 아카이브를 지우고 처음부터")
+
+    def handle(self, *args, **opts):
+        layer_ids = [v.strip() for v in opts["layers"].split(",") if v.strip()] or list(VECTOR_LAYERS)
+        unknown = [lid for lid in layer_ids if lid not in VECTOR_LAYERS]
+        if unknown:
+            raise CommandError(f"unknown layers: {', '.join(unknown)}")
+
+        bounds = tile_archive.CHUNGNAM_BOUNDS
+        if opts["bounds"]:
+            try:
+                bounds = tuple(map(float, opts["bounds"].split(",")))
+                if len(bounds) != 4:
+                    raise ValueError
+            except ValueError:
+                raise CommandError("invalid --bounds (west,south,east,north)")
+        minzoom, maxzoom = opts["minzoom"], opts["maxzoom"]
+
+        # 타일을 (z, x) 컬럼 단위로 묶는다 — 워커 작업/재개 단위
+        columns = defaultdict(list)
+        for t in mercantile.tiles(*bounds, zooms=range(minzoom, maxzoom + 1)):
+            columns[(t.z, t.x)].append(t.y)
+
+        archives, tasks = {}, []
+        for lid in layer_ids:
+            if opts["restart"] and os.path.exists(tile_archive.archive_path(lid)):
+                os.remove(tile_archive.archive_path(lid))
+            layer = VECTOR_LAYERS[lid]
+            lo, hi = max(minzoom, layer.min_zoom), min(maxzoom, layer.max_zoom)
+            # 원본/LOD/분할 테이블 버전 — 다르면 기존 타일을 비우고 새로, 뷰는 이 버전일 때만 아카이브를 쓴다
+            version = tile_http.dataset_version([layer()])
+            conn = archives[lid] = tile_archive.open_archive(lid, lo, hi, bounds, version)
+            done = tile_archive.done_columns(conn)
+            todo = [
+                (lid, z, x, ys) for (z, x), ys in sorted(columns.items())
+                if lo <= z <= hi and (z, x) not in done
+            ]
+            self.stdout.write(f"{lid}: {len(todo)} columns to render ({len(done)} already done)")
+            tasks.extend(todo)
+
+        if not tasks:
+            self.stdout.write(self.style.SUCCESS("nothing to do"))
+            return
+
+        # 부모 커넥션을 닫고 fork — 워커는 각자 DB 커넥션을 연다
+        connections.close_all()
+        total, tiles = len(tasks), 0
+        with multiprocessing.Pool(opts["workers"], initializer=tile_archive.init_worker) as pool:
+            for i, (lid, z, x, rendered) in enumerate(
+                pool.imap_unordered(tile_archive.render_column, tasks), 1
+            ):
+                tile_archive.write_column(archives[lid], z, x, rendered)
+                tiles += len(rendered)
+                if i % 50 == 0 or i == total:
+                    self.stdout.write(f"  {i}/{total} columns, {tiles} tiles")
+
+        for conn in archives.values():
+            conn.close()
+        self.stdout.write(self.style.SUCCESS(f"done: {tiles} tiles"))
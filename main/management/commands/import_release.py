@@ -0,0 +1,142 @@
+# main/management/commands/import_release.py
+# 월별 원본 릴리스 일괄 적재 — staging 에 병렬 적재 → 한 트랜잭션에서 filter 로 교체
+#  1) 데이터셋마다 워커 프로세스 하나: GDAL 로 읽어 COPY, 5186 변환, GiST, CLUSTER, ANALYZE (main/release_import.py)
+#  2) 모델 컬럼 확인, 현재 릴리스와 비교해 바뀐 타일 계산 (main/datasets.py)
+#  3) 한 트랜잭션에서 staging -> filter 스키마 이동 + 레지스트리 활성화 (전부 되거나 전부 안 되거나)
+#  4) 아카이브에서 바뀐 타일 삭제, (선택) 파생 테이블 재생성 / 서버 캐시 미리 채우기
+#  하나라도 실패하면 교체하지 않는다 — staging 테이블은 확인용으로 남는다.
+#
+# 예) python manage.py import_release --release 202510 \
+#         road=/data/202510/3.4_road_lsmd_cont_ui101_44_202510.shp \
+#         resi=/data/202510/3.4_f_fac_building_44_202510.shp
+#     python manage.py import_release --release 202510 owner=/data/owner.gpkg@ownerinfo --encoding utf-8 --derived
+#     python manage.py import_release ... --no-swap      # staging 적재 + 바뀐 타일 수만
+import multiprocessing
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from main import coverage, datasets, release_import, tables, tile_archive
+from main.release_import import STAGING_SCHEMA
+from main.setbacks import SETBACK_SOURCES
+from main.vector_layers import LOD_LEVELS, SUBDIV_SOURCES
+
+from .swap_dataset import DERIVED_HINTS, Command as SwapDataset
+
+
+class Command(BaseCommand):
+    help = "원본 파일(shp/gpkg)을 staging 에 병렬 적재한 뒤 filter 스키마로 한 번에 교체"
+
+    def add_arguments(self, parser):
+        parser.add_argument("sources", nargs="+",
+                            help=f"name=path[@layer] — name: {', '.join(datasets.RELEASE_TABLES)}")
+        parser.add_argument("--release", required=True, help="릴리스 표기 (202510 ...)")
+        parser.add_argument("--workers", type=int, default=0, help="동시 적재 수 (기본: 데이터셋 수)")
+        parser.add_argument("--encoding", default="cp949", help="원본 속성 인코딩 (shp 기본 cp949)")
+        parser.add_argument("--source-srid", type=int, default=None, help=".prj 로 좌표계를 알 수 없을 때")
+        parser.add_argument("--suffix", default="", help="테이블 이름 뒤에 붙일 문자열 (같은 이름이 이미 있을 때)")
+        parser.add_argument("--full", action="store_true", help="바뀐 범위 계산 없이 전체 무효화")
+        parser.add_argument("--no-swap", action="store_true", help="staging 적재와 비교까지만")
+        parser.add_argument("--derived", action="store_true",
+                            help="교체 후 LOD/분할/이격 버퍼 테이블 재생성 (build_lod_tables, build_subdivided, build_setback_tables)")
+        parser.add_argument("--seed-maxzoom", type=int, default=0,
+                            help="이 줌까지 바뀐 타일을 서버 캐시에 미리 렌더링 (swap_dataset 과 같음)")
+
+    def handle(self, *args, **opts):
+        tasks = self.plan(opts)
+
+        # 1) 병렬 적재 — 부모 커넥션을 닫고 fork, 워커는 각자 접속
+        connections.close_all()
+        t0 = time.monotonic()
+        loaded = {}
+        workers = min(opts["workers"] or len(tasks), len(tasks))
+        with multiprocessing.Pool(workers, initializer=tile_archive.init_worker) as pool:
+            for name, table, rows, srid, seconds in pool.imap_unordered(release_import.load_dataset, tasks):
+                loaded[name] = table
+                self.stdout.write(f"  {name}: {STAGING_SCHEMA}.\"{table}\" {rows} rows (EPSG:{srid}) in {seconds:.0f}s")
+        self.stdout.write(f"loaded {len(loaded)} datasets in {time.monotonic() - t0:.0f}s")
+
+        # 2) 검증 + 바뀐 타일
+        datasets.refresh(force=True)
+        indexes = {}
+        for name, table in loaded.items():
+            missing = datasets.missing_columns(name, table, schema=STAGING_SCHEMA)
+            if missing:
+                raise CommandError(f"{name}: {table} 에 컬럼 없음 {', '.join(missing)} — 교체하지 않음")
+            old = datasets.physical_table(name)
+            if opts["full"] or not tables.table_exists(old):
+                indexes[name] = None
+                self.stdout.write(f"  {name}: {old} -> {table}, full invalidation")
+            else:
+                index = indexes[name] = datasets.changed_index(
+                    name, f'filter."{old}"', f'{STAGING_SCHEMA}."{table}"',
+                )
+                self.stdout.write(f"  {name}: {old} -> {table}, {len(index.base)} z{index.zoom} tiles changed")
+        if opts["no_swap"]:
+            return
+
+        # 3) 교체 — 스키마 이동과 레지스트리 기록을 한 트랜잭션으로
+        with transaction.atomic():
+            with connection.cursor() as cur:
+                for table in loaded.values():
+                    cur.execute(f'ALTER TABLE {STAGING_SCHEMA}."{table}" SET SCHEMA filter')
+            for name, table in loaded.items():
+                index = indexes[name]
+                datasets.activate(
+                    name, table, opts["release"],
+                    None if index is None else index.base, coverage.COVERAGE_ZOOM,
+                )
+        tables.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"release {opts['release']} active: {', '.join(loaded)}"))
+
+        # 4) 후속 작업
+        swap = SwapDataset(stdout=self.stdout, stderr=self.stderr)
+        for name in loaded:
+            swap.after_swap(name, indexes[name], opts["seed_maxzoom"])
+        if opts["derived"]:
+            self.rebuild_derived(loaded)
+        else:
+            self.stdout.write("원본에서 만든 파생 테이블은 따로 갱신: " + ", ".join(DERIVED_HINTS))
+
+    def plan(self, opts):
+        """[(이름, 경로, 레이어, staging 테이블, 원본 SRID, 인코딩), ...] — 큰 원본부터"""
+        tasks, names = [], set()
+        for spec in opts["sources"]:
+            try:
+                name, path, layer_ref = release_import.parse_source(spec)
+            except ValueError as e:
+                raise CommandError(str(e))
+            if name not in datasets.RELEASE_TABLES:
+                raise CommandError(f"unknown dataset: {name}")
+            if name in names:
+                raise CommandError(f"duplicate dataset: {name}")
+            names.add(name)
+            try:
+                # 여기서는 이름만 확인 — 실제 읽기는 워커가 다시 연다
+                ds, layer = release_import.open_layer(path, layer_ref, opts["encoding"])
+                table = release_import.staging_table_name(layer, opts["suffix"])
+                del ds, layer
+            except Exception as e:
+                raise CommandError(f"{name}: {e}")
+            tasks.append((name, path, layer_ref, table, opts["source_srid"], opts["encoding"]))
+
+        tables.invalidate()
+        for name, _, _, table, _, _ in tasks:
+            if tables.table_exists(table):
+                raise CommandError(f'{name}: filter."{table}" 이 이미 있음 (--suffix 로 다른 이름)')
+        tasks.sort(key=lambda t: release_import.source_size(t[1]), reverse=True)
+        return tasks
+
+    def rebuild_derived(self, loaded):
+        models = {datasets.dataset_models()[name] for name in loaded}
+        lod_keys = [key for key, (base, _) in LOD_LEVELS.items() if base in models]
+        if lod_keys:
+            call_command("build_lod_tables", layers=",".join(lod_keys), stdout=self.stdout)
+        subdiv_keys = [key for key, base in SUBDIV_SOURCES.items() if base in models]
+        if subdiv_keys:
+            call_command("build_subdivided", layers=",".join(subdiv_keys), stdout=self.stdout)
+        kinds = [kind for kind, name in SETBACK_SOURCES.items() if name in loaded]
+        if kinds:
+            call_command("build_setback_tables", kinds=",".join(kinds), stdout=self.stdout)
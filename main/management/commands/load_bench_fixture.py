@@ -0,0 +1,66 @@
+# main/management/commands/load_bench_fixture.py
+# 벤치마크용 합성 fixture 적재 — filter 스키마 테이블을 같은 이름/컬럼으로 만들어 채운다.
+#   운영 DB 를 덮어쓰지 않도록 DB 이름이 *_bench 가 아니면 --force 없이는 거부한다.
+#
+# 예) DB_NAME=autosolar_bench python manage.py load_bench_fixture --derived
+#     DB_NAME=autosolar_bench python manage.py load_bench_fixture --scale 4
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from main import bench, tables
+
+
+class Command(BaseCommand):
+    help = "filter 스키마 모양의 결정적 합성 데이터를 적재 (벤치마크용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0,
+                            help="필지/건물 밀도 배수 (1 = 필지 50m 격자)")
+        parser.add_argument("--derived", action="store_true",
+                            help="LOD/분할/이격/필터 인덱스/커버리지 테이블까지 생성")
+        parser.add_argument("--force", action="store_true", help="DB 이름 검사 없이 진행")
+
+    def handle(self, *args, **opts):
+        name = connection.settings_dict["NAME"]
+        if not name.endswith("_bench") and not opts["force"]:
+            raise CommandError(f"DB '{name}' 는 *_bench 가 아님 — 운영 DB 보호 (--force 로 무시)")
+        if opts["scale"] <= 0:
+            raise CommandError("invalid --scale")
+
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+            cur.execute("CREATE SCHEMA IF NOT EXISTS filter")
+            for model in bench.FIXTURE_MODELS:
+                cur.execute(f"DROP TABLE IF EXISTS {bench.fixture_table(model)} CASCADE")
+                cur.execute(bench.create_table_sql(model))
+
+            w, s, e, n = bench.FIXTURE_BOUNDS
+            cur.execute(
+                "SELECT ST_XMin(g), ST_YMin(g), ST_XMax(g), ST_YMax(g) "
+                "FROM ST_Transform(ST_MakeEnvelope(%s, %s, %s, %s, 4326), 5186) AS g",
+                [w, s, e, n],
+            )
+            extent = cur.fetchone()
+            for sql, params in bench.fixture_statements(extent, opts["scale"]):
+                cur.execute(sql, params)
+
+            for model in bench.FIXTURE_MODELS:
+                table = bench.fixture_table(model)
+                name = tables.table_name(model._meta.db_table)
+                cur.execute(f'CREATE INDEX "{name}_geom_gix" ON {table} USING gist (geom)')
+        with connection.cursor() as cur:
+            for model in bench.FIXTURE_MODELS:
+                table = bench.fixture_table(model)
+                cur.execute(f"ANALYZE {table}")
+                cur.execute(f"SELECT count(*) FROM {table}")
+                self.stdout.write(f"{table}: {cur.fetchone()[0]} rows")
+        tables.invalidate()
+
+        if opts["derived"]:
+            call_command("build_lod_tables", stdout=self.stdout)
+            call_command("build_subdivided", stdout=self.stdout)
+            call_command("build_setback_tables", "--full", stdout=self.stdout)
+            call_command("build_filter_indexes", stdout=self.stdout)
+            call_command("build_coverage", stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS("fixture loaded"))
@@ -0,0 +1,64 @@
+# main/management/commands/seed_wmts.py
+# VWorld WMTS 디스크 캐시 미리 채우기 (충남 범위)
+# 예) python manage.py seed_wmts --layers Base,Satellite --minzoom 7 --maxzoom 15 --workers 8
+from concurrent.futures import ThreadPoolExecutor
+
+import mercantile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main import wmts_cache
+from main.tile_archive import CHUNGNAM_BOUNDS
+
+EXT_OF = {"Base": "png", "Hybrid": "png", "Satellite": "jpeg"}
+
+
+class Command(BaseCommand):
+    help = "VWorld 배경지도 타일을 디스크 캐시에 미리 받아 둔다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--layers", default="Base,Satellite")
+        parser.add_argument("--minzoom", type=int, default=7)
+        parser.add_argument("--maxzoom", type=int, default=14)
+        parser.add_argument("--bounds", default="", help="minlon,minlat,maxlon,maxlat")
+        parser.add_argument("--workers", type=int, default=8)
+
+    def handle(self, *args, **opts):
+        key = getattr(settings, "VWORLD_KEY", "")
+        if not key:
+            raise CommandError("VWORLD_KEY not set")
+        layers = [v.strip() for v in opts["layers"].split(",") if v.strip()]
+        bad = [v for v in layers if v not in wmts_cache.LAYERS]
+        if bad:
+            raise CommandError(f"unknown layers: {', '.join(bad)}")
+        bounds = CHUNGNAM_BOUNDS
+        if opts["bounds"]:
+            try:
+                bounds = tuple(map(float, opts["bounds"].split(",")))
+                if len(bounds) != 4:
+                    raise ValueError
+            except ValueError:
+                raise CommandError("invalid --bounds (west,south,east,north)")
+
+        cache = wmts_cache.get_cache()
+        tasks = [
+            (layer, t.z, t.y, t.x, EXT_OF[layer])
+            for layer in layers
+            for t in mercantile.tiles(*bounds, zooms=range(opts["minzoom"], opts["maxzoom"] + 1))
+        ]
+        self.stdout.write(f"{len(tasks)} tiles")
+
+        def seed(task):
+            try:
+                return cache.fetch(*task, key)[3]
+            except Exception:
+                return "error"
+
+        counts = {}
+        # 네트워크 대기 위주라 스레드 풀로 충분 (세션 커넥션 풀 공유)
+        with ThreadPoolExecutor(opts["workers"]) as pool:
+            for i, state in enumerate(pool.map(seed, tasks), 1):
+                counts[state] = counts.get(state, 0) + 1
+                if i % 500 == 0:
+                    self.stdout.write(f"  {i}/{len(tasks)} {counts}")
+        self.stdout.write(self.style.SUCCESS(f"done: {counts}"))
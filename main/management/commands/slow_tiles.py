@@ -0,0 +1,80 @@
+# main/management/commands/slow_tiles.py
+# 느린 타일 기록(SlowTile) 조회 — 가장 느린 순
+#
+# 예) python manage.py slow_tiles                      # 최근 24시간 상위 20건
+#     python manage.py slow_tiles --endpoint owner --zoom 12 --hours 168
+#     python manage.py slow_tiles --show 42            # SQL + EXPLAIN 전체
+#     python manage.py slow_tiles --explain 42         # 지금 다시 EXPLAIN (ANALYZE, BUFFERS)
+#     python manage.py slow_tiles --clear
+import datetime
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from main import slow_tiles
+from main.models import SlowTile
+
+
+class Command(BaseCommand):
+    help = "느린 타일/이격 요청 목록 (SLOW_TILE_MS 초과분)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--hours", type=float, default=24, help="최근 N 시간 (0 이면 전체)")
+        parser.add_argument("--endpoint", default="")
+        parser.add_argument("--zoom", type=int, default=None)
+        parser.add_argument("--summary", action="store_true", help="endpoint/줌별 건수·평균·최대")
+        parser.add_argument("--show", type=int, default=None, help="기록 하나의 SQL/EXPLAIN 출력")
+        parser.add_argument("--explain", type=int, default=None, help="기록 하나를 지금 다시 EXPLAIN 해 저장")
+        parser.add_argument("--clear", action="store_true", help="기록 전부 삭제")
+
+    def handle(self, *args, **opts):
+        if opts["clear"]:
+            deleted, _ = SlowTile.objects.all().delete()
+            self.stdout.write(f"deleted {deleted}")
+            return
+        if opts["show"] is not None or opts["explain"] is not None:
+            self.show(opts["show"] if opts["show"] is not None else opts["explain"], opts["explain"] is not None)
+            return
+
+        qs = SlowTile.objects.all()
+        if opts["hours"]:
+            qs = qs.filter(created__gte=timezone.now() - datetime.timedelta(hours=opts["hours"]))
+        if opts["endpoint"]:
+            qs = qs.filter(endpoint=opts["endpoint"])
+        if opts["zoom"] is not None:
+            qs = qs.filter(z=opts["zoom"])
+
+        if opts["summary"]:
+            rows = (qs.values("endpoint", "z")
+                      .annotate(n=Count("id"), avg=Avg("duration_ms"), worst=Max("duration_ms"))
+                      .order_by("-worst")[:opts["limit"]])
+            for r in rows:
+                z = "-" if r["z"] is None else r["z"]
+                self.stdout.write(f"{r['endpoint']:<28} z{z:<3} n={r['n']:<5} avg {r['avg']:>8.0f}ms  max {r['worst']:>8.0f}ms")
+            return
+
+        for t in qs.order_by("-duration_ms")[:opts["limit"]]:
+            where = f"{t.z}/{t.x}/{t.y}" if t.z is not None else "-"
+            db = f"{t.db_ms:.0f}" if t.db_ms is not None else "-"
+            self.stdout.write(
+                f"#{t.id:<6} {t.duration_ms:>8.0f}ms (db {db:>6}) {t.endpoint:<24} {where:<18} "
+                f"{t.size or 0:>9}B {t.features or 0:>7}f {'E' if t.explain else ' '} "
+                f"{t.created:%m-%d %H:%M} {t.query}"
+            )
+
+    def show(self, pk, rerun):
+        try:
+            t = SlowTile.objects.get(pk=pk)
+        except SlowTile.DoesNotExist:
+            raise CommandError(f"no record {pk}")
+        if rerun:
+            if not t.sql:
+                raise CommandError("SQL 이 기록되지 않은 항목")
+            t.explain = slow_tiles.explain_analyze(t.sql, json.loads(t.params or "[]"))
+            t.save(update_fields=["explain"])
+        self.stdout.write(f"{t}  layers={t.layers}  ?{t.query}")
+        self.stdout.write(f"\n-- SQL\n{t.sql}\n-- params {t.params}")
+        self.stdout.write(f"\n-- EXPLAIN (ANALYZE, BUFFERS)\n{t.explain or '(없음)'}")
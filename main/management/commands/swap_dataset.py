@@ -0,0 +1,116 @@
+# main/management/commands/swap_dataset.py
+# 데이터셋 릴리스 교체 — 새 월별 테이블을 활성 릴리스로 올리고 바뀐 타일만 무효화
+#  1) 새 테이블(filter 스키마)에 모델 컬럼이 다 있는지 확인
+#  2) 현재 릴리스와 행 내용(속성 + geometry)이 다른 feature 들이 걸친 z14 타일 계산
+#     (여유: LOD 허용오차, 이격 원본이면 최대 이격거리)
+#  3) 레지스트리(DatasetRelease)에 기록 → 각 프로세스가 TILE_VERSION_CHECK_SECONDS 안에 새 테이블로 전환.
+#     서버 캐시 키는 타일별 릴리스라 안 바뀐 타일은 그대로 적중한다.
+#  4) 아카이브(MBTiles)에서 바뀐 타일 삭제, --seed-maxzoom 까지 바뀐 타일을 서버 캐시에 미리 렌더링
+#
+# 예) python manage.py swap_dataset road 3.4_road_lsmd_cont_ui101_44_202510 --release 202510
+#     python manage.py swap_dataset road 3.4_road_lsmd_cont_ui101_44_202510 --release 202510 --dry-run
+#     python manage.py swap_dataset owner <테이블> --release 20251007 --full   # 바뀐 범위 계산 생략, 전체 무효화
+#     python manage.py swap_dataset --list
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from main import coverage, datasets, tables
+from main.models import DatasetRelease
+from main.vector_layers import LAYERS
+
+# 원본이 바뀌면 다시 만들어야 하는 파생 테이블
+DERIVED_HINTS = (
+    "build_lod_tables (LOD 단순화 테이블)",
+    "build_subdivided (최대 해상도 분할 테이블)",
+    "build_setback_tables (이격 버퍼, road/resi)",
+    "build_filter_indexes",
+    "build_suitability (입지 적합성)",
+)
+
+
+class Command(BaseCommand):
+    help = "데이터셋(논리 이름)의 활성 테이블을 새 릴리스로 교체하고 바뀐 타일만 무효화"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs="?", help=f"논리 이름: {', '.join(datasets.RELEASE_TABLES)}")
+        parser.add_argument("table", nargs="?", help="filter 스키마의 새 테이블 이름")
+        parser.add_argument("--release", default="", help="릴리스 표기 (기본: 테이블 이름)")
+        parser.add_argument("--full", action="store_true", help="바뀐 범위 계산 없이 전체 무효화")
+        parser.add_argument("--dry-run", action="store_true", help="바뀐 타일 수만 출력")
+        parser.add_argument("--seed-maxzoom", type=int, default=0,
+                            help="이 줌까지 바뀐 타일을 서버 캐시에 미리 렌더링 (0 이면 안 함, 최대 14)")
+        parser.add_argument("--list", action="store_true", help="데이터셋별 활성 릴리스")
+
+    def handle(self, *args, **opts):
+        if opts["list"]:
+            self.list()
+            return
+        name, table = opts["name"], opts["table"]
+        if not name or not table:
+            raise CommandError("name 과 table 이 필요합니다 (또는 --list)")
+        if name not in datasets.RELEASE_TABLES:
+            raise CommandError(f"unknown dataset: {name}")
+        tables.invalidate()
+        if not tables.table_exists(table):
+            raise CommandError(f'filter."{table}" 없음')
+        missing = datasets.missing_columns(name, table)
+        if missing:
+            raise CommandError(f"{table}: 컬럼 없음 {', '.join(missing)}")
+
+        datasets.refresh(force=True)
+        old = datasets.physical_table(name)
+        if old == table:
+            raise CommandError(f"{name}: 이미 {table} 이 활성 릴리스")
+
+        index = None
+        if not opts["full"] and tables.table_exists(old):
+            index = datasets.changed_index(name, f'filter."{old}"', f'filter."{table}"')
+            self.stdout.write(f"{name}: {old} -> {table}, {len(index.base)} z{index.zoom} tiles changed")
+        else:
+            self.stdout.write(f"{name}: {old} -> {table}, full invalidation")
+        if opts["dry_run"]:
+            return
+
+        rel = datasets.activate(
+            name, table, opts["release"] or table,
+            None if index is None else index.base, coverage.COVERAGE_ZOOM,
+        )
+        self.stdout.write(self.style.SUCCESS(f"active: {rel}"))
+
+        self.after_swap(name, index, opts["seed_maxzoom"])
+        self.stdout.write("원본에서 만든 파생 테이블은 따로 갱신: " + ", ".join(DERIVED_HINTS))
+
+    def after_swap(self, name, index, seed_maxzoom=0):
+        """아카이브에서 바뀐 타일 삭제 + (선택) 서버 캐시 미리 채우기 — import_release 도 쓴다"""
+        for lid, deleted in datasets.invalidate_archives(name, index).items():
+            if deleted:
+                self.stdout.write(f"  archive {lid}: {deleted} tiles removed (build_tile_archive --layers {lid} 로 다시 채움)")
+        if seed_maxzoom and index is not None:
+            self.seed(datasets.affected_layers(name), index, min(seed_maxzoom, index.zoom))
+
+    def seed(self, layer_ids, index, maxzoom):
+        from main.views import LayerTileView
+
+        factory = RequestFactory()
+        seeded = 0
+        for lid in layer_ids:
+            cls = LAYERS[lid]
+            view = LayerTileView.as_view(layer_id=lid)
+            for z in range(max(cls.min_zoom, 0), min(maxzoom, cls.max_zoom) + 1):
+                tiles = index.base if z == index.zoom else index.pyramid[z]
+                for x, y in sorted(tiles):
+                    view(factory.get(f"/tiles/{lid}/{z}/{x}/{y}.pbf"), z=z, x=x, y=y)
+                    seeded += 1
+            self.stdout.write(f"  seeded {lid} z{cls.min_zoom}-{maxzoom}")
+        self.stdout.write(f"  {seeded} tiles rendered into the server cache")
+
+    def list(self):
+        datasets.refresh(force=True)
+        active = {r.name: r for r in DatasetRelease.objects.filter(active=True)}
+        for name, default in datasets.RELEASE_TABLES.items():
+            rel = active.get(name)
+            if rel is None:
+                self.stdout.write(f"{name:20} {default}  (기본 릴리스)")
+            else:
+                scope = "전체" if rel.tiles is None else f"{len(rel.tiles)} tiles"
+                self.stdout.write(f"{name:20} {rel.table}  v={rel.version}  {rel.activated:%Y-%m-%d %H:%M}  {scope}")
@@ -0,0 +1,206 @@
+# main/metrics.py
+# 요청 계측 — Server-Timing 헤더 + Prometheus 텍스트 형식 /metrics
+#  - 요청마다 단계별 시간(db / encode / cache / upstream)을 모아 Server-Timing 으로 내보낸다.
+#    gzip 은 응답이 뷰를 떠난 뒤 압축되므로 ServerTimingGZipMiddleware 가 덧붙인다.
+#  - 레이어(뷰)별 히스토그램: 지연(초), 응답 bytes, feature 수 + 캐시 결과 카운터/적중률
+#  - 값은 프로세스 메모리에만 있다 → 워커가 여럿이면 워커마다 따로 긁힌다 (Prometheus 에서 합산)
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.middleware.gzip import GZipMiddleware
+
+from .mvt import layer_feature_counts
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (0, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+FEATURE_BUCKETS = (0, 10, 50, 100, 500, 1000, 5000, 20000)
+
+_lock = threading.Lock()
+_current = contextvars.ContextVar("server_timing", default=None)
+
+
+# ---------------------------------------------------------------------
+# Server-Timing
+# ---------------------------------------------------------------------
+class ServerTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # 단계 이름 -> 초 (같은 단계는 누적)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def header(self):
+        parts = [f"{name};dur={sec * 1000:.1f}" for name, sec in self.phases.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def start():
+    """요청 시작 — 이후 phase() 가 이 요청에 기록된다"""
+    timing = ServerTiming()
+    _current.set(timing)
+    return timing
+
+
+@contextmanager
+def phase(name, exclude=()):
+    """
+    with phase("db"): ... — 현재 요청의 단계 시간 누적 (요청 밖이면 무시).
+    exclude: 안쪽에서 따로 잰 단계(예: encode 안의 db)는 빼고 기록
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    before = sum(timing.phases.get(n, 0.0) for n in exclude)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        inner = sum(timing.phases.get(n, 0.0) for n in exclude) - before
+        timing.add(name, time.perf_counter() - t0 - inner)
+
+
+def with_server_timing(response, timing):
+    response["Server-Timing"] = timing.header()
+    return response
+
+
+class ServerTimingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware + 압축 시간을 Server-Timing 에 gzip 단계로 추가"""
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            # 미리 압축된 타일 (tile_http.cache_entry) — 다시 압축하지 않는다
+            return response
+        t0 = time.perf_counter()
+        response = super().process_response(request, response)
+        if response.has_header("Server-Timing") and response.get("Content-Encoding") == "gzip":
+            ms = (time.perf_counter() - t0) * 1000
+            response["Server-Timing"] = f"{response['Server-Timing']}, gzip;dur={ms:.1f}"
+        return response
+
+
+# ---------------------------------------------------------------------
+# Prometheus 지표
+# ---------------------------------------------------------------------
+def _labels(names, values):
+    return ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names=("layer",)):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series = {}  # 레이블 값 튜플 -> [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, labels, value):
+        with _lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    s[i] += 1
+            s[-2] += 1
+            s[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for labels, s in sorted(series.items()):
+            base = _labels(self.label_names, labels)
+            for bound, count in zip(self.buckets, s):
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {s[-2]}')
+            lines.append(f"{self.name}_sum{{{base}}} {s[-1]}")
+            lines.append(f"{self.name}_count{{{base}}} {s[-2]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self):
+        with _lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{{{_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+LATENCY = Histogram("autosolar_request_seconds", "Response time by layer/endpoint", LATENCY_BUCKETS)
+RESPONSE_BYTES = Histogram("autosolar_response_bytes", "Rendered payload size by layer/endpoint", BYTES_BUCKETS)
+FEATURES = Histogram("autosolar_tile_features", "Features per rendered tile layer", FEATURE_BUCKETS)
+CACHE = Counter("autosolar_cache_total", "Cache lookups by layer/endpoint and result", ("layer", "result"))
+PHASE = Counter("autosolar_phase_seconds_total", "Time spent per phase", ("layer", "phase"))
+LEAN_BYTES = Counter("autosolar_lean_sample_bytes_total",
+                     "Sampled ?lean=1 tiles rendered both ways: lean / full / saved bytes", ("layer", "variant"))
+
+
+def count_cache(label, result):
+    """result: hit / miss / empty(커버리지 밖) / revalidated / stale / coalesced"""
+    CACHE.inc((label, result))
+
+
+def observe(label, timing, content=None, size=None, features=None):
+    """
+    요청 하나 기록. content 가 MVT bytes 면 크기와 MVT 레이어별 feature 수를 같이 기록
+    (캐시 적중은 content=None 으로 — 크기/feature 는 렌더링한 타일만 센다).
+    """
+    LATENCY.observe((label,), timing.elapsed())
+    for name, seconds in timing.phases.items():
+        PHASE.inc((label, name), seconds)
+    if content is not None:
+        size = len(content)
+        for layer, n in layer_feature_counts(content).items():
+            FEATURES.observe((layer,), n)
+    if size is not None:
+        RESPONSE_BYTES.observe((label,), size)
+    if features is not None:
+        FEATURES.observe((label,), features)
+
+
+def _hit_ratio_lines():
+    totals, hits = {}, {}
+    for (label, result), value in CACHE.snapshot().items():
+        if result == "empty":
+            continue
+        totals[label] = totals.get(label, 0) + value
+        if result == "hit":
+            hits[label] = hits.get(label, 0) + value
+    lines = [
+        "# HELP autosolar_cache_hit_ratio Cache hits / lookups by layer/endpoint",
+        "# TYPE autosolar_cache_hit_ratio gauge",
+    ]
+    for label, total in sorted(totals.items()):
+        lines.append(f'autosolar_cache_hit_ratio{{layer="{label}"}} {hits.get(label, 0) / total:.4f}')
+    return lines
+
+
+def render():
+    lines = []
+    for metric in (LATENCY, RESPONSE_BYTES, FEATURES, CACHE, PHASE, LEAN_BYTES):
+        lines += metric.render()
+    lines += _hit_ratio_lines()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.4 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowTile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('endpoint', models.CharField(max_length=100)),
+                ('layers', models.CharField(blank=True, max_length=500)),
+                ('z', models.IntegerField(blank=True, null=True)),
+                ('x', models.IntegerField(blank=True, null=True)),
+                ('y', models.IntegerField(blank=True, null=True)),
+                ('query', models.TextField(blank=True)),
+                ('duration_ms', models.FloatField(db_index=True)),
+                ('db_ms', models.FloatField(blank=True, null=True)),
+                ('size', models.IntegerField(blank=True, null=True)),
+                ('features', models.IntegerField(blank=True, null=True)),
+                ('sql', models.TextField(blank=True)),
+                ('params', models.TextField(blank=True)),
+                ('explain', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-duration_ms'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.4 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_slowtile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetRelease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=100)),
+                ('version', models.CharField(max_length=100)),
+                ('table', models.CharField(max_length=255)),
+                ('previous_table', models.CharField(blank=True, max_length=255)),
+                ('active', models.BooleanField(default=False)),
+                ('activated', models.DateTimeField(auto_now_add=True)),
+                ('zoom', models.IntegerField(default=14)),
+                ('tiles', models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['name', '-id'],
+            },
+        ),
+    ]
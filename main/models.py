@@ -1,5 +1,7 @@
 from django.contrib.gis.db import models as gis
 
+from . import datasets
+
 # =============================================================================
 # 기존 모델 (유지)
 # =============================================================================
@@ -68,21 +70,21 @@ class OwnerRaw(gis.Model):
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.2_ownerinfo_chungnam_al_d160_44_20250907_combined"'
+        db_table = datasets.db_table("owner")
 
 class Yongdo(gis.Model):
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7_yongdo_lsmd_cont_uq112_44_202508"'
+        db_table = datasets.db_table("yongdo")
 
 class Road(gis.Model):
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiLineStringField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."3.4_road_lsmd_cont_ui101_44_202508"'
+        db_table = datasets.db_table("road")
 
 class Jimok(gis.Model):
     gid     = gis.IntegerField(primary_key=True)
@@ -92,7 +94,7 @@ class Jimok(gis.Model):
     geom    = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter."jimok"'
+        db_table = '"filter"."jimok"'
 
 class OwnerS30(gis.Model):
     gid  = gis.IntegerField(primary_key=True)
@@ -127,13 +129,13 @@ class JimokS30(gis.Model):
         managed = False
         db_table = '"filter"."jimok_s30"'
 
-# ✅ 추가: 주거이격(폴리곤) — filter."3.4_f_fac_building_44_202509"
+# ✅ 추가: 주거이격(폴리곤) — 건물 (datasets.RELEASE_TABLES["resi"])
 class ResiSetback(gis.Model):
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."3.4_f_fac_building_44_202509"'
+        db_table = datasets.db_table("resi")
 
 # 파일 하단 적절한 위치(예: ResiSetback 아래)에 추가
 class Nonglim(gis.Model):  # 농림지역
@@ -141,33 +143,168 @@ class Nonglim(gis.Model):  # 농림지역
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7.2_nonglim_al_d126_00_20250904"'
+        db_table = datasets.db_table("nonglim")
 
 class NongupJinheung(gis.Model):  # 농업진흥구역
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7.2.1_nongupjinheung_al_d036_00_20250904"'
+        db_table = datasets.db_table("nongupjinheung")
 
 class JayeonNogji(gis.Model):  # 자연녹지지역
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7.4_jayeon_al_d127_00_20250904"'
+        db_table = datasets.db_table("jayeonnogji")
 
 class GaebalJingheung(gis.Model):  # 개발진흥구역
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7.5_gaebaljingeuing_al_d137_00_20250904"'
+        db_table = datasets.db_table("gaebaljingheung")
 
 class NongupSeisanGiban(gis.Model):  # 농업생산기반정비사업지역
     gid  = gis.IntegerField(primary_key=True)
     geom = gis.MultiPolygonField(srid=5186)
     class Meta:
         managed = False
-        db_table = '"filter"."1.7.6_nongup_etc_al_d035_00_20250904"'
+        db_table = datasets.db_table("nongupseisangiban")
+
+# 태양광 입지 적합성 결과 — manage.py build_suitability 로 생성
+#   필지(Jimok)에서 이격 버퍼와 제외 용도지역을 뺀 남은 면적(usable_area, ㎡)
+#   scenario = "road{m}_resi{m}_{제외레이어-...}" (suitability.scenario_key)
+class Suitability(gis.Model):
+    id           = gis.BigAutoField(primary_key=True)
+    scenario     = gis.TextField()
+    gid          = gis.IntegerField()
+    pnu          = gis.TextField(blank=True, null=True)
+    a20          = gis.TextField(blank=True, null=True)
+    parcel_area  = gis.FloatField()
+    usable_area  = gis.FloatField()
+    usable_ratio = gis.FloatField(blank=True, null=True)
+    geom         = gis.MultiPolygonField(srid=5186)
+    class Meta:
+        managed = False
+        db_table = '"filter"."suitability"'
+
+# =============================================================================
+# LOD(단순화+분할) 테이블 — manage.py build_lod_tables 로 생성
+#   filter."{key}_s{tol}" : 허용오차 tol(m)로 단순화 후 ST_Subdivide
+#   레이어별 단계(줌, tol)는 vector_layers.LAYER_CONFIG 의 "lod"
+# =============================================================================
+
+# 이미 손으로 만들어 둔 단순화 테이블 모델
+_EXPLICIT_LOD_MODELS = {
+    ("owner", 30): OwnerS30,
+    ("yongdo", 30): YongdoS30,
+    ("road", 10): RoadS10,
+    ("jimok", 30): JimokS30,
+}
+
+
+def lod_table_name(key, tol):
+    return f"{key}_s{tol}"
+
+
+def _derived_model(base, class_name, table):
+    """base 와 같은 컬럼의 filter."{table}" 읽기전용 모델"""
+    attrs = {f.name: f.clone() for f in base._meta.concrete_fields}
+    attrs["__module__"] = __name__
+    attrs["Meta"] = type("Meta", (), {
+        "managed": False,
+        "db_table": f'"filter"."{table}"',
+    })
+    return type(class_name, (gis.Model,), attrs)
+
+
+def _lod_model(key, base, tol):
+    return _derived_model(base, f"{base.__name__}S{tol}", lod_table_name(key, tol))
+
+
+def lod_models(key, base, levels):
+    """((max_zoom, tol), ...) -> ((max_zoom, 모델), ...) — 레지스트리 생성 시 한 번만 호출"""
+    return tuple(
+        (max_zoom, _EXPLICIT_LOD_MODELS.get((key, tol)) or _lod_model(key, base, tol))
+        for max_zoom, tol in levels
+    )
+
+# =============================================================================
+# 분할 테이블 — manage.py build_subdivided 로 생성
+#   filter."{key}_subdiv" : 원본을 단순화 없이 ST_Subdivide(max_vertices) — 조각마다 원본 gid 유지
+#   LOD 단계 밖(최대 해상도) 줌에서 원본 대신 쓴다 → 타일은 그 타일에 걸친 조각의 정점만 자른다
+#   (gid 가 같은 조각은 클라이언트/identify 에서 한 feature 로 다룬다)
+# =============================================================================
+_EXPLICIT_SUBDIV_MODELS = {
+    "owner": OwnerSubdiv,
+}
+
+
+def subdiv_table_name(key):
+    return f"{key}_subdiv"
+
+
+def subdiv_model(key, base):
+    """레이어 키 -> 분할 테이블 모델 — 레지스트리 생성 시 한 번만 호출"""
+    return _EXPLICIT_SUBDIV_MODELS.get(key) or _derived_model(base, f"{base.__name__}Subdiv", subdiv_table_name(key))
+
+# =============================================================================
+# 필터 컬럼 복합 인덱스 — manage.py build_filter_indexes 로 생성
+#   (컬럼, geom) btree_gist 인덱스: 필터 타일은 고른 범주의 행만 bbox 로 읽는다.
+#   LOD/분할 테이블은 build_lod_tables / build_subdivided 가 같은 인덱스를 함께 만든다.
+# =============================================================================
+FILTER_COLUMNS = {
+    "owner": ("a20", "a8"),   # jm(지목), own(소유자)
+}
+
+
+# =============================================================================
+# 느린 타일 기록 — 타일/이격 응답이 SLOW_TILE_MS 를 넘으면 저장 (main/slow_tiles.py)
+#   관리 페이지(admin) 또는 manage.py slow_tiles 로 가장 느린 타일 확인
+# =============================================================================
+class SlowTile(gis.Model):
+    created     = gis.DateTimeField(auto_now_add=True, db_index=True)
+    endpoint    = gis.CharField(max_length=100)               # metrics 레이블 (road, composite, road_setback_geojson ...)
+    layers      = gis.CharField(max_length=500, blank=True)   # 레이어 id (쉼표 구분)
+    z           = gis.IntegerField(null=True, blank=True)
+    x           = gis.IntegerField(null=True, blank=True)
+    y           = gis.IntegerField(null=True, blank=True)
+    query       = gis.TextField(blank=True)                   # 요청 쿼리스트링 (jm/own/dist/bbox ...)
+    duration_ms = gis.FloatField(db_index=True)
+    db_ms       = gis.FloatField(null=True, blank=True)
+    size        = gis.IntegerField(null=True, blank=True)     # 응답 bytes
+    features    = gis.IntegerField(null=True, blank=True)
+    sql         = gis.TextField(blank=True)
+    params      = gis.TextField(blank=True)                   # JSON
+    explain     = gis.TextField(blank=True)                   # EXPLAIN (ANALYZE, BUFFERS) — 표본만
+
+    class Meta:
+        ordering = ["-duration_ms"]
+
+    def __str__(self):
+        where = f" {self.z}/{self.x}/{self.y}" if self.z is not None else ""
+        return f"{self.endpoint}{where} {self.duration_ms:.0f}ms"
+
+
+# =============================================================================
+# 데이터셋 릴리스 레지스트리 (main/datasets.py, manage.py swap_dataset)
+#   name 마다 active 인 행이 현재 물리 테이블. tiles = 이 릴리스에서 바뀐 geometry 가 걸친
+#   z{zoom} 타일 [[x, y], ...] (NULL 이면 전체가 바뀐 것으로 본다)
+# =============================================================================
+class DatasetRelease(gis.Model):
+    name           = gis.CharField(max_length=100, db_index=True)   # 논리 이름 (owner, road, ...)
+    version        = gis.CharField(max_length=100)                  # 릴리스 표기 (202510 ...)
+    table          = gis.CharField(max_length=255)                  # filter 스키마 물리 테이블
+    previous_table = gis.CharField(max_length=255, blank=True)
+    active         = gis.BooleanField(default=False)
+    activated      = gis.DateTimeField(auto_now_add=True)
+    zoom           = gis.IntegerField(default=14)
+    tiles          = gis.JSONField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["name", "-id"]
 
+    def __str__(self):
+        return f"{self.name}@{self.version} ({self.table})"
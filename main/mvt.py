@@ -0,0 +1,55 @@
+# main/mvt.py
+# MVT(protobuf) 최소 파서 — 레이어별 feature 수 세기 (벤치마크/계측용)
+#   Tile.layers = 3, Layer.name = 1, Layer.features = 2 만 본다. 외부 의존성 없음.
+
+
+def _varint(buf, i):
+    shift = result = 0
+    while True:
+        b = buf[i]
+        i += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, i
+        shift += 7
+
+
+def _fields(buf):
+    """(field 번호, wire type, 값) — 길이 구분 필드는 memoryview 조각"""
+    buf = memoryview(buf)
+    i, end = 0, len(buf)
+    while i < end:
+        key, i = _varint(buf, i)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, i = _varint(buf, i)
+        elif wire == 2:
+            n, i = _varint(buf, i)
+            value, i = buf[i:i + n], i + n
+        elif wire == 1:
+            value, i = buf[i:i + 8], i + 8
+        elif wire == 5:
+            value, i = buf[i:i + 4], i + 4
+        else:
+            raise ValueError(f"unsupported wire type {wire}")
+        yield field, wire, value
+
+
+def layer_feature_counts(tile):
+    """{레이어 이름: feature 수} — 여러 레이어가 이어붙은 타일도 처리"""
+    counts = {}
+    for field, wire, layer in _fields(tile or b""):
+        if field != 3 or wire != 2:
+            continue
+        name, n = "", 0
+        for lf, lw, value in _fields(layer):
+            if lf == 1 and lw == 2:
+                name = bytes(value).decode("utf-8", "replace")
+            elif lf == 2 and lw == 2:
+                n += 1
+        counts[name] = counts.get(name, 0) + n
+    return counts
+
+
+def feature_count(tile):
+    return sum(layer_feature_counts(tile).values())
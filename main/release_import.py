@@ -0,0 +1,154 @@
+# main/release_import.py
+# 월별 원본 릴리스 적재 (manage.py import_release)
+#  - 원본(shp / gpkg ...)을 GDAL DataSource 로 읽어 staging 스키마 테이블에 COPY 로 흘려 넣는다
+#    (데이터셋마다 워커 프로세스 하나, 메모리에 모으지 않고 feature 단위로 스트리밍)
+#  - EPSG:5186 변환 → PK(gid), GiST(+필터 컬럼 복합 인덱스) → CLUSTER(GiST 순서) → ANALYZE
+#  - 적재 중에는 UNLOGGED 로 두고(타입 변경/CLUSTER 재작성에 WAL 을 안 쓴다) 끝나면 LOGGED 로
+#  - 다 만든 뒤 커맨드가 한 트랜잭션에서 filter 스키마로 옮기고 레지스트리(main/datasets.py)에
+#    활성 릴리스로 기록 → 적재 중에는 기존 릴리스를 그대로 서비스한다
+import os
+import time
+
+from .tables import MAX_IDENTIFIER
+
+STAGING_SCHEMA = "staging"
+TARGET_SRID = 5186
+
+# 인덱스 이름 "{table}_geom_gix" 가 식별자 길이를 넘지 않게 (필터 인덱스는 tables.index_name 이 줄인다)
+MAX_TABLE_NAME = MAX_IDENTIFIER - len("_geom_gix")
+
+
+def parse_source(spec):
+    """'owner=/data/owner.shp' 또는 'owner=/data/release.gpkg@layer' -> (이름, 경로, 레이어 또는 None)"""
+    name, sep, rest = spec.partition("=")
+    if not sep or not name or not rest:
+        raise ValueError(f"invalid source: {spec} (name=path[@layer])")
+    path, _, layer = rest.partition("@")
+    return name.strip(), path, layer or None
+
+
+def open_layer(path, layer=None, encoding="utf-8"):
+    from django.contrib.gis.gdal import DataSource
+
+    ds = DataSource(path, encoding=encoding)
+    # DataSource 가 사라지면 레이어 포인터도 무효 — 같이 돌려준다
+    return ds, (ds[layer] if layer is not None else ds[0])
+
+
+def staging_table_name(layer, suffix=""):
+    name = f"{layer.name}{suffix}".lower()
+    if len(name) > MAX_TABLE_NAME:
+        raise ValueError(f"table name too long ({len(name)} > {MAX_TABLE_NAME}): {name}")
+    return name
+
+
+def layer_srid(layer):
+    """원본 좌표계 EPSG — .prj 가 ESRI WKT 면 식별을 시도, 모르면 None"""
+    srs = layer.srs
+    if srs is None:
+        return None
+    if srs.srid is None:
+        try:
+            srs.identify_epsg()
+        except Exception:
+            return None
+    return srs.srid
+
+
+def _columns(layer, model):
+    """[(원본 필드, 컬럼, 타입)] — 컬럼은 소문자 (shp2pgsql 과 같게), gid/geom 은 따로"""
+    int_cols = {f.column for f in model._meta.concrete_fields if f.get_internal_type() == "IntegerField"}
+    cols, seen = [], {"geom"}
+    for field in layer.fields:
+        col = field.lower()
+        if col in seen:
+            continue
+        seen.add(col)
+        cols.append((field, col, "integer" if col in int_cols else "text"))
+    return cols
+
+
+def _feature_geom(feat):
+    try:
+        return feat.geom.hex
+    except Exception:  # geometry 없는 feature
+        return None
+
+
+# ---------------------------------------------------------------------
+# 워커 (multiprocessing) — tile_archive.init_worker 로 django.setup() 후 실행
+# ---------------------------------------------------------------------
+def load_dataset(task):
+    """
+    task = (이름, 경로, 레이어, staging 테이블, 원본 SRID 또는 None, 인코딩)
+    -> (이름, 테이블, 행 수, 원본 SRID, 초)
+    """
+    import psycopg
+
+    from .datasets import dataset_models
+    from .db_pool import conninfo
+    from .management.commands.build_filter_indexes import filter_index_ddl
+    from .management.commands.build_lod_tables import GEOM_TYPES
+    from .models import FILTER_COLUMNS
+
+    name, path, layer_ref, table, source_srid, encoding = task
+    t0 = time.monotonic()
+    ds, layer = open_layer(path, layer_ref, encoding)
+    srid = source_srid or layer_srid(layer)
+    if srid is None:
+        raise ValueError(f"{name}: 원본 좌표계를 알 수 없음 (--source-srid)")
+    model = dataset_models()[name]
+    extract, col_type = GEOM_TYPES[model._meta.get_field("geom").geom_type]
+    cols = _columns(layer, model)
+    gid_field = next((field for field, col, _ in cols if col == "gid"), None)
+    cols = [c for c in cols if c[1] != "gid"]
+
+    q = f'{STAGING_SCHEMA}."{table}"'
+    col_sql = "".join(f', "{col}" {typ}' for _, col, typ in cols)
+    col_names = ", ".join(["gid"] + [f'"{col}"' for _, col, _ in cols] + ["geom"])
+    geom = "ST_SetSRID(geom, %d)" % srid
+    if srid != TARGET_SRID:
+        geom = f"ST_Transform({geom}, {TARGET_SRID})"
+
+    with psycopg.connect(conninfo(), autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {STAGING_SCHEMA}")
+        conn.execute(f"DROP TABLE IF EXISTS {q}")
+        conn.execute(f"CREATE UNLOGGED TABLE {q} (gid integer{col_sql}, geom geometry)")
+
+        # 1) 스트리밍 COPY (gid 필드가 없으면 feature 순번 — shp2pgsql 과 같게 1부터)
+        with conn.cursor() as cur, cur.copy(f"COPY {q} ({col_names}) FROM STDIN") as copy:
+            for i, feat in enumerate(layer, 1):
+                gid = feat.get(gid_field) if gid_field else i
+                values = []
+                for field, _, typ in cols:
+                    value = feat.get(field)
+                    values.append(None if value is None else (value if typ == "integer" else str(value)))
+                copy.write_row([gid, *values, _feature_geom(feat)])
+        del ds
+
+        # 2) 5186 변환 + 타입 고정 (한 번의 재작성)
+        conn.execute(
+            f"ALTER TABLE {q} ALTER COLUMN geom TYPE geometry({col_type}, {TARGET_SRID}) "
+            f"USING ST_Multi(ST_CollectionExtract({geom}, {extract}))"
+        )
+        # 3) 인덱스 → GiST 순서로 CLUSTER → LOGGED → 통계
+        conn.execute(f'ALTER TABLE {q} ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (gid)')
+        conn.execute(f'CREATE INDEX "{table}_geom_gix" ON {q} USING gist (geom)')
+        filter_indexes = filter_index_ddl(table, FILTER_COLUMNS.get(name, ()), schema=STAGING_SCHEMA)
+        if filter_indexes:
+            conn.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        for _, sql in filter_indexes:
+            conn.execute(sql)
+        conn.execute(f'CLUSTER {q} USING "{table}_geom_gix"')
+        conn.execute(f"ALTER TABLE {q} SET LOGGED")
+        conn.execute(f"ANALYZE {q}")
+        rows = conn.execute(f"SELECT count(*) FROM {q}").fetchone()[0]
+    return name, table, rows, srid, time.monotonic() - t0
+
+
+def source_size(path):
+    """큰 원본부터 워커에 넘기려고 (가장 오래 걸리는 적재가 먼저 시작)"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
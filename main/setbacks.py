@@ -0,0 +1,199 @@
+# main/setbacks.py
+# 도로/주거 이격(버퍼) SQL 모음 — GeoJSON 뷰와 MVT 레이어가 같이 쓴다.
+#  - 표준 이격거리(50/100/200/300m)는 build_setback_tables 로 미리 만든
+#    버퍼 테이블(filter."{kind}_setback_{dist}")을 읽는다.
+#  - 그 외 거리는 원본 테이블에서 즉석 ST_Buffer.
+import math
+
+from . import datasets
+from .tables import table_exists
+
+# 이격 종류 -> 원본 데이터셋 (main/datasets.py — 현재 릴리스 테이블)
+SETBACK_SOURCES = {
+    "road": "road",
+    "resi": "resi",
+}
+
+
+def source_table(kind):
+    return datasets.qualified(SETBACK_SOURCES[kind])
+
+# 이격거리 허용 범위 (m)
+MIN_DIST = 1
+MAX_DIST = 1000
+
+# 미리 계산해 두는 표준 이격거리 (m)
+STANDARD_DISTANCES = (50, 100, 200, 300)
+
+# 디졸브 테이블 격자 크기 (m, EPSG:5186)
+CELL_SIZE = 1000
+
+
+def parse_dist(raw):
+    dist = float(raw)
+    if not (MIN_DIST <= dist <= MAX_DIST):
+        raise ValueError("dist out of range")
+    return dist
+
+
+def simplify_tolerance(z):
+    """줌별 단순화 허용오차 (m) — 256px 타일 기준 반 픽셀 (위도 36.5° 보정)."""
+    return 156543.034 * math.cos(math.radians(36.5)) / (1 << int(z)) * 0.5
+
+
+def zoom_for_bbox(minx, maxx, width_px=1024):
+    """bbox(경도 폭)로 추정한 줌 (GeoJSON 요청에 z 가 없을 때)."""
+    span = max(maxx - minx, 1e-9)
+    return max(0, min(22, int(math.log2(360.0 * width_px / 256.0 / span))))
+
+
+def buffer_table_name(kind, dist):
+    return f"{kind}_setback_{int(dist)}"
+
+
+def dissolved_table_name(kind, dist):
+    return f"{kind}_setback_{int(dist)}_dissolved"
+
+
+def precomputed_table(kind, dist, dissolved=False):
+    """표준 거리이고 테이블이 준비돼 있으면 'filter."..."' 이름, 아니면 None."""
+    if dist != int(dist) or int(dist) not in STANDARD_DISTANCES:
+        return None
+    name = (dissolved_table_name if dissolved else buffer_table_name)(kind, dist)
+    if not table_exists(name):
+        return None
+    return f'filter."{name}"'
+
+
+def buffer_source(kind, dist, env):
+    """(gid, geom) 버퍼 후보 SELECT. env 는 5186 범위 SQL 식."""
+    table = precomputed_table(kind, dist)
+    if table:
+        return f"SELECT s.gid, s.geom FROM {table} AS s WHERE ST_Intersects(s.geom, {env})", []
+    return (
+        f"SELECT s.gid, ST_Buffer(s.geom, %s) AS geom FROM {source_table(kind)} AS s "
+        f"WHERE ST_DWithin(s.geom, {env}, %s)",
+        [dist, dist],
+    )
+
+
+def _dissolve_source(kind, dist, env, margin):
+    """
+    env(+margin) 범위로 잘라 union 한 단일 geom SELECT.
+    디졸브 테이블 > 버퍼 테이블 > 즉석 버퍼 순으로 원천을 고른다.
+    """
+    table = precomputed_table(kind, dist, dissolved=True)
+    if table:
+        # 잘라내는 범위(ST_Expand(env, margin))와 같은 범위로 골라야 타일 버퍼 영역이 비지 않는다
+        src_sql = f"SELECT d.geom FROM {table} AS d WHERE d.geom && ST_Expand({env}, %s)"
+        src_params = [margin]
+    else:
+        src_sql, src_params = buffer_source(kind, dist, env)
+    sql = (
+        f"SELECT ST_Union(ST_Intersection(b.geom, ST_Expand({env}, %s))) AS geom "
+        f"FROM ({src_sql}) AS b"
+    )
+    return sql, [margin, *src_params]
+
+
+def setback_tile_sql(kind, dist, bounds, layer_id, extent=4096, buffer=256,
+                     dissolve=False, z=None):
+    """
+    (dist, z, x, y) 이격 타일. bounds 는 3857 타일 범위.
+    ST_DWithin 으로 GiST 인덱스를 타고, 버퍼는 타일에 걸리는 후보에만 만든다.
+    dissolve=True 면 타일 안 버퍼를 하나로 union 하고 줌에 맞춰 단순화한다.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    if dissolve:
+        margin = (xmax - xmin) * buffer / extent
+        src_sql, src_params = _dissolve_source(kind, dist, "e.g", margin)
+        sql = f"""
+            WITH e AS (
+              SELECT ST_MakeEnvelope(%s,%s,%s,%s,3857) AS g3857,
+                     ST_Transform(ST_MakeEnvelope(%s,%s,%s,%s,3857), 5186) AS g
+            )
+            SELECT ST_AsMVT(q.*, %s, %s, 'geom') FROM (
+              SELECT %s::float8 AS dist,
+                     ST_AsMVTGeom(ST_Transform(ST_SimplifyPreserveTopology(u.geom, %s), 3857),
+                                  e.g3857, %s, %s, true) AS geom
+              FROM e, LATERAL ({src_sql}) AS u
+              WHERE u.geom IS NOT NULL
+            ) AS q
+        """
+        params = [
+            xmin, ymin, xmax, ymax,
+            xmin, ymin, xmax, ymax,
+            layer_id, extent,
+            dist, simplify_tolerance(z if z is not None else 16), extent, buffer,
+            *src_params,
+        ]
+        return sql, params
+
+    src_sql, src_params = buffer_source(kind, dist, "e.g")
+    sql = f"""
+        WITH e AS (
+          SELECT ST_MakeEnvelope(%s,%s,%s,%s,3857) AS g3857,
+                 ST_Transform(ST_MakeEnvelope(%s,%s,%s,%s,3857), 5186) AS g
+        )
+        SELECT ST_AsMVT(q.*, %s, %s, 'geom') FROM (
+          SELECT b.gid, %s::float8 AS dist,
+                 ST_AsMVTGeom(ST_Transform(b.geom, 3857), e.g3857, %s, %s, true) AS geom
+          FROM e, LATERAL ({src_sql}) AS b
+        ) AS q
+    """
+    params = [
+        xmin, ymin, xmax, ymax,
+        xmin, ymin, xmax, ymax,
+        layer_id, extent,
+        dist, extent, buffer,
+        *src_params,
+    ]
+    return sql, params
+
+
+def geojson_digits(z):
+    """줌별 ST_AsGeoJSON 소수 자릿수 — 픽셀 크기(도)보다 한 자리 더."""
+    deg_per_px = 360.0 / (256 * (1 << int(z)))
+    return max(4, min(8, math.ceil(-math.log10(deg_per_px)) + 1))
+
+
+def setback_features_sql(kind, dist, bbox, dissolve=False, z=None):
+    """
+    GeoJSON 뷰용: bbox(4326) 안의 Feature JSON 텍스트 한 줄씩.
+    PostGIS 가 Feature 를 통째로 만들어 주므로 파이썬은 이어붙이기만 한다.
+    z 가 있으면 줌에 맞춰 ST_Simplify + 좌표 자릿수를 줄인다.
+    dissolve=True 면 union 결과를 폴리곤별로 나눈 행 (gid 없음).
+    """
+    if dissolve and z is None:
+        z = zoom_for_bbox(bbox[0], bbox[2])
+    tol = simplify_tolerance(z) if z is not None else 0
+    digits = geojson_digits(z) if z is not None else 7
+
+    if dissolve:
+        src_sql, src_params = _dissolve_source(kind, dist, "bbox.g", 0)
+        rows_sql = f"""
+            SELECT NULL::integer AS gid, ST_SimplifyPreserveTopology(p.geom, %s) AS geom
+            FROM bbox, LATERAL ({src_sql}) AS u, LATERAL ST_Dump(u.geom) AS p
+        """
+        props = "json_build_object('dist', %s::float8)"
+    else:
+        src_sql, src_params = buffer_source(kind, dist, "bbox.g")
+        rows_sql = f"""
+            SELECT b.gid, ST_Simplify(b.geom, %s) AS geom
+            FROM bbox, LATERAL ({src_sql}) AS b
+        """
+        props = "json_build_object('gid', f.gid, 'dist', %s::float8)"
+
+    sql = f"""
+        WITH bbox AS (
+          SELECT ST_Transform(ST_MakeEnvelope(%s,%s,%s,%s,4326),5186) AS g
+        )
+        SELECT json_build_object(
+                 'type', 'Feature',
+                 'properties', {props},
+                 'geometry', ST_AsGeoJSON(ST_Transform(f.geom, 4326), %s)::json
+               )::text
+        FROM ({rows_sql}) AS f
+        WHERE f.geom IS NOT NULL AND NOT ST_IsEmpty(f.geom)
+    """
+    return sql, [*bbox, dist, digits, tol, *src_params]
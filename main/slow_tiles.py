@@ -0,0 +1,87 @@
+# main/slow_tiles.py
+# 느린 타일 기록 — 타일/이격 응답이 settings.SLOW_TILE_MS 를 넘으면
+#   레이어, z/x/y, 쿼리스트링(필터), 생성된 SQL 을 SlowTile 에 남기고
+#   SLOW_TILE_EXPLAIN_SAMPLE 비율로 EXPLAIN (ANALYZE, BUFFERS) 를 떠 둔다.
+#  - 기록/EXPLAIN 은 백그라운드 스레드에서 — 이미 느린 응답을 더 늦추지 않는다
+#  - EXPLAIN 은 쿼리를 한 번 더 실행하므로 동시에 하나만, statement_timeout 을 건다
+#  - 최근 SLOW_TILE_KEEP 건만 유지 (오래된 것부터 삭제)
+import json
+import random
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+_explain_slot = threading.BoundedSemaphore(1)
+
+
+def _threshold_ms():
+    return getattr(settings, "SLOW_TILE_MS", 0)
+
+
+def is_slow(timing):
+    threshold = _threshold_ms()
+    return bool(threshold) and timing.elapsed() * 1000 >= threshold
+
+
+def check(label, timing, request, query, layers=(), z=None, x=None, y=None, size=None, features=None):
+    """
+    느리면 기록 (True). query = (sql, params) — 렌더링에 쓴 SQL (없으면 None).
+    타일/이격 뷰가 응답(또는 스트림)을 끝낸 뒤 부른다.
+    """
+    if not is_slow(timing):
+        return False
+    sql, params = query or ("", [])
+    row = {
+        "endpoint": label,
+        "layers": ",".join(layers),
+        "z": z, "x": x, "y": y,
+        "query": request.GET.urlencode(),
+        "duration_ms": round(timing.elapsed() * 1000, 1),
+        "db_ms": round(timing.phases["db"] * 1000, 1) if "db" in timing.phases else None,
+        "size": size,
+        "features": features,
+        "sql": sql,
+        "params": json.dumps(list(params), ensure_ascii=False, default=str),
+    }
+    explain = bool(sql) and random.random() < getattr(settings, "SLOW_TILE_EXPLAIN_SAMPLE", 0.1)
+    threading.Thread(target=_record, args=(row, sql, params, explain), daemon=True).start()
+    return True
+
+
+def explain_analyze(sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS) 텍스트 — 시간 제한 안에서 (읽기 전용 트랜잭션)"""
+    timeout_ms = int(getattr(settings, "SLOW_TILE_EXPLAIN_TIMEOUT", 30) * 1000)
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("SET TRANSACTION READ ONLY")
+        cur.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+        cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+        return "\n".join(r[0] for r in cur.fetchall())
+
+
+def _record(row, sql, params, explain):
+    from .models import SlowTile
+
+    try:
+        obj = SlowTile.objects.create(**row)
+        if explain and _explain_slot.acquire(blocking=False):
+            try:
+                obj.explain = explain_analyze(sql, params)
+            except Exception as e:
+                obj.explain = f"EXPLAIN failed: {e}"
+            finally:
+                _explain_slot.release()
+            obj.save(update_fields=["explain"])
+        _prune(SlowTile)
+    except Exception:
+        # 계측 실패가 서비스에 영향을 주면 안 된다 (테이블 미생성 등)
+        pass
+    finally:
+        connection.close()
+
+
+def _prune(model):
+    keep = getattr(settings, "SLOW_TILE_KEEP", 1000)
+    cutoff = model.objects.order_by("-created").values_list("created", flat=True)[keep:keep + 1]
+    if cutoff:
+        model.objects.filter(created__lte=cutoff[0]).delete()
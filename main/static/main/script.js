@@ -80,18 +80,83 @@
   btnSearch?.addEventListener('click', geocodeAndMove);
   addrInput?.addEventListener('keydown', e => { if(e.key==='Enter') geocodeAndMove(); });
 
+  // ---------- 공통: 클릭 식별 (/api/identify/) ----------
+  const ZONING_NAMES = {
+    yongdo:'용도지역', nonglim:'농림지역', nongupjinheung:'농업진흥구역', jayeonnogji:'자연녹지지역',
+    gaebaljingheung:'개발진흥구역', nongupseisangiban:'농업생산기반정비사업지역'
+  };
+  async function identifyAt(latlng) {
+    const popup = L.popup().setLatLng(latlng).setContent('조회중…').openOn(map);
+    try {
+      const res = await fetch(`/api/identify/?lon=${latlng.lng}&lat=${latlng.lat}`);
+      if (res.status === 404) { popup.setContent('필지 없음'); return; }
+      if (!res.ok) throw new Error('HTTP ' + res.status);
+      const j = await res.json();
+      const o = j.owner || {};
+      const jibun = [o.a2, o.a5].filter(Boolean).join(' ') || j.parcel.jibun;
+      const zones = Object.entries(j.zoning).filter(([, gids]) => gids.length).map(([k]) => ZONING_NAMES[k] || k);
+      const sb = (kind) => {
+        const d = j.setback_distance[kind];
+        return d == null ? '-' : `${Math.round(d)}m`;
+      };
+      popup.setContent(`
+        <div style="font-size:12px; line-height:1.4;">
+          <div><b>PNU</b>: ${j.parcel.pnu || '-'}</div>
+          <div><b>지번</b>: ${jibun || '-'}</div>
+          <div><b>소유자</b>: ${o.a8 || '-'}</div>
+          <div><b>지목</b>: ${j.parcel.a20 || o.a20 || '-'}</div>
+          <div><b>면적</b>: ${j.parcel.area}㎡</div>
+          <div><b>용도지역</b>: ${zones.join(', ') || '-'}</div>
+          <div><b>도로/주거 거리</b>: ${sb('road')} / ${sb('resi')}</div>
+        </div>`);
+    } catch (e) {
+      console.error('[identify]', e);
+      popup.setContent('조회 실패');
+    }
+  }
+
+  // ---------- TileJSON ----------
+  // 타일 URL 템플릿은 TileJSON tiles[0] 을 그대로 쓴다 — 서버가 ?v=데이터 버전 을 붙여 주므로
+  // 타일 응답이 immutable 로 캐시된다 (직접 만든 URL 에는 v 가 없어 매번 재검증)
+  const tileJsonCache = new Map();
+  const loadTileJSON = (url) => {
+    if (!tileJsonCache.has(url)) {
+      tileJsonCache.set(url, fetch(url)
+        .then(r => { if (!r.ok) throw new Error(`${url}: ${r.status}`); return r.json(); })
+        .catch(e => { tileJsonCache.delete(url); throw e; }));
+    }
+    return tileJsonCache.get(url);
+  };
+
+  // ---------- 경량 타일(?lean=1) 코드표 ----------
+  // 소유 타일은 a20/a8 을 정수 코드로 받는다 — 코드표는 TileJSON vector_layers[].codes
+  // 코드표에 없는 값은 서버가 "{속성}_s" 에 문자열로 넣어 준다
+  let LEAN_CODES = {};
+  loadTileJSON('/tiles/owner.json?lean=1')
+    .then(j => {
+      (j.vector_layers || []).forEach(l => { if (l.codes) LEAN_CODES[l.id] = l.codes; });
+    })
+    .catch(() => {});
+  const decode = (layer, p, key) => {
+    const v = p[key];
+    if (typeof v === 'number') {
+      const table = (LEAN_CODES[layer] || {})[key];
+      return table ? table[v] : v;
+    }
+    return v ?? p[key + '_s'];
+  };
+
   // ---------- 공통: hover 툴팁 ----------
   function bindHoverTooltip(vg) {
     if (!vg) return;
     let tip;
+    vg.on('click', e => identifyAt(e.latlng));
     vg.on('mouseover', e => {
       const p = e.layer && e.layer.properties ? e.layer.properties : {};
-      const jibun = [p.a2, p.a5].filter(Boolean).join(' ');
       const html = `
         <div style="font-size:12px; line-height:1.4;">
-          <div><b>지번</b>: ${jibun || '-'}</div>
-          <div><b>소유자</b>: ${p.a8 || '-'}</div>
-          <div><b>지목</b>: ${p.a20 || '-'}</div>
+          <div><b>소유자</b>: ${decode('owner', p, 'a8') || '-'}</div>
+          <div><b>지목</b>: ${decode('owner', p, 'a20') || '-'}</div>
         </div>`;
       tip = L.tooltip({ permanent:false, direction:'top', offset:[0,-8], opacity:0.95 })
               .setLatLng(e.latlng).setContent(html).addTo(map);
@@ -108,28 +173,44 @@
   const getCheckedVals = (sel) => $$(sel).filter(el=>el.checked).map(el=>el.value);
 
   // ---------- 레이어 핸들 ----------
-  let vgJm = null, vgOwn = null, vgYongdo = null, vgRoad = null, vgJimok = null;
-  let vgResi = null;
-  let vgNonglim=null, vgNongupJin=null, vgJayeon=null, vgGaebal=null, vgNongupGiban=null;
+  let vgJm = null, vgOwn = null;
+  // TileJSON 을 기다리는 사이 체크가 또 바뀌면 이전 응답은 버린다
+  let jmSeq = 0, ownSeq = 0, compositeSeq = 0;
 
-  // GeoJSON 이격 레이어
+  // 이격 레이어 (MVT)
   let roadSetbackLayer = null, roadSetbackLoaded = false, roadSetbackEnabled = false;
   let resiSetbackLayer = null, resiSetbackLoaded = false, resiSetbackEnabled = false;
 
   // ---------- 쿼리스트링 ----------
+  // 값은 중복 제거 + 정렬 → 체크 순서와 무관하게 같은 URL(브라우저/서버 캐시 재사용)
   const qs = (pairs) => {
     const parts = [];
-    Object.entries(pairs).forEach(([k, vals]) => (Array.isArray(vals)?vals:[vals]).filter(Boolean).forEach(v => parts.push(`${encodeURIComponent(k)}=${encodeURIComponent(v)}`)));
-    parts.push('_t=' + Date.now());
-    return '?' + parts.join('&');
+    Object.entries(pairs).forEach(([k, vals]) => {
+      [...new Set((Array.isArray(vals)?vals:[vals]).filter(Boolean))].sort()
+        .forEach(v => parts.push(`${encodeURIComponent(k)}=${encodeURIComponent(v)}`));
+    });
+    return parts.length ? '?' + parts.join('&') : '';
+  };
+
+  // TileJSON tiles[0] (실패하면 null)
+  const tileTemplate = async (url) => {
+    try {
+      return (await loadTileJSON(url)).tiles[0];
+    } catch (e) {
+      console.error('[tilejson]', e);
+      return null;
+    }
   };
 
   // ---------- 지목(파랑) ----------
-  function refreshJm() {
+  async function refreshJm() {
+    const seq = ++jmSeq;
     const jm = getCheckedVals('#grp-jimok input.jm');
     if (vgJm && map.hasLayer(vgJm)) { map.removeLayer(vgJm); vgJm = null; }
     if (!jm.length) return;
-    vgJm = L.vectorGrid.protobuf(`/tiles/owner/{z}/{x}/{y}.pbf${qs({ jm })}`, {
+    const url = await tileTemplate(`/tiles/owner.json${qs({ jm, lean: 1 })}`);
+    if (!url || seq !== jmSeq) return;
+    vgJm = L.vectorGrid.protobuf(url, {
       maxNativeZoom: 22,
       interactive: true,
       vectorTileLayerStyles: {
@@ -140,11 +221,14 @@
   }
 
   // ---------- 소유자(초록) ----------
-  function refreshOwn() {
+  async function refreshOwn() {
+    const seq = ++ownSeq;
     const own = getCheckedVals('#grp-owner input.own');
     if (vgOwn && map.hasLayer(vgOwn)) { map.removeLayer(vgOwn); vgOwn = null; }
     if (!own.length) return;
-    vgOwn = L.vectorGrid.protobuf(`/tiles/owner/{z}/{x}/{y}.pbf${qs({ own })}`, {
+    const url = await tileTemplate(`/tiles/owner.json${qs({ own, lean: 1 })}`);
+    if (!url || seq !== ownSeq) return;
+    vgOwn = L.vectorGrid.protobuf(url, {
       maxNativeZoom: 22,
       interactive: true,
       vectorTileLayerStyles: {
@@ -154,109 +238,64 @@
     bindHoverTooltip(vgOwn);
   }
 
-  // ---------- 기타 토글 레이어 ----------
-  function addYongdo(){
-    vgYongdo = L.vectorGrid.protobuf(`/tiles/yongdo/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ yongdo:{ fill:true, fillOpacity:0.15, weight:0.6, color:'#a855f7' } }
-    }).addTo(map);
-  }
-  function addRoad(){
-    vgRoad = L.vectorGrid.protobuf(`/tiles/road/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ road:{ fill:false, weight:1.5, color:'#ef4444', opacity:1 } }
-    }).addTo(map);
-  }
-  function addJimok(){
-    vgJimok = L.vectorGrid.protobuf(`/tiles/jimok/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ jimok:{ fill:true, fillOpacity:0.15, weight:0.6, color:'#111111' } }
-    }).addTo(map);
-  }
-
-  // 주거이격(MVT)
-  function addResi(){
-    vgResi = L.vectorGrid.protobuf(`/tiles/resi/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ resi:{ fill:true, fillOpacity:0.25, weight:0.8, color:'#1e3a8a' } }
-    }).addTo(map);
-  }
-
-  // 정책 5종
-  function addNonglim(){
-    vgNonglim = L.vectorGrid.protobuf(`/tiles/nonglim/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ nonglim:{ fill:true, fillOpacity:0.20, weight:0.8, color:'#a3e635' } }
-    }).addTo(map);
-  }
-  function addNongupJin(){
-    vgNongupJin = L.vectorGrid.protobuf(`/tiles/nongupjinheung/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ nongupjinheung:{ fill:true, fillOpacity:0.20, weight:0.8, color:'#262627' } }
-    }).addTo(map);
-  }
-  function addJayeon(){
-    vgJayeon = L.vectorGrid.protobuf(`/tiles/jayeonnogji/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ jayeonnogji:{ fill:true, fillOpacity:0.20, weight:0.8, color:'#22c55e' } }
-    }).addTo(map);
-  }
-  function addGaebal(){
-    vgGaebal = L.vectorGrid.protobuf(`/tiles/gaebaljingheung/{z}/{x}/{y}.pbf`, {
-      maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ gaebaljingheung:{ fill:true, fillOpacity:0.20, weight:0.8, color:'#f97316' } }
-    }).addTo(map);
-  }
-  function addNongupGiban(){
-    vgNongupGiban = L.vectorGrid.protobuf(`/tiles/nongupseisangiban/{z}/{x}/{y}.pbf`, {
+  // ---------- 토글 레이어 — 복합 타일 한 소스 ----------
+  // 켜진 레이어를 /tiles/composite/{z}/{x}/{y}.pbf?layers=... 하나로 받는다 (템플릿은 /tiles/composite.json)
+  // (타일 좌표마다 레이어 수만큼 보내던 요청이 하나로). 스타일은 MVT 레이어 이름별.
+  // 용도지역 면 레이어는 LOD/분할 테이블(ST_Subdivide 조각)로 나가므로 외곽선을 그리면 조각 경계가
+  // 격자처럼 보인다 → 채우기만 (stroke:false). 필지(jimok/owner)와 resi 는 서버에서 분할하지 않으므로
+  // (vector_layers "subdiv": False) 외곽선을 그린다.
+  const LAYER_STYLES = {
+    yongdo:            { fill:true, fillOpacity:0.15, stroke:false, color:'#a855f7' },
+    road:              { fill:false, weight:1.5, color:'#ef4444', opacity:1 },
+    jimok:             { fill:true, fillOpacity:0.15, weight:0.6, color:'#111111' },
+    resi:              { fill:true, fillOpacity:0.25, weight:0.8, color:'#1e3a8a' },  // 주거이격(MVT)
+    // 정책 5종
+    nonglim:           { fill:true, fillOpacity:0.20, stroke:false, color:'#a3e635' },
+    nongupjinheung:    { fill:true, fillOpacity:0.20, stroke:false, color:'#262627' },
+    jayeonnogji:       { fill:true, fillOpacity:0.20, stroke:false, color:'#22c55e' },
+    gaebaljingheung:   { fill:true, fillOpacity:0.20, stroke:false, color:'#f97316' },
+    nongupseisangiban: { fill:true, fillOpacity:0.20, stroke:false, color:'#eab308' },
+  };
+  const activeLayers = new Set();
+  let vgComposite = null;
+
+  async function refreshComposite() {
+    const seq = ++compositeSeq;
+    if (vgComposite && map.hasLayer(vgComposite)) map.removeLayer(vgComposite);
+    vgComposite = null;
+    if (!activeLayers.size) return;
+    const url = await tileTemplate(`/tiles/composite.json${qs({ layers: [...activeLayers].sort().join(',') })}`);
+    if (!url || seq !== compositeSeq) return;
+    vgComposite = L.vectorGrid.protobuf(url, {
       maxNativeZoom:22, interactive:false,
-      vectorTileLayerStyles:{ nongupseisangiban:{ fill:true, fillOpacity:0.20, weight:0.8, color:'#eab308' } }
+      vectorTileLayerStyles: LAYER_STYLES
     }).addTo(map);
   }
+  const debComposite = debounce(refreshComposite, 50);
 
-  function removeIf(layerRefName){
-    const ref = { vgJm, vgOwn, vgYongdo, vgRoad, vgJimok, vgResi, vgNonglim, vgNongupJin, vgJayeon, vgGaebal, vgNongupGiban}[layerRefName];
-    if (ref && map.hasLayer(ref)) map.removeLayer(ref);
-    if (layerRefName==='vgJm') vgJm=null;
-    if (layerRefName==='vgOwn') vgOwn=null;
-    if (layerRefName==='vgYongdo') vgYongdo=null;
-    if (layerRefName==='vgRoad') vgRoad=null;
-    if (layerRefName==='vgJimok') vgJimok=null;
-    if (layerRefName==='vgResi') vgResi=null;
-    if (layerRefName==='vgNonglim') vgNonglim=null;
-    if (layerRefName==='vgNongupJin') vgNongupJin=null;
-    if (layerRefName==='vgJayeon') vgJayeon=null;
-    if (layerRefName==='vgGaebal') vgGaebal=null;
-    if (layerRefName==='vgNongupGiban') vgNongupGiban=null;
+  function setLayer(layerId, on) {
+    if (on) activeLayers.add(layerId); else activeLayers.delete(layerId);
+    debComposite();
   }
 
   // 토글(스위치) 바인딩
   $('#chk-road')?.addEventListener('change', e => {
+    setLayer('road', e.target.checked);
     if (e.target.checked) {
-      addRoad();
       syncRoadSetbackUI?.();
       if (roadSetbackEnabled && roadSetbackLayer) roadSetbackLayer.addTo(map);
-      // 투명도 초기 적용
-      applyVectorOpacity(vgRoad, 'road', Number($('#opacity-road')?.value || 1));
     } else {
-      removeIf('vgRoad');
       if (roadSetbackLayer && map.hasLayer(roadSetbackLayer)) map.removeLayer(roadSetbackLayer);
     }
   });
   $('#chk-resi')?.addEventListener('change', e => {
-    if (e.target.checked) {
-      addResi();
-      applyVectorOpacity(vgResi, 'resi', Number($('#opacity-resi')?.value || 0.25));
-    } else {
-      removeIf('vgResi');
-      if (resiSetbackLayer && map.hasLayer(resiSetbackLayer)) map.removeLayer(resiSetbackLayer);
-    }
+    setLayer('resi', e.target.checked);
+    if (!e.target.checked && resiSetbackLayer && map.hasLayer(resiSetbackLayer)) map.removeLayer(resiSetbackLayer);
   });
-  $('#chk-nonglim')?.addEventListener('change', e => e.target.checked ? (addNonglim(), applyVectorOpacity(vgNonglim,'nonglim', Number($('#opacity-nonglim').value))) : removeIf('vgNonglim'));
-  $('#chk-nongupjin')?.addEventListener('change', e => e.target.checked ? (addNongupJin(), applyVectorOpacity(vgNongupJin,'nongupjinheung', Number($('#opacity-nongupjin').value))) : removeIf('vgNongupJin'));
-  $('#chk-jayeon')?.addEventListener('change', e => e.target.checked ? (addJayeon(), applyVectorOpacity(vgJayeon,'jayeonnogji', Number($('#opacity-jayeon').value))) : removeIf('vgJayeon'));
-  $('#chk-gaebal')?.addEventListener('change', e => e.target.checked ? (addGaebal(), applyVectorOpacity(vgGaebal,'gaebaljingheung', Number($('#opacity-gaebal').value))) : removeIf('vgGaebal'));
-  $('#chk-nongupgiban')?.addEventListener('change', e => e.target.checked ? (addNongupGiban(), applyVectorOpacity(vgNongupGiban,'nongupseisangiban', Number($('#opacity-nongupgiban').value))) : removeIf('vgNongupGiban'));
+  [
+    ['#chk-nonglim', 'nonglim'], ['#chk-nongupjin', 'nongupjinheung'], ['#chk-jayeon', 'jayeonnogji'],
+    ['#chk-gaebal', 'gaebaljingheung'], ['#chk-nongupgiban', 'nongupseisangiban'],
+  ].forEach(([sel, layerId]) => $(sel)?.addEventListener('change', e => setLayer(layerId, e.target.checked)));
 
   // 지목/소유자 필터
   const debJm  = debounce(refreshJm, 150);
@@ -265,20 +304,23 @@
   $$('#grp-owner input.own').forEach(el => el.addEventListener('change', debOwn));
 
   // =====================================================================
-  // [ROAD SETBACK GEOJSON] — 기존 로직 유지 (UI만 상단 카드로 이동)
+  // [ROAD SETBACK MVT] — /tiles/road_setback/{dist}/{z}/{x}/{y}.pbf
   // =====================================================================
   let roadSetbackLastDist = 50;
 
+  // 이격 버퍼는 (dist, z, x, y) 벡터타일로 받는다 — 타일 단위 캐시/병렬 로딩
+  // dissolve=1: 겹치는 버퍼를 타일 단위로 합친 제척 영역만 받는다 (gid 별 폴리곤은 생략)
+  function makeSetbackGrid(layerId, dist, opacity) {
+    return L.vectorGrid.protobuf(`/tiles/${layerId}/${dist}/{z}/{x}/{y}.pbf?dissolve=1`, {
+      maxNativeZoom:22, interactive:false,
+      vectorTileLayerStyles:{ [layerId]:{ fill:true, color:'#666', weight:1, fillColor:'#999', fillOpacity:opacity } }
+    });
+  }
+
   async function loadRoadSetbackOnce(dist) {
     if (roadSetbackLoaded && roadSetbackLayer) return;
-    const b = map.getBounds();
-    const bbox = [b.getWest(), b.getSouth(), b.getEast(), b.getNorth()].join(',');
-    const url = `/geojson/road_setback${qs({ dist, bbox })}`;
-    const res = await fetch(url);
-    if (!res.ok) throw new Error('HTTP '+res.status);
-    const gj = await res.json();
     if (roadSetbackLayer && map.hasLayer(roadSetbackLayer)) map.removeLayer(roadSetbackLayer);
-    roadSetbackLayer = L.geoJSON(gj, { style:{ color:'#666', weight:1, fillColor:'#999', fillOpacity:Number($('#opacity-road').value||0.35) } });
+    roadSetbackLayer = makeSetbackGrid('road_setback', dist, Number($('#opacity-road').value||0.35));
     roadSetbackLoaded = true;
     roadSetbackLastDist = dist;
   }
@@ -312,20 +354,14 @@
   });
 
   // =====================================================================
-  // [RESI SETBACK GEOJSON] — 기존 로직 유지
+  // [RESI SETBACK MVT] — /tiles/resi_setback/{dist}/{z}/{x}/{y}.pbf
   // =====================================================================
   let resiSetbackLastDist = 50;
 
   async function loadResiSetbackOnce(dist) {
     if (resiSetbackLoaded && resiSetbackLayer) return;
-    const b = map.getBounds();
-    const bbox = [b.getWest(), b.getSouth(), b.getEast(), b.getNorth()].join(',');
-    const url = `/geojson/resi_setback${qs({ dist, bbox })}`;
-    const res = await fetch(url);
-    if (!res.ok) throw new Error('HTTP '+res.status);
-    const gj = await res.json();
     if (resiSetbackLayer && map.hasLayer(resiSetbackLayer)) map.removeLayer(resiSetbackLayer);
-    resiSetbackLayer = L.geoJSON(gj, { style:{ color:'#666', weight:1, fillColor:'#999', fillOpacity:Number($('#opacity-resi').value||0.25) } });
+    resiSetbackLayer = makeSetbackGrid('resi_setback', dist, Number($('#opacity-resi').value||0.25));
     resiSetbackLoaded = true;
     resiSetbackLastDist = dist;
   }
@@ -356,6 +392,14 @@
     // VectorGrid 레이어 스타일 갱신
     try { vg?.setFeatureStyle?.(layerId, { fillOpacity:v, opacity:v }); } catch {}
   }
+  // 복합 타일 레이어: 공유 스타일을 바꾸고 다시 그린다
+  const redrawComposite = debounce(() => vgComposite?.redraw(), 100);
+  function applyCompositeOpacity(layerId, v){
+    const style = LAYER_STYLES[layerId];
+    if (!style) return;
+    if (style.fill) style.fillOpacity = v; else style.opacity = v;
+    redrawComposite();
+  }
   function applyGeoJsonOpacity(layer, v){
     try { layer?.setStyle?.({ fillOpacity:v, opacity:v }); } catch {}
   }
@@ -369,6 +413,7 @@
       const targets = getTargets?.() || [];
       targets.forEach(t => {
         if (t.type === 'vector' ) applyVectorOpacity(t.ref, t.layerId, v);
+        if (t.type === 'composite') applyCompositeOpacity(t.layerId, v);
         if (t.type === 'geojson') applyGeoJsonOpacity(t.ref, v);
       });
     };
@@ -378,18 +423,18 @@
 
   // 레이어별 슬라이더-타겟 매핑
   bindOpacity('#opacity-road', '#opacity-road-val', () => [
-    { type:'vector', ref:vgRoad, layerId:'road' },
-    { type:'geojson', ref:roadSetbackLayer }
+    { type:'composite', layerId:'road' },
+    { type:'vector', ref:roadSetbackLayer, layerId:'road_setback' }
   ]);
   bindOpacity('#opacity-resi', '#opacity-resi-val', () => [
-    { type:'vector', ref:vgResi, layerId:'resi' },
-    { type:'geojson', ref:resiSetbackLayer }
+    { type:'composite', layerId:'resi' },
+    { type:'vector', ref:resiSetbackLayer, layerId:'resi_setback' }
   ]);
-  bindOpacity('#opacity-nonglim', '#opacity-nonglim-val', () => [{ type:'vector', ref:vgNonglim, layerId:'nonglim' }]);
-  bindOpacity('#opacity-nongupjin', '#opacity-nongupjin-val', () => [{ type:'vector', ref:vgNongupJin, layerId:'nongupjinheung' }]);
-  bindOpacity('#opacity-jayeon', '#opacity-jayeon-val', () => [{ type:'vector', ref:vgJayeon, layerId:'jayeonnogji' }]);
-  bindOpacity('#opacity-gaebal', '#opacity-gaebal-val', () => [{ type:'vector', ref:vgGaebal, layerId:'gaebaljingheung' }]);
-  bindOpacity('#opacity-nongupgiban', '#opacity-nongupgiban-val', () => [{ type:'vector', ref:vgNongupGiban, layerId:'nongupseisangiban' }]);
+  bindOpacity('#opacity-nonglim', '#opacity-nonglim-val', () => [{ type:'composite', layerId:'nonglim' }]);
+  bindOpacity('#opacity-nongupjin', '#opacity-nongupjin-val', () => [{ type:'composite', layerId:'nongupjinheung' }]);
+  bindOpacity('#opacity-jayeon', '#opacity-jayeon-val', () => [{ type:'composite', layerId:'jayeonnogji' }]);
+  bindOpacity('#opacity-gaebal', '#opacity-gaebal-val', () => [{ type:'composite', layerId:'gaebaljingheung' }]);
+  bindOpacity('#opacity-nongupgiban', '#opacity-nongupgiban-val', () => [{ type:'composite', layerId:'nongupseisangiban' }]);
 
   // ---------- 아코디언 ----------
   $$('.acc-header').forEach(btn => {
@@ -0,0 +1,132 @@
+# main/suitability.py
+# 태양광 입지 적합성 — 필지별 "쓸 수 있는 면적"
+#   필지(filter.jimok) − 도로 이격 버퍼 − 주거 이격 버퍼 − 제외 용도지역
+#   build_suitability 커맨드가 격자 구획(PARTITION_SIZE)별로 프로세스 풀에서 계산해
+#   filter.suitability 에 시나리오 단위로 저장하고, API/MVT 는 그 테이블만 읽는다.
+#   필지는 ST_PointOnSurface 가 속한 구획 하나에서만 계산하므로 중복이 없다.
+from django.db import connection
+
+from .models import Jimok, Suitability
+from .setbacks import buffer_source
+from .tables import table_name
+
+# 구획 크기 (m, EPSG:5186) — 워커 작업 단위
+PARTITION_SIZE = 5000
+
+# 제외할 수 있는 용도지역 레이어 (VECTOR_LAYERS id)
+EXCLUDABLE = ("nonglim", "nongupjinheung", "jayeonnogji", "gaebaljingheung", "nongupseisangiban")
+
+PARCEL_TABLE = f'filter."{table_name(Jimok._meta.db_table)}"'
+RESULT_NAME = table_name(Suitability._meta.db_table)
+RESULT_TABLE = f'filter."{RESULT_NAME}"'
+
+DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {RESULT_TABLE} (
+          id bigserial PRIMARY KEY,
+          scenario text NOT NULL,
+          gid integer NOT NULL,
+          pnu text,
+          a20 text,
+          parcel_area double precision NOT NULL,
+          usable_area double precision NOT NULL,
+          usable_ratio double precision,
+          geom geometry(MultiPolygon, 5186)
+        )""",
+    f'CREATE UNIQUE INDEX IF NOT EXISTS "{RESULT_NAME}_scenario_gid_uq" ON {RESULT_TABLE} (scenario, gid)',
+    f'CREATE INDEX IF NOT EXISTS "{RESULT_NAME}_scenario_area_idx" ON {RESULT_TABLE} (scenario, usable_area DESC)',
+    f'CREATE INDEX IF NOT EXISTS "{RESULT_NAME}_pnu_idx" ON {RESULT_TABLE} (pnu)',
+    f'CREATE INDEX IF NOT EXISTS "{RESULT_NAME}_geom_gix" ON {RESULT_TABLE} USING gist (geom)',
+]
+
+
+def scenario_key(road_dist, resi_dist, exclude):
+    """
+    (50, 100, ['nonglim', ...]) -> 'road50_resi100_nonglim-...' (제외 레이어는 정렬)
+    사전계산 시나리오는 정수 m 만 — 50.5 를 50 으로 잘라 다른 결과를 같은 키에 넣지 않게 ValueError.
+    """
+    if road_dist != int(road_dist) or resi_dist != int(resi_dist):
+        raise ValueError(f"scenario distances must be whole metres: {road_dist}, {resi_dist}")
+    layers = "-".join(sorted(set(exclude))) or "none"
+    return f"road{int(road_dist)}_resi{int(resi_dist)}_{layers}"
+
+
+def parse_scenario(key):
+    """scenario_key 의 역 — 잘못된 키면 ValueError"""
+    try:
+        road, resi, layers = key.split("_", 2)
+        if not (road.startswith("road") and resi.startswith("resi")):
+            raise ValueError
+        exclude = [] if layers == "none" else layers.split("-")
+        road_dist, resi_dist = int(road[4:]), int(resi[4:])
+    except ValueError:
+        raise ValueError(f"invalid scenario: {key}")
+    unknown = [lid for lid in exclude if lid not in EXCLUDABLE]
+    if unknown:
+        raise ValueError(f"unknown layers: {', '.join(unknown)}")
+    return road_dist, resi_dist, exclude
+
+
+def _exclusion_tables(exclude):
+    from .vector_layers import VECTOR_LAYERS
+    return [f'filter."{table_name(VECTOR_LAYERS[lid].model._meta.db_table)}"' for lid in exclude]
+
+
+def partition_sql(scenario, road_dist, resi_dist, exclude, cell):
+    """구획 cell=(xmin, ymin, xmax, ymax) 의 필지를 계산해 scenario 로 INSERT 하는 (sql, params)"""
+    xmin, ymin, xmax, ymax = cell
+    masks, mask_params = [], []
+    for kind, dist in (("road", road_dist), ("resi", resi_dist)):
+        if dist > 0:
+            sql, params = buffer_source(kind, dist, "p.geom")
+            masks.append(f"SELECT b.geom FROM ({sql}) AS b")
+            mask_params.extend(params)
+    for table in _exclusion_tables(exclude):
+        masks.append(f"SELECT z.geom FROM {table} AS z WHERE ST_Intersects(z.geom, p.geom)")
+    mask_sql = " UNION ALL ".join(masks) or "SELECT NULL::geometry AS geom WHERE false"
+
+    sql = f"""
+        WITH env AS (SELECT ST_MakeEnvelope(%s, %s, %s, %s, 5186) AS g),
+        parcels AS (
+          SELECT p.gid, p.pnu, p.a20, p.geom, ST_PointOnSurface(p.geom) AS pt
+          FROM {PARCEL_TABLE} AS p, env
+          WHERE p.geom && env.g AND NOT ST_IsEmpty(p.geom)
+        )
+        INSERT INTO {RESULT_TABLE} (scenario, gid, pnu, a20, parcel_area, usable_area, usable_ratio, geom)
+        SELECT %s, p.gid, p.pnu, p.a20, ST_Area(p.geom), ST_Area(u.geom),
+               ST_Area(u.geom) / NULLIF(ST_Area(p.geom), 0), u.geom
+        FROM parcels AS p
+        CROSS JOIN LATERAL (
+          SELECT ST_Multi(ST_CollectionExtract(
+                   CASE WHEN m.g IS NULL THEN p.geom ELSE ST_Difference(p.geom, m.g) END, 3
+                 ))::geometry(MultiPolygon, 5186) AS geom
+          FROM (SELECT ST_Union(x.geom) AS g FROM ({mask_sql}) AS x) AS m
+        ) AS u
+        WHERE ST_X(p.pt) >= %s AND ST_X(p.pt) < %s AND ST_Y(p.pt) >= %s AND ST_Y(p.pt) < %s
+    """
+    return sql, [xmin, ymin, xmax, ymax, scenario, *mask_params, xmin, xmax, ymin, ymax]
+
+
+def partitions(size=PARTITION_SIZE):
+    """필지 테이블 범위를 덮는 size 격자 구획 목록"""
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e) "
+                    f"FROM (SELECT ST_Extent(geom)::geometry AS e FROM {PARCEL_TABLE}) AS t")
+        row = cur.fetchone()
+    if row is None or row[0] is None:
+        return []
+    xmin, ymin, xmax, ymax = row
+    x0, y0 = int(xmin // size) * size, int(ymin // size) * size
+    return [
+        (x, y, x + size, y + size)
+        for x in range(x0, int(xmax) + 1, size)
+        for y in range(y0, int(ymax) + 1, size)
+    ]
+
+
+def compute_partition(task):
+    """워커: task = (scenario, road_dist, resi_dist, exclude, cell) -> INSERT 된 필지 수"""
+    scenario, road_dist, resi_dist, exclude, cell = task
+    sql, params = partition_sql(scenario, road_dist, resi_dist, exclude, cell)
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        return cur.rowcount
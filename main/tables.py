@@ -0,0 +1,83 @@
+# main/tables.py
+# filter 스키마 테이블 존재 여부 (프로세스 캐시)
+#  - 사전계산 테이블(LOD, 이격 버퍼 등)이 아직 없으면 원본으로 대체하기 위해 쓴다.
+import hashlib
+import time
+
+from django.db import connection
+
+SCHEMA = "filter"
+TTL = 60
+
+# PostgreSQL 식별자 최대 길이 (바이트) — 넘으면 조용히 잘려 인덱스 이름이 겹칠 수 있다
+MAX_IDENTIFIER = 63
+
+_cache = {"at": 0.0, "tables": frozenset()}
+
+
+def existing_tables():
+    now = time.monotonic()
+    if now - _cache["at"] > TTL:
+        try:
+            with connection.cursor() as cur:
+                cur.execute(
+                    "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE n.nspname = %s AND c.relkind IN ('r', 'm', 'v', 'p')",
+                    [SCHEMA],
+                )
+                _cache["tables"] = frozenset(r[0] for r in cur.fetchall())
+        except Exception:
+            _cache["tables"] = frozenset()
+        _cache["at"] = now
+    return _cache["tables"]
+
+
+def invalidate():
+    _cache["at"] = 0.0
+
+
+def table_name(db_table):
+    """'"filter"."owner_s30"' -> 'owner_s30'"""
+    return db_table.split(".", 1)[-1].strip('"')
+
+
+def index_name(table, suffix):
+    """
+    '{table}_{suffix}' — 63바이트를 넘으면 테이블명 앞부분 + 해시 8자리로 줄인다.
+    같은 테이블명이면 항상 같은 이름이라 테이블 교체 후 RENAME 도 그대로 맞는다.
+    """
+    name = f"{table}_{suffix}"
+    if len(name.encode()) <= MAX_IDENTIFIER:
+        return name
+    digest = hashlib.sha1(table.encode()).hexdigest()[:8]
+    head = table
+    while len(f"{head}_{digest}_{suffix}".encode()) > MAX_IDENTIFIER:
+        head = head[:-1]
+    return f"{head}_{digest}_{suffix}"
+
+
+def table_exists(name):
+    return name in existing_tables()
+
+
+def model_table_exists(model):
+    return table_exists(table_name(model._meta.db_table))
+
+
+def table_fingerprint(name):
+    """
+    테이블 재적재/변경 감지용 문자열 (없는 테이블이면 None)
+    oid/relfilenode 는 DROP+CREATE·TRUNCATE·CLUSTER 때, pg_stat 행 변경 수는 INSERT/UPDATE/DELETE 때 바뀐다.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT c.oid, c.relfilenode, "
+            "COALESCE(s.n_tup_ins, 0) + COALESCE(s.n_tup_upd, 0) + COALESCE(s.n_tup_del, 0) "
+            "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid "
+            "WHERE n.nspname = %s AND c.relname = %s",
+            [SCHEMA, name],
+        )
+        row = cur.fetchone()
+    return None if row is None else ":".join(str(v) for v in row)
+
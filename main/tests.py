@@ -1,3 +1,916 @@
-from django.test import TestCase
+# main/tests.py
+# DB 없이 도는 단위 테스트 (SimpleTestCase) — SQL 은 문자열/자리표시자만 확인한다.
+#   python manage.py test main
+import asyncio
+import contextvars
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from main import (
+    async_views, coverage, datasets, db_pool, identify, lean, metrics, setbacks, suitability, tables, tile_http, views,
+    vworld, wmts_cache,
+)
+from main.management.commands.build_filter_indexes import filter_index_ddl
+from main.models import Suitability
+from main.vector_layers import (
+    LAYERS, LOD_LEVELS, LOD_MODELS, LOD_SUBDIVIDED, SUBDIV_MODELS, SUBDIV_SOURCES, VECTOR_LAYERS, canonical_values,
+)
+from main.views import CompositeTileJSON, LayerTileJSON, _FeatureStream, setback_geojson_args, tile_cache_key
+
+
+def placeholders(sql):
+    return sql.count("%s")
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+# =============================================================================
+# 이격 (main/setbacks.py) — 거리 파싱, 사전계산 테이블 선택, dissolve 타일 SQL
+# =============================================================================
+class SetbackTests(SimpleTestCase):
+    def test_parse_dist_range(self):
+        self.assertEqual(setbacks.parse_dist("50"), 50.0)
+        self.assertEqual(setbacks.parse_dist("12.5"), 12.5)
+        for raw in ("0", "1001", "-5", "abc", ""):
+            with self.assertRaises(ValueError):
+                setbacks.parse_dist(raw)
+
+    def test_precomputed_table_only_for_standard_integer_distances(self):
+        with mock.patch.object(setbacks, "table_exists", return_value=True):
+            self.assertEqual(setbacks.precomputed_table("road", 50), 'filter."road_setback_50"')
+            self.assertEqual(setbacks.precomputed_table("resi", 100.0, dissolved=True),
+                             'filter."resi_setback_100_dissolved"')
+            self.assertIsNone(setbacks.precomputed_table("road", 50.5))
+            self.assertIsNone(setbacks.precomputed_table("road", 75))
+
+    def test_precomputed_table_missing(self):
+        with mock.patch.object(setbacks, "table_exists", return_value=False):
+            self.assertIsNone(setbacks.precomputed_table("road", 50))
+
+    def test_simplify_tolerance_halves_per_zoom(self):
+        self.assertAlmostEqual(setbacks.simplify_tolerance(10), 2 * setbacks.simplify_tolerance(11))
+        self.assertLess(setbacks.simplify_tolerance(16), 1.0)
+
+    def test_zoom_for_bbox(self):
+        # 충남 전체(약 1.8°)는 저줌, 필지 몇 개(0.005°)는 고줌, 범위는 0~22
+        self.assertLess(setbacks.zoom_for_bbox(125.9, 127.7), 10)
+        self.assertGreaterEqual(setbacks.zoom_for_bbox(127.0, 127.005), 15)
+        self.assertEqual(setbacks.zoom_for_bbox(127.0, 127.0), 22)
+        self.assertEqual(setbacks.zoom_for_bbox(-180, 180, width_px=1), 0)
+
+    def test_dissolve_tile_sql_prefers_dissolved_table(self):
+        bounds = (14137000.0, 4363000.0, 14138000.0, 4364000.0)
+        with mock.patch.object(setbacks, "table_exists", return_value=True):
+            sql, params = setbacks.setback_tile_sql("road", 50, bounds, "road_setback", dissolve=True, z=14)
+        self.assertIn('filter."road_setback_50_dissolved"', sql)
+        self.assertIn("ST_SimplifyPreserveTopology", sql)
+        self.assertNotIn("b.gid", sql)
+        self.assertIn("d.geom && ST_Expand(e.g, %s)", sql)
+        self.assertEqual(params[-2:], [1000 * 256 / 4096] * 2)  # union 자르기 / 후보 선택 모두 margin
+        self.assertEqual(placeholders(sql), len(params))
+
+    def test_dissolve_tile_sql_falls_back_to_live_buffer(self):
+        bounds = (14137000.0, 4363000.0, 14138000.0, 4364000.0)
+        with mock.patch.object(setbacks, "table_exists", return_value=False), \
+                mock.patch.object(setbacks, "source_table", return_value='filter."road"'):
+            sql, params = setbacks.setback_tile_sql("road", 75, bounds, "road_setback", dissolve=True, z=14)
+        self.assertIn("ST_Buffer", sql)
+        self.assertIn("ST_Union", sql)
+        self.assertEqual(placeholders(sql), len(params))
+
+    def test_geojson_args_share_dist_range(self):
+        factory = RequestFactory()
+        self.assertEqual(setback_geojson_args(factory.get("/", {"dist": "30"}))[0], 30.0)
+        for raw in ("nan", "inf", "1e9", "0", "-1"):
+            with self.assertRaisesMessage(ValueError, "invalid dist"):
+                setback_geojson_args(factory.get("/", {"dist": raw}))
+
+    def test_feature_stream_body_and_single_close(self):
+        close, done = mock.Mock(), mock.Mock()
+        cur = mock.Mock(fetchmany=mock.Mock(side_effect=[[("{\"b\":2}",)], []]))
+        stream = _FeatureStream(cur, close, [("{\"a\":1}",)], done)
+        body = "".join(stream)
+        self.assertEqual(json.loads(body)["features"], [{"a": 1}, {"b": 2}])
+        stream.close()
+        close.assert_called_once_with()
+        done.assert_called_once_with(len(body), 2)
+
+    def test_feature_stream_released_by_response_close_without_iteration(self):
+        close, done = mock.Mock(), mock.Mock()
+        response = StreamingHttpResponse(_FeatureStream(mock.Mock(), close, [], done))
+        response.close()
+        close.assert_called_once_with()
+        done.assert_called_once_with(len('{"type":"FeatureCollection","features":[]}'), 0)
+
+
+# =============================================================================
+# VWorld 주소검색 (main/vworld.py) — 로컬 스텁으로 캐시 / single-flight / 통계
+# =============================================================================
+def geocode_body(status="OK"):
+    return {"response": {"status": status, "result": {"point": {"x": "127.15", "y": "36.81"}}}}
+
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """VWorld 스텁 — 호출 수를 세고, gate 가 있으면 열릴 때까지 응답을 붙잡는다"""
+
+    def __init__(self, status="OK", gate=None):
+        super().__init__()
+        self.status = status
+        self.gate = gate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(geocode_body(self.status)).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url, response.request = request.url, request
+        return response
+
+    def close(self):
+        pass
+
+
+def stub_geocoder(adapter=None, ttl=60, client=None):
+    session = None
+    if adapter is not None:
+        session = requests.Session()
+        session.mount("http://", adapter)
+    return vworld.Geocoder(vworld.GeocodeCache(None, ttl), "http://vworld.stub/req/address",
+                           session=session, client=client)
+
+
+class GeocoderTests(SimpleTestCase):
+    def test_cache_hit_skips_upstream(self):
+        adapter = StubAdapter()
+        geocoder = stub_geocoder(adapter)
+        first = geocoder.geocode("천안시  동남구 ", "ROAD", "k")
+        # 공백/대소문자만 다른 질의는 같은 캐시 키
+        second = geocoder.geocode("천안시 동남구", "ROAD", "k")
+        self.assertEqual(first, second)
+        self.assertEqual(adapter.calls, 1)
+        stats = geocoder.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["coalesced"]), (1, 1, 0))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_error_response_is_not_cached(self):
+        adapter = StubAdapter(status="ERROR")
+        geocoder = stub_geocoder(adapter)
+        geocoder.geocode("천안시", "ROAD", "k")
+        geocoder.geocode("천안시", "ROAD", "k")
+        self.assertEqual(adapter.calls, 2)
+        self.assertEqual(geocoder.get_stats()["misses"], 2)
+
+    def test_ttl_expiry(self):
+        adapter = StubAdapter()
+        geocoder = stub_geocoder(adapter, ttl=10)
+        with mock.patch("main.vworld.time.time", return_value=1000.0):
+            geocoder.geocode("아산시", "ROAD", "k")
+        with mock.patch("main.vworld.time.time", return_value=1009.0):
+            geocoder.geocode("아산시", "ROAD", "k")
+        self.assertEqual(adapter.calls, 1)
+        with mock.patch("main.vworld.time.time", return_value=1011.0):
+            geocoder.geocode("아산시", "ROAD", "k")
+        self.assertEqual(adapter.calls, 2)
+        stats = geocoder.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_concurrent_lookups_collapse_to_one_call(self):
+        gate = threading.Event()
+        adapter = StubAdapter(gate=gate)
+        geocoder = stub_geocoder(adapter)
+        results = []
+
+        def lookup():
+            results.append(geocoder.geocode("공주시 신관동", "ROAD", "k"))
+
+        leader = threading.Thread(target=lookup)
+        leader.start()
+        wait_until(lambda: adapter.calls == 1)
+        followers = [threading.Thread(target=lookup) for _ in range(4)]
+        for t in followers:
+            t.start()
+        wait_until(lambda: geocoder.get_stats()["coalesced"] == 4)
+        gate.set()
+        for t in [leader, *followers]:
+            t.join(5)
+
+        self.assertEqual(adapter.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r == results[0] for r in results))
+        stats = geocoder.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["coalesced"]), (0, 1, 4))
+
+    async def test_async_lookups_collapse_to_one_call(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.params["address"])
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=geocode_body())
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            geocoder = stub_geocoder(client=client)
+            results = await asyncio.gather(*(geocoder.ageocode("논산시", "ROAD", "k") for _ in range(5)))
+            again = await geocoder.ageocode("논산시", "ROAD", "k")
+
+        self.assertEqual(calls, ["논산시"])
+        self.assertTrue(all(r == again for r in results))
+        stats = geocoder.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["coalesced"]), (1, 1, 4))
+
+
+# =============================================================================
+# WMTS 디스크 캐시 (main/wmts_cache.py)
+# =============================================================================
+class WMTSCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = wmts_cache.WMTSCache(self.root, max_bytes=1 << 20, fresh_seconds=60)
+
+    def test_open_tile_refetches_when_file_evicted(self):
+        path = self.cache.tile_path("Base", 7, 50, 109, "png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        results = [(path + ".evicted", "image/png", 200, wmts_cache.HIT),
+                   (path, "image/png", 200, wmts_cache.MISS)]
+        with open(path, "wb") as f:
+            f.write(b"png")
+        with mock.patch.object(self.cache, "fetch", side_effect=results) as fetch:
+            f, ctype, status, state = self.cache.open_tile("Base", 7, 50, 109, "png", "k")
+        with f:
+            self.assertEqual(f.read(), b"png")
+        self.assertEqual((fetch.call_count, state), (2, wmts_cache.MISS))
+
+    def test_open_tile_passes_upstream_errors_through(self):
+        with mock.patch.object(self.cache, "fetch", return_value=(None, "text/plain", 404, wmts_cache.MISS)):
+            f, ctype, status, state = self.cache.open_tile("Base", 7, 50, 109, "png", "k")
+        self.assertIsNone(f)
+        self.assertEqual(status, 404)
+
+    def test_eviction_runs_off_the_request_path(self):
+        cache = wmts_cache.WMTSCache(self.root, max_bytes=100, fresh_seconds=60)
+        for i, x in enumerate((1, 2, 3)):
+            path = cache.tile_path("Base", 7, 50, x, "png")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"x" * 40)
+            os.utime(path, (1000 + i, 1000 + i))
+        with mock.patch.object(cache, "_scan", wraps=cache._scan) as scan:
+            cache._account(0)  # 첫 사용: 스캔은 백그라운드로
+            wait_until(lambda: cache._scanned and not cache._evicting)
+            cache._account(10)  # 상한 이하 — 스캔 없음
+        self.assertEqual(scan.call_count, 2)  # 최초 스캔 + LRU 삭제 한 번
+        self.assertFalse(os.path.exists(cache.tile_path("Base", 7, 50, 1, "png")))
+        self.assertTrue(os.path.exists(cache.tile_path("Base", 7, 50, 3, "png")))
+        self.assertEqual(cache._size, 90)
+
+    async def test_aread_tile_stores_and_then_hits(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, content=b"png", headers={"Content-Type": "image/png", "ETag": '"a"'})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with mock.patch.object(wmts_cache, "get_async_client", return_value=client):
+                first = await self.cache.aread_tile("Base", 7, 50, 109, "png", "k")
+                second = await self.cache.aread_tile("Base", 7, 50, 109, "png", "k")
+        self.assertEqual(first, (b"png", "image/png", 200, wmts_cache.MISS))
+        self.assertEqual(second, (b"png", "image/png", 200, wmts_cache.HIT))
+        self.assertEqual(len(calls), 1)
+
+
+# =============================================================================
+# 커넥션 풀 (main/db_pool.py) — 설정 해석, 통계, 풀 꺼짐 폴백
+# =============================================================================
+class FakePool:
+    max_size = 10
+
+    def __init__(self, **stats):
+        self.stats = stats
+
+    def get_stats(self):
+        return dict(self.stats)
+
+
+class FakeConnection:
+    """psycopg 커넥션 흉내 — autocommit/커서/rollback 순서만 기록"""
+
+    def __init__(self, fail=False):
+        self.autocommit = True
+        self.fail = fail
+        self.log = []
+        self.cursor_kwargs = None
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs = kwargs
+        conn = self
+
+        class Cursor:
+            def execute(self, sql, params):
+                conn.log.append("execute")
+                if conn.fail:
+                    raise RuntimeError("boom")
+
+            def close(self):
+                conn.log.append("cursor.close")
+
+        return Cursor()
+
+    def rollback(self):
+        self.log.append("rollback")
+
+
+class AsyncFakeConnection:
+    """psycopg AsyncConnection 흉내 — FakeConnection 과 같은 기록"""
+
+    def __init__(self, fail=False, rows=()):
+        self.autocommit = True
+        self.fail = fail
+        self.rows = list(rows)
+        self.log = []
+        self.cursor_kwargs = None
+
+    async def set_autocommit(self, value):
+        self.autocommit = value
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs = kwargs
+        conn = self
+
+        class Cursor:
+            async def execute(self, sql, params):
+                conn.log.append("execute")
+                if conn.fail:
+                    raise RuntimeError("boom")
+
+            async def fetchmany(self, size):
+                rows, conn.rows = conn.rows[:size], conn.rows[size:]
+                return rows
+
+            async def close(self):
+                conn.log.append("cursor.close")
+
+        return Cursor()
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+class AsyncFakePool:
+    def __init__(self, conn=None, error=None):
+        self.conn, self.error = conn, error
+        self.returned = []
+
+    async def getconn(self):
+        if self.error:
+            raise self.error
+        return self.conn
+
+    async def putconn(self, conn):
+        self.returned.append(conn)
+
+
+class DBPoolTests(SimpleTestCase):
+    def test_conninfo_skips_empty_fields(self):
+        db = {"NAME": "solar", "USER": "gis", "PASSWORD": "", "HOST": "db"}
+        with mock.patch.dict(db_pool.settings.DATABASES, {"solar": db}):
+            info = db_pool.conninfo("solar")
+        self.assertIn("dbname=solar", info)
+        self.assertIn("host=db", info)
+        self.assertNotIn("password", info)
+        self.assertNotIn("port", info)
+
+    def test_pool_kwargs_defaults_and_overrides(self):
+        kwargs = db_pool._pool_kwargs()
+        self.assertEqual((kwargs["min_size"], kwargs["max_size"]), (2, 20))
+        self.assertEqual(kwargs["kwargs"], {"autocommit": True})
+        with self.settings(DB_POOL_MAX_SIZE=5, DB_POOL_TIMEOUT=3):
+            kwargs = db_pool._pool_kwargs()
+        self.assertEqual((kwargs["max_size"], kwargs["timeout"]), (5, 3))
+
+    def test_stats_saturation_and_wait(self):
+        stats = db_pool._stats_of(FakePool(pool_size=8, pool_available=3, requests_queued=4,
+                                           requests_wait_ms=100))
+        self.assertEqual(stats["in_use"], 5)
+        self.assertEqual(stats["saturation"], 0.5)
+        self.assertEqual(stats["avg_wait_ms"], 25.0)
+        self.assertEqual(db_pool._stats_of(FakePool())["avg_wait_ms"], 0.0)
+
+    def test_pool_stats_before_first_use(self):
+        with mock.patch.object(db_pool, "_pool", None), mock.patch.object(db_pool, "_async_pool", None):
+            self.assertEqual(db_pool.pool_stats(), {"sync": None, "async": None})
+
+    @override_settings(TILE_DB_POOL=True)
+    def test_server_cursor_runs_inside_a_transaction(self):
+        conn = FakeConnection()
+        pool = mock.Mock(getconn=mock.Mock(return_value=conn))
+        with mock.patch.object(db_pool, "get_pool", return_value=pool):
+            cur, close = db_pool.open_server_cursor("SELECT 1", [], name="stream")
+            # WITH HOLD 이 아닌 이름 있는 커서 — autocommit 을 끈 트랜잭션 안
+            self.assertEqual(conn.cursor_kwargs, {"name": "stream"})
+            self.assertFalse(conn.autocommit)
+            close()
+            close()
+        self.assertEqual(conn.log, ["execute", "cursor.close", "rollback"])
+        self.assertTrue(conn.autocommit)
+        pool.putconn.assert_called_once_with(conn)
+
+    @override_settings(TILE_DB_POOL=True)
+    def test_server_cursor_released_when_query_fails(self):
+        conn = FakeConnection(fail=True)
+        pool = mock.Mock(getconn=mock.Mock(return_value=conn))
+        with mock.patch.object(db_pool, "get_pool", return_value=pool):
+            with self.assertRaises(RuntimeError):
+                db_pool.open_server_cursor("SELECT 1", [])
+        self.assertTrue(conn.autocommit)
+        pool.putconn.assert_called_once_with(conn)
+
+    async def test_async_server_cursor_runs_inside_a_transaction(self):
+        conn = AsyncFakeConnection()
+        pool = AsyncFakePool(conn)
+        with mock.patch.object(db_pool, "get_async_pool", mock.AsyncMock(return_value=pool)):
+            cur, close = await db_pool.aopen_server_cursor("SELECT 1", [], name="stream")
+            self.assertEqual(conn.cursor_kwargs, {"name": "stream"})
+            self.assertFalse(conn.autocommit)
+            await close()
+            await close()
+        self.assertEqual(conn.log, ["execute", "cursor.close", "rollback"])
+        self.assertTrue(conn.autocommit)
+        self.assertEqual(pool.returned, [conn])
+
+    async def test_async_server_cursor_released_when_query_fails(self):
+        conn = AsyncFakeConnection(fail=True)
+        pool = AsyncFakePool(conn)
+        with mock.patch.object(db_pool, "get_async_pool", mock.AsyncMock(return_value=pool)):
+            with self.assertRaises(RuntimeError):
+                await db_pool.aopen_server_cursor("SELECT 1", [])
+        self.assertTrue(conn.autocommit)
+        self.assertEqual(pool.returned, [conn])
+
+    @override_settings(TILE_DB_POOL=False)
+    def test_fetch_one_uses_django_connection_when_pool_disabled(self):
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value.fetchone.return_value = (b"tile",)
+        with mock.patch.object(db_pool, "connection") as conn, \
+                mock.patch.object(db_pool, "get_pool") as get_pool:
+            conn.cursor.return_value = cursor
+            self.assertEqual(db_pool.fetch_one("SELECT %s", [1]), b"tile")
+        cursor.__enter__.return_value.execute.assert_called_once_with("SELECT %s", [1])
+        get_pool.assert_not_called()
+
+
+# =============================================================================
+# 비동기 이격 GeoJSON (main/async_views.py) — 세마포어/커넥션 반납
+# =============================================================================
+@override_settings(ASYNC_LAYER_CONCURRENCY=1)
+class AsyncSetbackGeoJSONTests(SimpleTestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.dict(async_views._semaphores, clear=True),
+            mock.patch.object(async_views, "setback_features_sql", return_value=("SELECT 1", [])),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.request = RequestFactory().get("/", {"dist": "50", "bbox": "127,36,127.01,36.01"})
+
+    async def call(self, pool):
+        with mock.patch.object(db_pool, "get_async_pool", mock.AsyncMock(return_value=pool)):
+            return await async_views.setback_geojson(self.request, "road")
+
+    def semaphore_free(self):
+        return not async_views._limit("road_setback_geojson").locked()
+
+    async def test_getconn_failure_releases_semaphore(self):
+        response = await self.call(AsyncFakePool(error=RuntimeError("pool timeout")))
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(self.semaphore_free())
+
+    async def test_response_close_without_iteration_releases(self):
+        conn = AsyncFakeConnection(rows=[('{"a":1}',)])
+        pool = AsyncFakePool(conn)
+        response = await self.call(pool)
+        self.assertFalse(self.semaphore_free())
+        # ASGI 핸들러처럼 스레드에서 response.close()
+        await sync_to_async(response.close)()
+        self.assertEqual(pool.returned, [conn])
+        self.assertTrue(conn.autocommit)
+        self.assertTrue(self.semaphore_free())
+
+    async def test_streams_and_releases_once(self):
+        conn = AsyncFakeConnection(rows=[('{"a":1}',), ('{"b":2}',)])
+        pool = AsyncFakePool(conn)
+        response = await self.call(pool)
+        body = b"".join([chunk async for chunk in response])
+        self.assertEqual(json.loads(body)["features"], [{"a": 1}, {"b": 2}])
+        await sync_to_async(response.close)()
+        self.assertEqual(pool.returned, [conn])
+        self.assertEqual(conn.log, ["execute", "cursor.close", "rollback"])
+        self.assertTrue(self.semaphore_free())
+
+
+# =============================================================================
+# owner 필터 정규화 (main/vector_layers.py) / 인덱스 이름 (main/tables.py)
+# =============================================================================
+class OwnerFilterTests(SimpleTestCase):
+    def owner(self, query):
+        layer = VECTOR_LAYERS["owner"]()
+        layer.request = RequestFactory().get("/tiles/owner/14/13980/6330.pbf", query)
+        return layer
+
+    def test_canonical_values_order_and_duplicates(self):
+        request = RequestFactory().get("/", {"jm": ["답, 전", "전", ""]})
+        self.assertEqual(canonical_values(request, "jm"), ["답", "전"])
+        self.assertEqual(canonical_values(request, "own"), [])
+
+    def test_cache_key_ignores_checkbox_order(self):
+        a = tile_cache_key([self.owner({"jm": "전,답", "own": "국유지"})], 14, 13980, 6330)
+        b = tile_cache_key([self.owner({"own": "국유지", "jm": ["답", "전"]})], 14, 13980, 6330)
+        c = tile_cache_key([self.owner({"jm": "전"})], 14, 13980, 6330)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_filtered_owner_tiles_are_not_archived(self):
+        self.assertTrue(self.owner({}).is_archivable())
+        self.assertFalse(self.owner({"jm": "전"}).is_archivable())
+
+
+class IndexNameTests(SimpleTestCase):
+    def test_short_names_unchanged(self):
+        self.assertEqual(tables.index_name("owner_s30", "a20_geom_gix"), "owner_s30_a20_geom_gix")
+
+    def test_long_names_are_shortened_and_distinct(self):
+        long_a = "owner_release_2026_10_chungcheongnam_do_full_parcel_layer_a"
+        long_b = long_a[:-1] + "b"
+        a = tables.index_name(long_a, "a20_geom_gix")
+        b = tables.index_name(long_b, "a20_geom_gix")
+        self.assertLessEqual(len(a.encode()), tables.MAX_IDENTIFIER)
+        self.assertTrue(a.endswith("_a20_geom_gix"))
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, tables.index_name(long_a, "a20_geom_gix"))
+
+    def test_multibyte_names_fit_in_bytes(self):
+        name = tables.index_name("소유구분_" * 8, "geom_gix")
+        self.assertLessEqual(len(name.encode()), tables.MAX_IDENTIFIER)
+
+    def test_filter_index_ddl_uses_guarded_names(self):
+        table = "x" * 60
+        (name, sql), = filter_index_ddl(table, ["a20"], schema="staging")
+        self.assertLessEqual(len(name), tables.MAX_IDENTIFIER)
+        self.assertIn(f'"{name}" ON staging."{table}"', sql)
+
+
+# =============================================================================
+# 타일 커버리지 (main/coverage.py)
+# =============================================================================
+class CoverageIndexTests(SimpleTestCase):
+    def test_without_buffer(self):
+        index = coverage.CoverageIndex([(100, 200)], "fp", buffer=0)
+        self.assertTrue(index.may_contain(14, 100, 200))
+        self.assertFalse(index.may_contain(14, 101, 200))
+        self.assertTrue(index.may_contain(13, 50, 100))
+        self.assertFalse(index.may_contain(13, 49, 100))
+        self.assertTrue(index.may_contain(0, 0, 0))
+        self.assertTrue(index.may_contain(15, 201, 401))
+        self.assertFalse(index.may_contain(15, 202, 400))
+
+    def test_buffer_reaches_neighbours(self):
+        index = coverage.CoverageIndex([(100, 200)], "fp", buffer=1 / 16)
+        self.assertTrue(index.may_contain(14, 101, 200))
+        self.assertFalse(index.may_contain(14, 102, 200))
+        # z13 49 의 버퍼가 z14 100 에 걸친다
+        self.assertTrue(index.may_contain(13, 49, 100))
+        self.assertTrue(index.may_contain(15, 202, 400))
+        self.assertFalse(index.may_contain(15, 203, 400))
+
+    def test_json_round_trip(self):
+        index = coverage.CoverageIndex([(3, 4), (1, 2)], "fp", zoom=10, buffer=0.125)
+        data = json.loads(json.dumps(index.to_json()))
+        self.assertEqual(data["tiles"], [[1, 2], [3, 4]])
+        loaded = coverage.CoverageIndex.from_json(data)
+        self.assertEqual((loaded.base, loaded.zoom, loaded.buffer, loaded.fingerprint),
+                         (index.base, 10, 0.125, "fp"))
+        self.assertEqual(loaded.pyramid, index.pyramid)
+
+    def test_touched_tiles_query(self):
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value.fetchall.return_value = [(1, 2)]
+        with mock.patch.object(coverage, "connection") as conn:
+            conn.cursor.return_value = cursor
+            tiles = coverage.touched_tiles('SELECT geom FROM filter."road"', margin=8, zoom=12)
+        sql, params = cursor.__enter__.return_value.execute.call_args[0]
+        self.assertEqual(tiles, [(1, 2)])
+        self.assertIn('WITH src AS (SELECT geom FROM filter."road")', sql)
+        self.assertEqual(params["m"], 10.0)
+        self.assertEqual(params["n"], 4096)
+        self.assertAlmostEqual(params["s"] * 4096, 2 * coverage.HALF_WORLD)
+
+    def test_tile_is_empty(self):
+        with mock.patch.object(coverage, "may_contain", side_effect=lambda lid, z, x, y: lid == "road"):
+            self.assertTrue(coverage.tile_is_empty(["jimok"], 14, 1, 2))
+            self.assertFalse(coverage.tile_is_empty(["jimok", "road"], 14, 1, 2))
+            self.assertFalse(coverage.tile_is_empty([], 14, 1, 2))
+
+
+# =============================================================================
+# 타일 HTTP 캐시 (main/tile_http.py) / TileJSON 타일 템플릿
+# =============================================================================
+class TileHTTPTests(SimpleTestCase):
+    def test_not_modified(self):
+        get = RequestFactory().get
+        etag = '"abc"'
+        self.assertFalse(tile_http.not_modified(get("/"), etag))
+        self.assertTrue(tile_http.not_modified(get("/", HTTP_IF_NONE_MATCH='"abc"'), etag))
+        self.assertTrue(tile_http.not_modified(get("/", HTTP_IF_NONE_MATCH='W/"abc"'), etag))
+        self.assertTrue(tile_http.not_modified(get("/", HTTP_IF_NONE_MATCH='"x", "abc"'), etag))
+        self.assertTrue(tile_http.not_modified(get("/", HTTP_IF_NONE_MATCH="*"), etag))
+        self.assertFalse(tile_http.not_modified(get("/", HTTP_IF_NONE_MATCH='"abd"'), etag))
+
+    def test_cache_control_immutable_only_for_current_version(self):
+        get = RequestFactory().get
+        self.assertEqual(tile_http.cache_control(get("/", {"v": "v1"}), "v1"), tile_http.IMMUTABLE)
+        self.assertNotIn("immutable", tile_http.cache_control(get("/", {"v": "v0"}), "v1"))
+        self.assertNotIn("immutable", tile_http.cache_control(get("/"), "v1"))
+
+    def test_pick_encoding(self):
+        get = RequestFactory().get
+        both = {"br": b"", "gzip": b""}
+        self.assertEqual(tile_http.pick_encoding(get("/", HTTP_ACCEPT_ENCODING="gzip, br"), both), "br")
+        self.assertEqual(tile_http.pick_encoding(get("/", HTTP_ACCEPT_ENCODING="br;q=0, gzip"), both), "gzip")
+        self.assertEqual(tile_http.pick_encoding(get("/", HTTP_ACCEPT_ENCODING="*"), {"gzip": b""}), "gzip")
+        self.assertIsNone(tile_http.pick_encoding(get("/", HTTP_ACCEPT_ENCODING="identity"), both))
+        self.assertIsNone(tile_http.pick_encoding(get("/", HTTP_ACCEPT_ENCODING="br"), {}))
+
+    def test_tile_response_per_encoding_etag(self):
+        get = RequestFactory().get
+        entry = tile_http.cache_entry(b"tile" * 100)
+        gz = tile_http.tile_response(get("/", HTTP_ACCEPT_ENCODING="gzip"), entry, "v1", "application/x-protobuf")
+        raw = tile_http.tile_response(get("/"), entry, "v1", "application/x-protobuf")
+        self.assertEqual(gz["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(gz.content), b"tile" * 100)
+        self.assertNotEqual(gz["ETag"], raw["ETag"])
+        self.assertIn("Accept-Encoding", gz["Vary"])
+        again = tile_http.tile_response(get("/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=gz["ETag"]),
+                                        entry, "v1", "application/x-protobuf")
+        self.assertEqual(again.status_code, 304)
+
+    def test_empty_tile_is_204_uncompressed(self):
+        response = tile_http.tile_response(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip"),
+                                           tile_http.cache_entry(b""), "v1", "application/x-protobuf")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def tile_url(self, view, query):
+        view.request = RequestFactory().get("/tiles.json", query)
+        with mock.patch.object(tile_http, "dataset_version", return_value="v1"):
+            return view.get_tile_url()
+
+    def test_layer_tilejson_url_carries_version_and_filters(self):
+        url = self.tile_url(LayerTileJSON(layer_id="owner"), {"jm": "전", "lean": "1"})
+        self.assertTrue(url.startswith("/tiles/owner/{z}/{x}/{y}.pbf?"))
+        self.assertEqual(RequestFactory().get(url).GET.dict(), {"jm": "전", "lean": "1", "v": "v1"})
+
+    def test_composite_tilejson_url_uses_canonical_layers(self):
+        url = self.tile_url(CompositeTileJSON(), {"layers": "road,jimok,road,bogus"})
+        self.assertEqual(url, "/tiles/composite/{z}/{x}/{y}.pbf?layers=jimok,road&v=v1")
+
+    def test_composite_tilejson_rejects_unknown_layers(self):
+        response = CompositeTileJSON.as_view()(RequestFactory().get("/tiles/composite.json", {"layers": "bogus"}))
+        self.assertEqual(response.status_code, 400)
+
+
+# =============================================================================
+# 입지 적합성 시나리오 (main/suitability.py)
+# =============================================================================
+class ScenarioTests(SimpleTestCase):
+    def test_key_round_trip(self):
+        key = suitability.scenario_key(50.0, 100, ["nonglim", "jayeonnogji", "nonglim"])
+        self.assertEqual(key, "road50_resi100_jayeonnogji-nonglim")
+        self.assertEqual(suitability.parse_scenario(key), (50, 100, ["jayeonnogji", "nonglim"]))
+        self.assertEqual(suitability.parse_scenario(suitability.scenario_key(0, 0, [])), (0, 0, []))
+
+    def test_key_rejects_fractional_distances(self):
+        with self.assertRaises(ValueError):
+            suitability.scenario_key(50.5, 100, [])
+        with self.assertRaises(ValueError):
+            suitability.scenario_key(50, 99.9, [])
+
+    def test_parse_rejects_malformed_keys(self):
+        for key in ("road50", "resi50_road100_none", "road5x_resi100_none", "road50_resi100_bogus"):
+            with self.assertRaises(ValueError):
+                suitability.parse_scenario(key)
+
+
+# =============================================================================
+# 필지 식별 (main/identify.py)
+# =============================================================================
+def fake_qualified(name):
+    return f'filter."{name}"'
+
+
+class IdentifyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        patches = [
+            mock.patch.object(datasets, "qualified", side_effect=fake_qualified),
+            mock.patch.object(identify, "table_exists", return_value=False),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_sql_placeholders_match_params(self):
+        sql, params = identify.identify_sql(pnu="4413110100100010000")
+        self.assertEqual(placeholders(sql), len(params))
+        self.assertEqual(params[0], "4413110100100010000")
+        sql, params = identify.identify_sql(lon=127.15, lat=36.81)
+        self.assertEqual(placeholders(sql), len(params))
+        self.assertEqual(params[:2], [127.15, 36.81])
+        self.assertIn("'suitability', NULL::json", sql)
+
+    def test_sql_includes_suitability_when_built(self):
+        with mock.patch.object(identify, "table_exists", return_value=True):
+            sql, params = identify.identify_sql(pnu="1")
+        self.assertIn(identify.RESULT_TABLE, sql)
+        self.assertEqual(placeholders(sql), len(params))
+
+    def test_setbacks_from_distances(self):
+        result = identify._with_setbacks({"setback_distance": {"road": 80.0, "resi": None}})
+        self.assertEqual(result["setbacks"], {"road": [100, 200, 300], "resi": []})
+
+    def test_point_lookup_fills_pnu_cache(self):
+        result = {"parcel": {"pnu": "4413110100100010000"}}
+        with mock.patch.object(identify, "_cache_key", side_effect=lambda pnu: f"identify:{pnu}"), \
+                mock.patch.object(identify, "_run", return_value=result) as run:
+            self.assertEqual(identify.identify_point(127.15, 36.81), result)
+            self.assertEqual(identify.identify_pnu("4413110100100010000"), result)
+        self.assertEqual(run.call_count, 1)
+
+    def test_missing_parcel_is_not_cached(self):
+        with mock.patch.object(identify, "_cache_key", side_effect=lambda pnu: f"identify:{pnu}"), \
+                mock.patch.object(identify, "_run", return_value=None) as run:
+            self.assertIsNone(identify.identify_pnu("missing"))
+            self.assertIsNone(identify.identify_pnu("missing"))
+        self.assertEqual(run.call_count, 2)
+
+
+# =============================================================================
+# 계측 (main/metrics.py) — Server-Timing 단계, Prometheus 렌더링
+# =============================================================================
+class MetricsTests(SimpleTestCase):
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.5"])
+    def test_stats_endpoints_need_staff_or_allowed_ip(self):
+        factory = RequestFactory()
+        for view in (views.metrics_view, views.dbpool_stats):
+            anonymous = factory.get("/", REMOTE_ADDR="203.0.113.7")
+            anonymous.user = mock.Mock(is_staff=False)
+            self.assertEqual(view(anonymous).status_code, 403)
+            staff = factory.get("/", REMOTE_ADDR="203.0.113.7")
+            staff.user = mock.Mock(is_staff=True)
+            self.assertEqual(view(staff).status_code, 200)
+            scraper = factory.get("/", REMOTE_ADDR="10.0.0.5")
+            self.assertEqual(view(scraper).status_code, 200)
+
+    def test_phase_excludes_inner_phases(self):
+        clock = iter([0.0, 1.0, 2.0, 5.0, 6.0, 10.0])
+        with mock.patch.object(metrics.time, "perf_counter", side_effect=lambda: next(clock)):
+            timing = contextvars.copy_context().run(self.run_phases)
+            header = timing.header()
+        self.assertEqual(timing.phases, {"db": 3.0, "encode": 2.0})
+        self.assertEqual(header, "db;dur=3000.0, encode;dur=2000.0, total;dur=10000.0")
+
+    @staticmethod
+    def run_phases():
+        timing = metrics.start()
+        with metrics.phase("encode", exclude=("db",)):
+            with metrics.phase("db"):
+                pass
+        return timing
+
+    def test_phase_outside_request_is_ignored(self):
+        def run():
+            with metrics.phase("db"):
+                return "ok"
+        self.assertEqual(contextvars.Context().run(run), "ok")
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("t_seconds", "test", (0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(("road",), value)
+        lines = histogram.render()
+        self.assertIn('t_seconds_bucket{layer="road",le="0.1"} 1', lines)
+        self.assertIn('t_seconds_bucket{layer="road",le="1"} 2', lines)
+        self.assertIn('t_seconds_bucket{layer="road",le="+Inf"} 3', lines)
+        self.assertIn('t_seconds_count{layer="road"} 3', lines)
+        self.assertIn('t_seconds_sum{layer="road"} 5.55', lines)
+
+    def test_hit_ratio_ignores_empty_tiles(self):
+        with mock.patch.object(metrics, "CACHE", metrics.Counter("c_total", "test", ("layer", "result"))):
+            for result in ("hit", "hit", "miss", "empty", "empty"):
+                metrics.count_cache("jimok", result)
+            text = metrics.render()
+        self.assertIn('c_total{layer="jimok",result="empty"} 2', text)
+        self.assertIn('autosolar_cache_hit_ratio{layer="jimok"} 0.6667', text)
+
+
+# =============================================================================
+# 경량 타일 (main/lean.py)
+# =============================================================================
+class LeanTests(SimpleTestCase):
+    spec = LAYERS["suitability"].lean_spec
+
+    def test_requested(self):
+        get = RequestFactory().get
+        self.assertTrue(lean.requested(get("/", {"lean": "1"})))
+        self.assertFalse(lean.requested(get("/", {"lean": "0"})))
+        self.assertFalse(lean.requested(None))
+
+    def test_extent_for_zoom(self):
+        self.assertEqual(lean.extent_for(10, {}, 4096), 1024)
+        self.assertEqual(lean.extent_for(13, {}, 4096), 2048)
+        self.assertEqual(lean.extent_for(14, {}, 4096), 4096)
+        self.assertEqual(lean.extent_for(10, {}, 512), 512)
+
+    def test_wrap_sql(self):
+        fields = lean.tile_fields(("gid", "pnu", "a20", "usable_area"), self.spec)
+        self.assertEqual(fields, ("gid", "a20", "usable_area"))
+        sql, params = lean.wrap_sql("SELECT * FROM t WHERE x = %s", [7], Suitability, fields, self.spec)
+        # 코드표 두 벌(코드, 코드표 밖 문자열)이 안쪽 SQL 파라미터보다 앞
+        self.assertEqual(params, [list(lean.JIMOK_CODES), list(lean.JIMOK_CODES), 7])
+        self.assertEqual(placeholders(sql), len(params))
+        self.assertIn('array_position(%s::text[], s."a20") - 1 AS "a20"', sql)
+        self.assertIn('AS "a20_s"', sql)
+        self.assertIn('s."gid", ', sql)
+        self.assertTrue(sql.endswith("FROM (SELECT * FROM t WHERE x = %s) AS s"))
+
+    def test_wrap_sql_nulls_empty_text(self):
+        sql, params = lean.wrap_sql("SELECT 1", [], Suitability, ("pnu",), {})
+        self.assertIn("NULLIF(s.\"pnu\", '') AS \"pnu\"", sql)
+        self.assertEqual(params, [])
+
+    def test_tilejson_codes(self):
+        self.assertEqual(lean.tilejson_codes(self.spec), {"a20": list(lean.JIMOK_CODES)})
+
+
+# =============================================================================
+# 레이어 레지스트리 (main/vector_layers.py) — 분할 테이블 대상
+# =============================================================================
+class SubdivRegistryTests(SimpleTestCase):
+    def test_subdiv_sources(self):
+        self.assertIn("nonglim", SUBDIV_SOURCES)
+        # 외곽선을 그리는 필지/주거 레이어와 선/파생 레이어는 분할하지 않는다
+        for layer_id in ("owner", "jimok", "resi", "road", "suitability", "road_setback"):
+            self.assertNotIn(layer_id, SUBDIV_SOURCES)
+        self.assertIsNone(VECTOR_LAYERS["resi"].subdiv_key)
+
+    def test_lod_build_sql_follows_subdiv_flag(self):
+        from main.management.commands import build_lod_tables
+        with mock.patch.object(build_lod_tables, "build_table", return_value=0) as build:
+            command = build_lod_tables.Command()
+            for key in ("jimok", "nonglim"):
+                command.build(key, LOD_LEVELS[key][0], 10, 256)
+        (jimok_sql, jimok_params), (nonglim_sql, nonglim_params) = [c.args[3:5] for c in build.call_args_list]
+        self.assertNotIn("ST_Subdivide", jimok_sql)
+        self.assertEqual(jimok_params, [10])
+        self.assertIn("ST_Subdivide", nonglim_sql)
+        self.assertEqual(nonglim_params, [10, 256])
+
+    def test_lod_subdivide_follows_subdiv_flag(self):
+        self.assertIn("nonglim", LOD_SUBDIVIDED)
+        for layer_id in ("owner", "jimok", "resi"):
+            self.assertIn(layer_id, LOD_MODELS)
+            self.assertNotIn(layer_id, LOD_SUBDIVIDED)
+
+    def test_source_tables_include_built_lod_and_subdiv_tables(self):
+        layer = VECTOR_LAYERS["nonglim"]()
+        with mock.patch("main.vector_layers.model_table_exists", return_value=False):
+            self.assertEqual(len(layer.source_tables()), 1)
+        with mock.patch("main.vector_layers.model_table_exists", return_value=True):
+            names = layer.source_tables()
+        lod = [tables.table_name(m._meta.db_table) for _, m in LOD_MODELS["nonglim"]]
+        self.assertTrue(lod and set(lod) <= set(names))
+        self.assertIn(tables.table_name(SUBDIV_MODELS["nonglim"]._meta.db_table), names)
@@ -0,0 +1,199 @@
+# main/tile_archive.py
+# 오프라인 타일 아카이브 (MBTiles = sqlite)
+#  - 레이어별 파일: {TILE_ARCHIVE_DIR}/{layer_id}.mbtiles
+#  - build_tile_archive 커맨드가 z10~16 을 미리 렌더링해 채우고,
+#    타일 뷰는 여기서 먼저 읽은 뒤 없을 때만 PostGIS 로 렌더링한다.
+#  - metadata 의 data_version 은 빌드 때 레이어 원본 테이블 버전(tile_http.dataset_version).
+#    지금 버전과 다르면(테이블 재적재, LOD/분할 테이블 재생성 — 레이어 source_tables() 에 포함된
+#    테이블만) 아카이브를 건너뛰고 라이브로 렌더링,
+#    build_tile_archive 를 다시 돌리면 비우고 새로 채운다.
+import os
+import sqlite3
+import threading
+
+from django.conf import settings
+
+# 충청남도 범위 (lon/lat) — 아카이브/시딩 기본 범위
+CHUNGNAM_BOUNDS = (125.9, 35.95, 127.7, 37.1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+);
+CREATE TABLE IF NOT EXISTS build_progress (
+    zoom_level INTEGER, tile_column INTEGER,
+    PRIMARY KEY (zoom_level, tile_column)
+);
+"""
+
+VERSION_KEY = "data_version"
+
+_local = threading.local()
+
+
+def archive_path(layer_id):
+    return os.path.join(settings.TILE_ARCHIVE_DIR, f"{layer_id}.mbtiles")
+
+
+def _tms_row(z, y):
+    # MBTiles 는 TMS(y 뒤집힘) 좌표를 쓴다
+    return (1 << z) - 1 - y
+
+
+# ---------------------------------------------------------------------
+# 읽기 (타일 뷰)
+# ---------------------------------------------------------------------
+def _reader(layer_id):
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(layer_id)
+    if conn is None:
+        path = archive_path(layer_id)
+        if not os.path.exists(path):
+            return None
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        conns[layer_id] = conn
+    return conn
+
+
+def _stored_version(conn):
+    row = conn.execute("SELECT value FROM metadata WHERE name=?", (VERSION_KEY,)).fetchone()
+    return row[0] if row else None
+
+
+def read_tile(layer_id, z, x, y, version=None):
+    """
+    아카이브 타일 bytes. 아카이브에 없는 타일이면 None (빈 타일은 b"").
+    version(지금 데이터 버전)이 아카이브를 만든 버전과 다르면 None — 오래된 타일을 내보내지 않는다.
+    """
+    if not getattr(settings, "TILE_ARCHIVE_DIR", None):
+        return None
+    conn = _reader(layer_id)
+    if conn is None:
+        return None
+    try:
+        if version is not None and _stored_version(conn) != version:
+            return None
+        row = conn.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, _tms_row(z, y)),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return None if row is None else bytes(row[0] or b"")
+
+
+# ---------------------------------------------------------------------
+# 쓰기 (build_tile_archive)
+# ---------------------------------------------------------------------
+def open_archive(layer_id, minzoom, maxzoom, bounds, version):
+    """version: 지금 데이터 버전 — 기존 아카이브가 다른 버전이면 비우고 처음부터"""
+    os.makedirs(settings.TILE_ARCHIVE_DIR, exist_ok=True)
+    conn = sqlite3.connect(archive_path(layer_id))
+    conn.execute("PRAGMA journal_mode=WAL")  # 빌드 중에도 뷰에서 읽기 가능
+    conn.executescript(SCHEMA)
+    if _stored_version(conn) != version:
+        with conn:
+            conn.execute("DELETE FROM tiles")
+            conn.execute("DELETE FROM build_progress")
+    meta = {
+        "name": layer_id,
+        "format": "pbf",
+        "minzoom": str(minzoom),
+        "maxzoom": str(maxzoom),
+        "bounds": ",".join(str(v) for v in bounds),
+        "json": '{"vector_layers": [{"id": "%s", "fields": {}}]}' % layer_id,
+        VERSION_KEY: version,
+    }
+    conn.executemany("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)", meta.items())
+    conn.commit()
+    return conn
+
+
+def done_columns(conn):
+    return set(conn.execute("SELECT zoom_level, tile_column FROM build_progress"))
+
+
+def write_column(conn, z, x, tiles):
+    """한 컬럼(z, x)의 타일을 기록하고 진행상황에 완료 표시 (resume 단위)."""
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+            [(z, x, _tms_row(z, y), data) for y, data in tiles],
+        )
+        conn.execute("INSERT OR REPLACE INTO build_progress (zoom_level, tile_column) VALUES (?, ?)", (z, x))
+
+
+def invalidate(layer_id, index=None, version=None):
+    """
+    데이터셋 릴리스 교체 후 (swap_dataset) — index(coverage.CoverageIndex) 가 걸친 타일과
+    그 컬럼의 진행 표시를 지운다. 뷰는 지운 타일을 다시 렌더링하고,
+    build_tile_archive 를 다시 돌리면 지운 컬럼만 채운다. index=None 이면 전부. 지운 타일 수.
+    남은 타일은 새 릴리스에서도 같으므로 version(교체 후 데이터 버전)으로 다시 표시한다.
+    """
+    path = archive_path(layer_id)
+    if not os.path.exists(path):
+        return 0
+    conn = sqlite3.connect(path)
+    deleted = 0
+    try:
+        with conn:
+            if version is not None:
+                conn.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)", (VERSION_KEY, version))
+            if index is None:
+                deleted = conn.execute("DELETE FROM tiles").rowcount
+                conn.execute("DELETE FROM build_progress")
+                return deleted
+            zooms = [r[0] for r in conn.execute("SELECT DISTINCT zoom_level FROM tiles")]
+            for z in zooms:
+                if z < index.zoom:
+                    tiles = index.pyramid[z]
+                    deleted += conn.executemany(
+                        "DELETE FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                        [(z, x, _tms_row(z, y)) for x, y in tiles],
+                    ).rowcount
+                    columns = {x for x, _ in tiles}
+                else:
+                    # 기준 줌 타일 아래 전부 + 버퍼로 걸치는 이웃 한 칸
+                    s = 1 << (z - index.zoom)
+                    deleted += conn.executemany(
+                        "DELETE FROM tiles WHERE zoom_level=? AND tile_column BETWEEN ? AND ? "
+                        "AND tile_row BETWEEN ? AND ?",
+                        [(z, i * s - 1, (i + 1) * s, _tms_row(z, (j + 1) * s), _tms_row(z, j * s - 1))
+                         for i, j in index.base],
+                    ).rowcount
+                    columns = {x for i, _ in index.base for x in range(i * s - 1, (i + 1) * s + 1)}
+                conn.executemany(
+                    "DELETE FROM build_progress WHERE zoom_level=? AND tile_column=?",
+                    [(z, x) for x in columns],
+                )
+        return deleted
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------
+# 워커 (multiprocessing) — 모델 import 는 django.setup() 이후에만
+# ---------------------------------------------------------------------
+def init_worker():
+    import django
+    from django.db import connections
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+    django.setup()
+    # fork 로 상속된 부모 커넥션은 공유하면 안 됨
+    connections.close_all()
+
+
+def render_column(task):
+    """task = (layer_id, z, x, [y, ...]) -> (layer_id, z, x, [(y, bytes), ...])"""
+    from .vector_layers import VECTOR_LAYERS
+
+    layer_id, z, x, ys = task
+    layer = VECTOR_LAYERS[layer_id]()
+    layer.zoom = z
+    layer.request = None
+    return layer_id, z, x, [(y, layer.get_tile(x, y, z)) for y in ys]
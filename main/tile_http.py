@@ -0,0 +1,170 @@
+# main/tile_http.py
+# 벡터 타일 HTTP 캐시 (브라우저/CDN)
+#  - 데이터 버전: 레이어 원본 테이블 지문(tables.table_fingerprint)의 해시
+#    → 테이블을 다시 적재하면 버전이 바뀌고 서버 캐시 키도 같이 바뀐다
+#    레지스트리(main/datasets.py)에 릴리스가 있는 데이터셋은 지문 대신 활성 릴리스 버전,
+#    서버 캐시 키는 타일별로 "이 타일을 마지막으로 건드린 릴리스" (tile_version)
+#  - ETag: 타일 bytes 해시 — 서버 캐시에 타일과 함께 저장, If-None-Match 가 맞으면
+#    다시 렌더링하지 않고 304
+#  - Cache-Control: ?v= 가 현재 버전이면 1년 immutable (TileJSON 이 ?v= 를 붙여 준다),
+#    아니면 TILE_MAX_AGE 뒤 ETag 로 재검증
+#  - 압축: 렌더링 직후 gzip(+brotli) 으로 한 번만 압축해 서버 캐시에 같이 저장하고
+#    Accept-Encoding 에 맞는 것을 그대로 보낸다 (Content-Encoding 이 있으면 GZip 미들웨어가 건너뛴다)
+import gzip
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from . import datasets, metrics
+from .tables import table_fingerprint
+
+try:
+    import brotli
+except ImportError:  # Brotli 미설치 — gzip 만
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_versions = {}  # 테이블명 -> (확인 시각, 지문)
+_lock = threading.Lock()
+
+
+def table_version(name):
+    token = datasets.release_token(name)
+    if token is not None:
+        return token
+    now = time.monotonic()
+    cached = _versions.get(name)
+    if cached is not None and now - cached[0] < settings.TILE_VERSION_CHECK_SECONDS:
+        return cached[1]
+    try:
+        fingerprint = table_fingerprint(name) or ""
+    except Exception:
+        fingerprint = cached[1] if cached else ""
+    with _lock:
+        _versions[name] = (now, fingerprint)
+    return fingerprint
+
+
+def tables_version(names):
+    """테이블 지문들 → 짧은 버전 문자열"""
+    datasets.refresh()
+    h = hashlib.blake2b(digest_size=6)
+    for name in names:
+        h.update(f"{name}={table_version(name)};".encode())
+    return h.hexdigest()
+
+
+def dataset_version(layers):
+    """레이어 인스턴스들의 원본 테이블 버전 (TileJSON ?v=, Cache-Control)"""
+    return tables_version(name for lyr in layers for name in lyr.source_tables())
+
+
+def tile_version(layers, z, x, y):
+    """
+    서버 캐시 키용 타일 버전 — 릴리스 교체 때 바뀐 geometry 가 걸친 타일만 달라진다.
+    레지스트리 밖 테이블(LOD, 이격 버퍼 등 파생 테이블)은 dataset_version 과 같이 지문.
+    """
+    datasets.refresh()
+    h = hashlib.blake2b(digest_size=6)
+    for lyr in layers:
+        for name in lyr.source_tables():
+            token = datasets.tile_token(name, z, x, y)
+            if token is None:
+                token = (name, table_version(name))
+            h.update(f"{token[0]}={token[1]};".encode())
+    return h.hexdigest()
+
+
+def content_etag(content):
+    return '"%s"' % hashlib.blake2b(content, digest_size=12).hexdigest()
+
+
+def _strip_weak(etag):
+    # GZipMiddleware 가 압축 응답의 ETag 를 W/ 로 바꾸므로 약한 비교
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or _strip_weak(etag) in {_strip_weak(e) for e in etags}
+
+
+def cache_control(request, version):
+    if request.GET.get("v") == version:
+        return IMMUTABLE
+    return f"public, max-age={settings.TILE_MAX_AGE}"
+
+
+# ---------------------------------------------------------------------
+# 미리 압축
+# ---------------------------------------------------------------------
+def encode_tile(content):
+    """{Content-Encoding: 압축 bytes} — 빈 타일은 압축하지 않는다"""
+    if not content:
+        return {}
+    encoded = {"gzip": gzip.compress(content, compresslevel=settings.TILE_GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(content, quality=settings.TILE_BROTLI_QUALITY)
+    return encoded
+
+
+def cache_entry(content):
+    """서버 캐시에 넣을 (ETag, 원본 bytes, 압축본)"""
+    with metrics.phase("compress"):
+        return content_etag(content), content, encode_tile(content)
+
+
+def _accepted(request):
+    """Accept-Encoding -> {이름: q}"""
+    accepted = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def pick_encoding(request, encoded):
+    """보낼 압축 방식 (br > gzip) — 없으면 None (원본)"""
+    accepted = _accepted(request)
+    for name in ("br", "gzip"):
+        if name in encoded and accepted.get(name, accepted.get("*", 0)) > 0:
+            return name
+    return None
+
+
+def tile_response(request, entry, version, content_type):
+    """entry = cache_entry() 결과"""
+    # 압축본이 없는 이전 형식 (etag, content) 캐시 항목도 받는다
+    etag, content, encoded = entry if len(entry) == 3 else (*entry, {})
+    encoding = pick_encoding(request, encoded)
+    if encoding:
+        # 표현(압축 방식)마다 다른 ETag
+        etag = f'{etag[:-1]}-{encoding}"'
+    if not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        body = encoded[encoding] if encoding else content
+        response = HttpResponse(body, content_type=content_type, status=200 if content else 204)
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control(request, version)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -1,42 +1,37 @@
 from django.urls import path, re_path
 from . import views
+from .vector_layers import LAYERS
 
 urlpatterns = [
     # 페이지
     path("", views.map_view, name="map"),
     path("index/", views.index, name="index"),
     path("api/geocode/", views.vworld_geocode, name="vworld_geocode"),
+    path("api/geocode/stats/", views.vworld_geocode_stats, name="vworld_geocode_stats"),
+    path("api/dbpool/stats/", views.dbpool_stats, name="dbpool_stats"),
+    path("api/suitability/", views.suitability_api, name="suitability_api"),
+    path("api/identify/", views.identify_api, name="identify_api"),
+    # Prometheus 수집 (레이어별 지연/bytes/feature 수, 캐시 적중률)
+    path("metrics", views.metrics_view, name="metrics"),
 
     # VWorld WMTS 프록시
     path("vwtiles/<str:layer>/<int:z>/<int:y>/<int:x>.<str:ext>", views.vworld_wmts_proxy, name="vworld_wmts_proxy"),
 
-    # MVT 타일
-    path("tiles/owner/<int:z>/<int:x>/<int:y>.pbf", views.OwnerTileView.as_view(),  name="tiles_owner"),
-    path("tiles/yongdo/<int:z>/<int:x>/<int:y>.pbf", views.YongdoTileView.as_view(), name="tiles_yongdo"),
-    path("tiles/road/<int:z>/<int:x>/<int:y>.pbf",   views.RoadTileView.as_view(),   name="tiles_road"),
-    path("tiles/jimok/<int:z>/<int:x>/<int:y>.pbf",  views.JimokTileView.as_view(),  name="tiles_jimok"),
-    # ✅ 추가: Resi(주거이격)
-    path("tiles/resi/<int:z>/<int:x>/<int:y>.pbf",   views.ResiTileView.as_view(),   name="tiles_resi"),
-    path("tiles/nonglim/<int:z>/<int:x>/<int:y>.pbf",           views.NonglimTileView.as_view(),           name="tiles_nonglim"),
-    path("tiles/nongupjinheung/<int:z>/<int:x>/<int:y>.pbf",    views.NongupJinheungTileView.as_view(),    name="tiles_nongupjinheung"),
-    path("tiles/jayeonnogji/<int:z>/<int:x>/<int:y>.pbf",       views.JayeonNogjiTileView.as_view(),       name="tiles_jayeonnogji"),
-    path("tiles/gaebaljingheung/<int:z>/<int:x>/<int:y>.pbf",   views.GaebalJingheungTileView.as_view(),   name="tiles_gaebaljingheung"),
-    path("tiles/nongupseisangiban/<int:z>/<int:x>/<int:y>.pbf", views.NongupSeisanGibanTileView.as_view(), name="tiles_nongupseisangiban"),
-
-
-    # (선택) TileJSON
-    path("tiles/owner.json",  views.OwnerTileJSON.as_view(),  name="tiles_owner_json"),
-    path("tiles/yongdo.json", views.YongdoTileJSON.as_view(), name="tiles_yongdo_json"),
-    path("tiles/road.json",   views.RoadTileJSON.as_view(),   name="tiles_road_json"),
-    path("tiles/jimok.json",  views.JimokTileJSON.as_view(),  name="tiles_jimok_json"),
-    # ✅ 추가: Resi TileJSON
-    path("tiles/resi.json",   views.ResiTileJSON.as_view(),   name="tiles_resi_json"),
-    # (선택) TileJSON 경로도 원하시면 아래 추가
-    path("tiles/nonglim.json",           views.NonglimTileJSON.as_view(),           name="tiles_nonglim_json"),
-    path("tiles/nongupjinheung.json",    views.NongupJinheungTileJSON.as_view(),    name="tiles_nongupjinheung_json"),
-    path("tiles/jayeonnogji.json",       views.JayeonNogjiTileJSON.as_view(),       name="tiles_jayeonnogji_json"),
-    path("tiles/gaebaljingheung.json",   views.GaebalJingheungTileJSON.as_view(),   name="tiles_gaebaljingheung_json"),
-    path("tiles/nongupseisangiban.json", views.NongupSeisanGibanTileJSON.as_view(), name="tiles_nongupseisangiban_json"),
+    # MVT 타일 / TileJSON — 레이어 레지스트리(vector_layers.LAYERS)로 생성
+    #   tiles_{id}:      /tiles/{url_path}/{z}/{x}/{y}.pbf  (이격: /tiles/{kind}_setback/{dist}/...)
+    #   tiles_{id}_json: /tiles/{id}.json
+    *[
+        path(f"tiles/{cls.url_path}/<int:z>/<int:x>/<int:y>.pbf",
+             views.LayerTileView.as_view(layer_id=layer_id), name=f"tiles_{layer_id}")
+        for layer_id, cls in LAYERS.items()
+    ],
+    # 복합 타일: ?layers=road,jimok,... (한 요청/한 SQL 로 여러 레이어)
+    path("tiles/composite/<int:z>/<int:x>/<int:y>.pbf", views.CompositeTileView.as_view(), name="tiles_composite"),
+    path("tiles/composite.json", views.CompositeTileJSON.as_view(), name="tiles_composite_json"),
+    *[
+        path(f"tiles/{layer_id}.json", views.LayerTileJSON.as_view(layer_id=layer_id), name=f"tiles_{layer_id}_json")
+        for layer_id, cls in LAYERS.items() if cls.has_tilejson
+    ],
 
     # ✅ 도로이격(시각) GeoJSON
     re_path(r'^geojson/road_setback/?$', views.road_setback_geojson, name='road_setback_geojson'),
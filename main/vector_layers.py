@@ -1,37 +1,179 @@
 # main/vector_layers.py
-from django.db.models import Value, TextField
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Transform
 from vectortiles import VectorLayer
+from vectortiles.backends.postgis.functions import AsMVTGeom, MakeEnvelope
+from . import lean
+from .db_pool import fetch_one
+from .lean import JIMOK_CODES, OWNER_CODES
+from .setbacks import buffer_table_name, dissolved_table_name, setback_tile_sql, source_table
+from .tables import model_table_exists, table_name
 from .models import (
-    OwnerSubdiv, OwnerS30, OwnerRaw,
-    Yongdo, YongdoS30,
-    Road, RoadS10,
-    Jimok, JimokS30,
+    OwnerRaw,
+    Yongdo,
+    Road,
+    Jimok,
     ResiSetback,
     Nonglim, NongupJinheung, JayeonNogji, GaebalJingheung, NongupSeisanGiban,
+    Suitability,
+    lod_models, subdiv_model,
 )
 
-def _norm_list(values):
-    return [v.strip() for v in values if v and str(v).strip()]
+def canonical_values(request, key):
+    """
+    ?key=a&key=b / ?key=b,a 모두 ['a', 'b'] — 공백 제거, 중복 제거, 정렬.
+    필터 SQL 과 캐시 키가 같은 정규형을 쓰므로 체크 순서가 달라도 같은 타일이 된다.
+    """
+    vals = []
+    for raw in request.GET.getlist(key):
+        vals.extend(v.strip() for v in raw.split(","))
+    return sorted({v for v in vals if v})
 
-# ===== Owner (지목/소유자 필터 적용) ============================================
-class OwnerVectorLayer(VectorLayer):
-    id = "owner"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid", "a2", "a5", "a20", "a8")  # 지목/소유자 확인용 속성만 싣기
+
+def owner_filters(request):
+    """(jm, own) 정규형"""
+    return canonical_values(request, "jm"), canonical_values(request, "own")
+
+# ===== 공통 베이스 ===========================================================
+class BaseVectorLayer(VectorLayer):
+    """
+    vectortiles 의 get_tile 을 (SQL 생성 / 실행) 두 단계로 분리.
+    get_tile_sql() 은 ST_AsMVT bytea 한 개를 돌려주는 SELECT 를 만들고,
+    복합 타일(CompositeTileView)은 여러 레이어의 SQL 을 한 번에 실행한다.
+
+    줌별 테이블 선택(LOD): lod_key 가 있으면 LOD_MODELS 에서
+    해당 줌 이하로 지정된 첫 단순화 테이블을 쓰고, 그보다 큰 줌(최대 해상도)은
+    subdiv_key 의 분할 테이블(SUBDIV_MODELS), 둘 다 없으면 model(원본)을 쓴다.
+
+    id/model/줌/속성/버퍼/캐시 TTL 은 아래 LAYER_CONFIG 가 서브클래스를 만들며 채운다.
+    """
+    model = None
+    lod_key = None
+    subdiv_key = None
+    cache_ttl = 60 * 10     # 서버 타일 캐시 (초)
+    url_path = None         # /tiles/{url_path}/{z}/{x}/{y}.pbf
+    has_tilejson = True     # /tiles/{id}.json
+    in_composite = True     # VECTOR_LAYERS (복합 타일 ?layers=, 아카이브, 커버리지) 포함 여부
+    lean_spec = {}          # ?lean=1 경량 모드 설정 (main/lean.py)
+    lean_override = None    # True/False 면 요청과 무관하게 고정 (절감량 표본)
+
+    def get_lod_model(self, zoom):
+        if zoom is not None and self.lod_key:
+            for max_zoom, lod_model in LOD_MODELS.get(self.lod_key, ()):
+                # 아직 build_lod_tables 로 만들지 않은 단계는 건너뛴다
+                if zoom <= max_zoom and model_table_exists(lod_model):
+                    return lod_model
+        if zoom is not None and self.subdiv_key:
+            # 아직 build_subdivided 로 만들지 않았으면 원본
+            subdiv = SUBDIV_MODELS[self.subdiv_key]
+            if model_table_exists(subdiv):
+                return subdiv
+        return self.model
+
+    def source_tables(self):
+        """데이터 버전(ETag/캐시 키)을 정하는 filter 스키마 테이블명"""
+        names = [table_name(self.model._meta.db_table)]
+        # 실제로 타일을 내보내는 파생 테이블 — LOD(build_lod_tables)·분할(build_subdivided) 재생성도 버전에 반영
+        derived = [model for _, model in LOD_MODELS.get(self.lod_key, ())] if self.lod_key else []
+        if self.subdiv_key:
+            derived.append(SUBDIV_MODELS[self.subdiv_key])
+        names += [table_name(model._meta.db_table) for model in derived if model_table_exists(model)]
+        return names
+
+    def cache_params(self):
+        """타일 내용에 영향을 주는 요청 파라미터 (캐시 키용 정규형)"""
+        return ""
+
+    def is_lean(self):
+        if self.lean_override is not None:
+            return self.lean_override
+        return lean.requested(getattr(self, "request", None))
+
+    def get_tile_extent(self, z):
+        return lean.extent_for(z, self.lean_spec, self.tile_extent) if self.is_lean() else self.tile_extent
+
+    def get_tile_buffer(self, extent):
+        # 버퍼는 타일 크기 대비 비율을 유지
+        return self.tile_buffer * extent // self.tile_extent
+
+    def get_tile_fields(self):
+        fields = super().get_tile_fields()
+        return lean.tile_fields(fields, self.lean_spec) if self.is_lean() else fields
+
+    def get_tilejson_vector_layer(self):
+        data = super().get_tilejson_vector_layer()
+        if self.is_lean():
+            data["codes"] = lean.tilejson_codes(self.lean_spec)
+        return data
 
     # ★ 호출 패턴을 모두 수용 (request,bbox,zoom) 또는 인자 없음
     def get_queryset(self, request=None, bbox=None, zoom=None):
-        # 1) 줌에 따라 테이블 선택(있으면 단순화본 우선)
         if zoom is None:
             zoom = getattr(self, "zoom", None)
+        return self.get_lod_model(zoom).objects.all()
+
+    def get_tile_sql(self, x, y, z):
+        features = self.get_vector_tile_queryset(z, x, y)
+        xmin, ymin, xmax, ymax = self.get_bounds(x, y, z)
+        extent = self.get_tile_extent(z)
+        features = features.filter(**{
+            f"{self.geom_field}__intersects": MakeEnvelope(xmin, ymin, xmax, ymax, 3857)
+        })
+        features = features.annotate(
+            geom_prepared=AsMVTGeom(
+                Transform(self.geom_field, 3857),
+                MakeEnvelope(xmin, ymin, xmax, ymax, 3857),
+                extent,
+                self.get_tile_buffer(extent),
+                self.clip_geom,
+            )
+        )
+        fields = self.get_tile_fields()
+        limit = self.get_queryset_limit()
+        if limit:
+            features = features[:limit]
+        sql, params = features.values(*fields, "geom_prepared").query.sql_with_params()
+        if self.is_lean():
+            sql, params = lean.wrap_sql(sql, params, features.model, fields, self.lean_spec)
+        return (
+            f"SELECT ST_AsMVT(subquery.*, %s, %s, %s) FROM ({sql}) AS subquery",
+            [self.get_id(), extent, "geom_prepared", *params],
+        )
 
-        if zoom is not None and zoom <= 11 and OwnerS30:
-            qs = OwnerS30.objects.all()
-        elif OwnerSubdiv:
-            qs = OwnerSubdiv.objects.all()
-        else:
-            qs = OwnerRaw.objects.all()
+    def get_tile(self, x, y, z):
+        if not self.check_in_zoom_levels(z):
+            return b""
+        sql, params = self.get_tile_sql(x, y, z)
+        return fetch_tile(sql, params)
+
+    def is_archivable(self):
+        # 요청 파라미터에 따라 내용이 달라지는 레이어는 아카이브를 쓰면 안 됨
+        return True
+
+
+def fetch_tile(sql, params):
+    # 커넥션 풀 + prepared statement (settings.TILE_DB_POOL)
+    row = fetch_one(sql, params)
+    # psycopg2 는 memoryview, psycopg(3) 는 bytes
+    return row.tobytes() if isinstance(row, memoryview) else row or b""
+
+
+def union_tile_sql(parts):
+    """
+    [(sql, params), ...] -> 레이어별 MVT 를 || 로 이어붙인 단일 SELECT.
+    MVT 는 레이어 메시지의 연속이므로 바이트 결합만으로 다중 레이어 타일이 된다.
+    """
+    sqls, params = [], []
+    for sql, p in parts:
+        sqls.append(f"COALESCE(({sql}), ''::bytea)")
+        params.extend(p)
+    return "SELECT " + " || ".join(sqls), params
+
+# ===== Owner (지목/소유자 필터 적용) ============================================
+class _OwnerLayer(BaseVectorLayer):
+    def get_queryset(self, request=None, bbox=None, zoom=None):
+        # 1) 줌에 따라 테이블 선택(LOD 단순화본 → 분할본)
+        qs = super().get_queryset(zoom=zoom)
 
         # 2) request 확보
         if request is None:
@@ -39,113 +181,234 @@ class OwnerVectorLayer(VectorLayer):
 
         # 3) 필터 적용 (jm: 지목, own: 소유자)
         if request is not None:
-            jm  = _norm_list(request.GET.getlist("jm"))
-            own = _norm_list(request.GET.getlist("own"))
+            jm, own = owner_filters(request)
 
             if jm:
                 qs = qs.filter(a20__in=jm)
             if own:
                 qs = qs.filter(a8__in=own)
-        
-        # 4) a2/a5가 없는 단순화/분할 테이블에 대해 빈 필드 annotate
-        model_fields = {f.name for f in qs.model._meta.get_fields()}
-        if "a2" not in model_fields:
-            qs = qs.annotate(a2=Value("", output_field=TextField()))
-        if "a5" not in model_fields:
-            qs = qs.annotate(a5=Value("", output_field=TextField()))
 
         return qs
 
-# ===== Yongdo ================================================================
-class YongdoVectorLayer(VectorLayer):
-    id = "yongdo"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
+    def cache_params(self):
+        request = getattr(self, "request", None)
+        if request is None:
+            return ""
+        jm, own = owner_filters(request)
+        return f"jm={','.join(jm)};own={','.join(own)}"
 
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        if zoom is None:
-            zoom = getattr(self, "zoom", None)
-        if zoom is not None and zoom <= 11 and YongdoS30:
-            return YongdoS30.objects.all()
-        return Yongdo.objects.all()
+    def is_archivable(self):
+        # 아카이브에는 필터 없는 전체 타일만 있다
+        request = getattr(self, "request", None)
+        if request is None:
+            return True
+        return not any(owner_filters(request))
 
-# ===== Road ==================================================================
-class RoadVectorLayer(VectorLayer):
-    id = "road"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
+# ===== 도로/주거 이격 (dist 별 버퍼 타일) ====================================
+class _SetbackLayer(BaseVectorLayer):
+    setback_kind = None
+    dist = 50
 
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        if zoom is None:
-            zoom = getattr(self, "zoom", None)
-        if zoom is not None and zoom <= 11 and RoadS10:
-            return RoadS10.objects.all()
-        return Road.objects.all()
+    def is_dissolved(self):
+        # ?dissolve=1 : 타일 단위 union (gid 없이 제척 영역만)
+        request = getattr(self, "request", None)
+        return request is not None and request.GET.get("dissolve") in ("1", "true")
 
-# ===== Jimok (기타) — 필터 무관, 항상 전체 ====================================
-class JimokVectorLayer(VectorLayer):
-    id = "jimok"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid", "pnu", "jibun", "a20")
+    def get_tile_sql(self, x, y, z):
+        extent = self.get_tile_extent(z)
+        return setback_tile_sql(
+            self.setback_kind, float(self.dist), self.get_bounds(x, y, z),
+            self.get_id(), extent, self.get_tile_buffer(extent),
+            dissolve=self.is_dissolved(), z=z,
+        )
 
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        if zoom is None:
-            zoom = getattr(self, "zoom", None)
-        if zoom is not None and zoom <= 11 and JimokS30:
-            return JimokS30.objects.all()
-        return Jimok.objects.all()
+    def source_tables(self):
+        # 원본 + 사전계산 버퍼 테이블 (build_setback_tables 갱신도 버전에 반영)
+        return [
+            table_name(source_table(self.setback_kind)),
+            buffer_table_name(self.setback_kind, self.dist),
+            dissolved_table_name(self.setback_kind, self.dist),
+        ]
 
-# ===== Resi (주거이격) — 도로이격과 동일한 MVT 경로 ============================
-class ResiVectorLayer(VectorLayer):
-    id = "resi"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
+    def cache_params(self):
+        return f"dist={self.dist};dissolve={int(self.is_dissolved())}"
 
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        # 별도 필터 없음: 전체를 그대로 제공
-        return ResiSetback.objects.all()
-        
-# 파일 하단 적절한 위치에 간단한 VectorLayer 5개 추가
-class NonglimVectorLayer(VectorLayer):
-    id = "nonglim"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        return Nonglim.objects.all()
+    def is_archivable(self):
+        return False
 
-class NongupJinheungVectorLayer(VectorLayer):
-    id = "nongupjinheung"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        return NongupJinheung.objects.all()
+# ===== 태양광 입지 적합성 (build_suitability 결과) ==============================
+# ?scenario=road50_resi100_... (기본 settings.SUITABILITY_DEFAULT_SCENARIO), ?min_area=㎡
+class _SuitabilityLayer(BaseVectorLayer):
+    def get_scenario(self):
+        request = getattr(self, "request", None)
+        default = settings.SUITABILITY_DEFAULT_SCENARIO
+        return request.GET.get("scenario", default) if request is not None else default
 
-class JayeonNogjiVectorLayer(VectorLayer):
-    id = "jayeonnogji"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        return JayeonNogji.objects.all()
+    def get_min_area(self):
+        request = getattr(self, "request", None)
+        try:
+            return max(0.0, float(request.GET.get("min_area", 0))) if request is not None else 0.0
+        except ValueError:
+            return 0.0
 
-class GaebalJingheungVectorLayer(VectorLayer):
-    id = "gaebaljingheung"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
     def get_queryset(self, request=None, bbox=None, zoom=None):
-        return GaebalJingheung.objects.all()
+        # /api/suitability/ 와 같은 기준 — min_area 이상 (사용 면적 0 은 geom 이 비어 타일에 안 그려진다)
+        return super().get_queryset(zoom=zoom).filter(
+            scenario=self.get_scenario(), usable_area__gte=self.get_min_area()
+        )
 
-class NongupSeisanGibanVectorLayer(VectorLayer):
-    id = "nongupseisangiban"
-    geom_field = "geom"
-    min_zoom = 10
-    tile_fields = ("gid",)
-    def get_queryset(self, request=None, bbox=None, zoom=None):
-        return NongupSeisanGiban.objects.all()
\ No newline at end of file
+    def cache_params(self):
+        return f"scenario={self.get_scenario()};min_area={self.get_min_area():g}"
+
+    def is_archivable(self):
+        return False
+
+# ===== 레이어 레지스트리 ======================================================
+# 새 데이터셋: models.py 에 모델을 만들고 여기 한 항목 추가.
+# 타일/TileJSON 뷰(views.LayerTileView/LayerTileJSON)와 URL(tiles_{id}, tiles_{id}_json)은
+# 이 목록으로 생성된다. 빠진 키는 LAYER_DEFAULTS.
+#   model      : 원본 모델 (LOD 단계 밖의 줌)
+#   fields     : 타일에 싣는 속성 — 필터/스타일에 쓰는 것만
+#   min_zoom, max_zoom
+#   lod        : ((이 줌 이하에서 사용, 단순화 허용오차 m), ...) 줌 오름차순
+#                → build_lod_tables 가 filter."{id}_s{tol}" 생성, 없는 단계는 건너뜀
+#   lod_source : LOD 를 만들 원본 모델 (기본 model)
+#   subdiv     : 최대 해상도 줌에서 분할 테이블 filter."{id}_subdiv" 사용 (다각형 레이어만)
+#                → build_subdivided 가 lod_source(기본 model)를 ST_Subdivide 해서 생성, 없으면 원본
+#                False 면 LOD 테이블도 ST_Subdivide 없이 단순화만 — 외곽선을 그리는 필지 레이어는
+#                조각 경계가 선으로 보이므로 분할하지 않는다
+#   cache_ttl  : 서버 타일 캐시 (초)
+#   buffer     : MVT 버퍼 (extent 4096 단위) — 굵은 선/큰 면이 많으면 키우고, 작을수록 타일이 가볍다
+#   base       : 요청 파라미터로 내용이 바뀌는 레이어의 베이스 클래스
+#   url        : /tiles/{url}/{z}/{x}/{y}.pbf (기본 id)
+#   tilejson   : /tiles/{id}.json 생성 여부
+#   composite  : VECTOR_LAYERS 포함 (복합 타일, 아카이브, 커버리지, 식별)
+#   lean       : ?lean=1 경량 모드 — {"codes": {속성: 코드표}, "drop": (속성, ...), "extent": ((줌, extent), ...)}
+#                (main/lean.py, extent 기본 lean.LEAN_EXTENT)
+#   attrs      : 베이스 클래스에 넘길 추가 속성
+LAYER_DEFAULTS = {
+    "model": None,
+    "fields": ("gid",),
+    "min_zoom": 10,
+    "max_zoom": 22,
+    "lod": (),
+    "lod_source": None,
+    "subdiv": True,
+    "cache_ttl": 60 * 10,
+    "buffer": 256,
+    "base": BaseVectorLayer,
+    "url": None,
+    "tilejson": True,
+    "composite": True,
+    "lean": {},
+    "attrs": {},
+}
+
+_ZONING_LOD = ((10, 60), (12, 20), (14, 5))
+
+LAYER_CONFIG = {
+    "owner": {
+        "model": OwnerRaw, "base": _OwnerLayer,
+        # 지번(a2/a5) 등 상세는 클릭 시 /api/identify/
+        "fields": ("gid", "a20", "a8"),
+        "lod": ((11, 30), (13, 10)),
+        "lean": {"codes": {"a20": JIMOK_CODES, "a8": OWNER_CODES}},
+        "subdiv": False,  # 필지 외곽선을 그린다 — 조각내지 않는다
+    },
+    "yongdo": {"model": Yongdo, "lod": ((11, 30), (13, 10))},
+    "road": {"model": Road, "lod": ((11, 10), (13, 3))},
+    "jimok": {
+        "model": Jimok, "fields": ("gid", "pnu", "jibun", "a20"), "lod": ((11, 30), (13, 10)),
+        # pnu/jibun 은 클릭 시 /api/identify/ 로
+        "lean": {"codes": {"a20": JIMOK_CODES}, "drop": ("pnu", "jibun")},
+        "subdiv": False,  # owner 와 같이 필지 외곽선용
+    },
+    # 주거 이격 기준 원천 — 외곽선을 그리므로 분할 테이블도, LOD 조각내기도 없이
+    "resi": {"model": ResiSetback, "lod": ((11, 10), (13, 3)), "subdiv": False},
+    "nonglim": {"model": Nonglim, "lod": _ZONING_LOD},
+    "nongupjinheung": {"model": NongupJinheung, "lod": _ZONING_LOD},
+    "jayeonnogji": {"model": JayeonNogji, "lod": _ZONING_LOD},
+    "gaebaljingheung": {"model": GaebalJingheung, "lod": _ZONING_LOD},
+    "nongupseisangiban": {"model": NongupSeisanGiban, "lod": _ZONING_LOD},
+    # 이격 버퍼 — /tiles/{kind}_setback/{dist}/{z}/{x}/{y}.pbf (?dissolve=1)
+    "road_setback": {
+        "base": _SetbackLayer, "fields": ("gid", "dist"), "url": "road_setback/<int:dist>",
+        "tilejson": False, "composite": False, "attrs": {"setback_kind": "road"},
+    },
+    "resi_setback": {
+        "base": _SetbackLayer, "fields": ("gid", "dist"), "url": "resi_setback/<int:dist>",
+        "tilejson": False, "composite": False, "attrs": {"setback_kind": "resi"},
+    },
+    # ?scenario=&min_area= — 요청마다 내용이 달라 복합/아카이브 대상 아님
+    "suitability": {
+        "model": Suitability, "base": _SuitabilityLayer, "min_zoom": 12,
+        "fields": ("gid", "pnu", "a20", "parcel_area", "usable_area", "usable_ratio"),
+        "lean": {"codes": {"a20": JIMOK_CODES}, "drop": ("pnu",)},
+        "composite": False, "subdiv": False,  # 시나리오별 필지 결과 — 이미 필지 단위
+    },
+}
+
+
+def layer_config(layer_id):
+    return {**LAYER_DEFAULTS, **LAYER_CONFIG[layer_id]}
+
+
+def _subdiv_source(cfg):
+    """분할 테이블 원본 모델 — 다각형 레이어가 아니면 None"""
+    model = cfg["lod_source"] or cfg["model"]
+    if not cfg["subdiv"] or model is None:
+        return None
+    return model if model._meta.get_field("geom").geom_type in ("POLYGON", "MULTIPOLYGON") else None
+
+
+# SUBDIV_SOURCES[key] = 분할 원본 모델 — build_subdivided
+SUBDIV_SOURCES = {
+    layer_id: source
+    for layer_id, source in ((lid, _subdiv_source(layer_config(lid))) for lid in LAYER_CONFIG)
+    if source is not None
+}
+# SUBDIV_MODELS[key] = 분할 테이블 모델
+SUBDIV_MODELS = {key: subdiv_model(key, base) for key, base in SUBDIV_SOURCES.items()}
+
+
+def _layer_class(layer_id):
+    cfg = layer_config(layer_id)
+    unknown = set(cfg) - set(LAYER_DEFAULTS)
+    if unknown:
+        raise ValueError(f"{layer_id}: unknown config keys {sorted(unknown)}")
+    attrs = {
+        "__module__": __name__,
+        "id": layer_id,
+        "geom_field": "geom",
+        "model": cfg["model"],
+        "tile_fields": tuple(cfg["fields"]),
+        "min_zoom": cfg["min_zoom"],
+        "max_zoom": cfg["max_zoom"],
+        "lod_key": layer_id if cfg["lod"] else None,
+        "subdiv_key": layer_id if layer_id in SUBDIV_SOURCES else None,
+        "cache_ttl": cfg["cache_ttl"],
+        "tile_buffer": cfg["buffer"],
+        "url_path": cfg["url"] or layer_id,
+        "has_tilejson": cfg["tilejson"],
+        "in_composite": cfg["composite"],
+        "lean_spec": cfg["lean"],
+        **cfg["attrs"],
+    }
+    name = "".join(part.capitalize() for part in layer_id.split("_")) + "VectorLayer"
+    return type(name, (cfg["base"],), attrs)
+
+
+# 전체 레이어 (URL 생성) / 복합 타일 ?layers= 에 쓸 수 있는 레이어
+LAYERS = {layer_id: _layer_class(layer_id) for layer_id in LAYER_CONFIG}
+VECTOR_LAYERS = {layer_id: cls for layer_id, cls in LAYERS.items() if cls.in_composite}
+
+# LOD_LEVELS[key] = (LOD 원본 모델, ((max_zoom, tol), ...))  — build_lod_tables / coverage
+LOD_LEVELS = {
+    layer_id: (cfg["lod_source"] or cfg["model"], tuple(cfg["lod"]))
+    for layer_id, cfg in ((lid, layer_config(lid)) for lid in LAYER_CONFIG)
+    if cfg["lod"]
+}
+# LOD_MODELS[key] = ((max_zoom, 모델), ...)
+LOD_MODELS = {key: lod_models(key, base, levels) for key, (base, levels) in LOD_LEVELS.items()}
+# LOD 테이블을 ST_Subdivide 로 조각내는 키 (subdiv: False 레이어는 단순화만) — build_lod_tables
+LOD_SUBDIVIDED = frozenset(key for key in LOD_LEVELS if layer_config(key)["subdiv"])
@@ -1,25 +1,25 @@
+import os
+from functools import wraps
+
 from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest, HttpResponseServerError
-import requests
-# ★ 추가
-import json
-from django.db import connection
-
-# 캐시 데코레이터
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.http import (
+    JsonResponse, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseServerError,
+    StreamingHttpResponse, FileResponse,
+)
+from django.core.cache import cache
 
 # MVT
 from vectortiles.views import MVTView, TileJSONView
-from .vector_layers import (
-    OwnerVectorLayer,
-    YongdoVectorLayer,
-    RoadVectorLayer,
-    JimokVectorLayer,
-    ResiVectorLayer, NonglimVectorLayer, NongupJinheungVectorLayer, JayeonNogjiVectorLayer,
-    GaebalJingheungVectorLayer, NongupSeisanGibanVectorLayer,   # ✅ 추가
+from django.contrib.gis.geos import Polygon
+
+from . import (
+    coverage, db_pool, identify, lean, metrics, slow_tiles, suitability, tile_archive, tile_http, vworld, wmts_cache,
 )
+from .mvt import feature_count
+from .models import Suitability
+from .setbacks import parse_dist, setback_features_sql
+from .vector_layers import LAYERS, VECTOR_LAYERS, union_tile_sql, fetch_tile, canonical_values
 
 # ---------------------------------------------------------------------
 # 기본 페이지
@@ -47,23 +47,40 @@ def vworld_geocode(request):
     if not query:
         return JsonResponse({"error": "missing query"}, status=400)
 
-    url = "https://api.vworld.kr/req/address"
-    params = {
-        "service": "address",
-        "request": "getCoord",
-        "version": "2.0",
-        "crs": "EPSG:4326",
-        "format": "json",
-        "type": addr_type,
-        "address": query,
-        "key": key,
-    }
+    timing = metrics.start()
     try:
-        r = requests.get(url, params=params, timeout=5)
-        r.raise_for_status()
-        return JsonResponse(r.json())
+        response = JsonResponse(vworld.get_geocoder().geocode(query, addr_type, key))
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=502)
+        response = JsonResponse({"error": str(e)}, status=502)
+    metrics.observe("vworld_geocode", timing, size=len(response.content))
+    return metrics.with_server_timing(response, timing)
+
+# ---------------------------------------------------------------------
+# 운영 통계 (/metrics, /api/*/stats/) — 스태프 로그인 또는 settings.METRICS_ALLOWED_IPS 만
+#   풀 크기/대기, 지오코더 사용량, 레이어별 지연은 외부에 공개하지 않는다
+# ---------------------------------------------------------------------
+def internal_only(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        user = getattr(request, "user", None)
+        allowed = getattr(settings, "METRICS_ALLOWED_IPS", ())
+        if not ((user is not None and user.is_staff) or request.META.get("REMOTE_ADDR") in allowed):
+            return HttpResponseForbidden("forbidden")
+        return view(request, *args, **kwargs)
+    return wrapper
+
+@internal_only
+def vworld_geocode_stats(request):
+    return JsonResponse(vworld.get_geocoder().get_stats())
+
+@internal_only
+def dbpool_stats(request):
+    return JsonResponse(db_pool.pool_stats())
+
+# Prometheus 수집 — 레이어별 지연/bytes/feature 수 히스토그램, 캐시 적중률 (main/metrics.py)
+@internal_only
+def metrics_view(request):
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 # ---------------------------------------------------------------------
 # 공통 TileView 베이스
@@ -74,226 +91,416 @@ class _BaseTile:
 
     def get_layers(self):
         layers = super().get_layers()
+        kwargs = getattr(self, "kwargs", {})
         try:
-            z = int(getattr(self, "kwargs", {}).get("z"))
+            z = int(kwargs.get("z"))
         except Exception:
             z = None
 
         for lyr in layers:
-            setattr(lyr, "request", self.request)
+            # TileJSONView 는 __init__ 에서(요청 전) get_layers 를 부른다
+            setattr(lyr, "request", getattr(self, "request", None))
             if z is not None:
                 setattr(lyr, "zoom", z)
+            if "dist" in kwargs:
+                setattr(lyr, "dist", kwargs["dist"])
         return layers
 
-# ---- Owner -----------------------------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class OwnerTileView(_BaseTile, MVTView):
-    layer_classes = [OwnerVectorLayer]
-
-class OwnerTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [OwnerVectorLayer]
-
-# ---- Yongdo ----------------------------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class YongdoTileView(_BaseTile, MVTView):
-    layer_classes = [YongdoVectorLayer]
-
-class YongdoTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [YongdoVectorLayer]
-
-# ---- Road ------------------------------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class RoadTileView(_BaseTile, MVTView):
-    layer_classes = [RoadVectorLayer]
-
-class RoadTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [RoadVectorLayer]
-
-# ---- Jimok -----------------------------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class JimokTileView(_BaseTile, MVTView):
-    layer_classes = [JimokVectorLayer]
-
-class JimokTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [JimokVectorLayer]
-
-# ✅ ---- Resi(주거이격) ------------------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class ResiTileView(_BaseTile, MVTView):
-    layer_classes = [ResiVectorLayer]
-
-class ResiTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [ResiVectorLayer]
-
-# ---- 신규 타일 뷰 (캐시 10분 동일) ------------------------------------
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class NonglimTileView(_BaseTile, MVTView):
-    layer_classes = [NonglimVectorLayer]
-class NonglimTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [NonglimVectorLayer]
-
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class NongupJinheungTileView(_BaseTile, MVTView):
-    layer_classes = [NongupJinheungVectorLayer]
-class NongupJinheungTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [NongupJinheungVectorLayer]
-
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class JayeonNogjiTileView(_BaseTile, MVTView):
-    layer_classes = [JayeonNogjiVectorLayer]
-class JayeonNogjiTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [JayeonNogjiVectorLayer]
-
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class GaebalJingheungTileView(_BaseTile, MVTView):
-    layer_classes = [GaebalJingheungVectorLayer]
-class GaebalJingheungTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [GaebalJingheungVectorLayer]
-
-@method_decorator(cache_page(60 * 10), name='dispatch')
-class NongupSeisanGibanTileView(_BaseTile, MVTView):
-    layer_classes = [NongupSeisanGibanVectorLayer]
-class NongupSeisanGibanTileJSON(_BaseTile, TileJSONView):
-    layer_classes = [NongupSeisanGibanVectorLayer]
+    def get(self, request, *args, **kwargs):
+        # 타일 요청인데 커버리지 인덱스상 모든 레이어가 비어 있으면 DB/캐시 없이 바로 204
+        kw = self.kwargs
+        if "z" in kw and "dist" not in kw:
+            layer_ids = [cls.id for cls in self.get_layer_classes()]
+            if coverage.tile_is_empty(layer_ids, int(kw["z"]), int(kw["x"]), int(kw["y"])):
+                metrics.count_cache(self.get_metrics_label(layer_ids), "empty")
+                return coverage.empty_tile_response(self.content_type)
+        return super().get(request, *args, **kwargs)
+
+    def get_metrics_label(self, layer_ids):
+        return ",".join(layer_ids)
+
+    def split_archived(self, layers, z, x, y):
+        """(아카이브 타일 bytes 목록, 라이브 렌더링이 필요한 레이어 목록)"""
+        archived, live = [], []
+        for lyr in layers:
+            if not lyr.check_in_zoom_levels(z) or not coverage.may_contain(lyr.id, z, x, y):
+                continue
+            # 아카이브에는 전체 모드 타일만 있다
+            # 아카이브를 만든 뒤 원본/파생 테이블이 바뀌었으면(버전 불일치) 라이브로
+            data = (
+                tile_archive.read_tile(lyr.id, z, x, y, tile_http.dataset_version([lyr]))
+                if lyr.is_archivable() and not lyr.is_lean() else None
+            )
+            if data is None:
+                live.append(lyr)
+            else:
+                archived.append(data)
+        return archived, live
+
+    def get_layer_tiles(self, z, x, y):
+        archived, live = self.split_archived(self.get_layers(), z, x, y)
+        return b"".join(archived + [lyr.get_tile(x, y, z) for lyr in live])
+
+    def get_render_sql(self, layers, z, x, y):
+        """라이브 렌더링 레이어의 (sql, params) — 느린 타일 기록용 (여러 레이어면 한 SELECT 로)"""
+        _, live = self.split_archived(layers, z, x, y)
+        parts = [lyr.get_tile_sql(x, y, z) for lyr in live]
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else union_tile_sql(parts)
+
+    def get_tile_path(self, layers):
+        return f"/{self.prefix_url}/{','.join(lyr.url_path for lyr in layers)}/{{z}}/{{x}}/{{y}}.pbf"
+
+    def get_tile_query(self, layers):
+        query = self.request.GET.copy()
+        query["v"] = tile_http.dataset_version(layers)
+        return query
+
+    def get_tile_url(self):
+        """TileJSON tiles 템플릿 — ?v=데이터 버전 을 붙여 타일을 immutable 로 캐시하게 한다"""
+        layers = self.get_layers()
+        return f"{self.get_tile_path(layers)}?{self.get_tile_query(layers).urlencode(safe=',')}"
+
+def tile_cache_key(layers, z, x, y):
+    """레이어 id + 좌표 + 레이어별 정규화된 요청 파라미터 (jm/own, dist/dissolve)"""
+    key = f"tile:{','.join(lyr.id for lyr in layers)}:{z}/{x}/{y}"
+    for lyr in layers:
+        params = lyr.cache_params()
+        if lyr.is_lean():
+            params += ";lean"
+        if params:
+            key += f":{lyr.id}[{params}]"
+    return key
+
+class _KeyCachedTile:
+    """
+    cache_page 대신 정규화된 키 + 데이터 버전으로 (ETag, 타일 bytes) 를 캐시.
+    (cache_page 는 원본 쿼리스트링을 키로 써서 파라미터 순서만 달라도 따로 렌더링한다)
+    If-None-Match 가 캐시된 ETag 와 같으면 렌더링 없이 304.
+    Server-Timing: cache(조회/저장) / db(SQL, ST_AsMVT 포함) / encode(SQL 조립·아카이브·결합·ETag)
+    """
+    def get_cache_key(self, layers, z, x, y):
+        return tile_cache_key(layers, z, x, y)
+
+    def get_cache_timeout(self, layers):
+        # 레이어 설정(cache_ttl) 중 가장 짧은 것
+        return min(lyr.cache_ttl for lyr in layers)
+
+    def get(self, request, z, x, y, *args, **kwargs):
+        timing = metrics.start()
+        layers = self.get_layers()
+        label = self.get_metrics_label([lyr.id for lyr in layers])
+        with metrics.phase("cache"):
+            version = tile_http.dataset_version(layers)
+            key = f"{self.get_cache_key(layers, z, x, y)}:v={tile_http.tile_version(layers, int(z), int(x), int(y))}"
+            cached = cache.get(key)
+        rendered = None
+        if cached is None:
+            with metrics.phase("encode", exclude=("db",)):
+                rendered = self.get_layer_tiles(int(z), int(x), int(y))
+            cached = tile_http.cache_entry(rendered)
+            with metrics.phase("cache"):
+                cache.set(key, cached, self.get_cache_timeout(layers))
+        metrics.count_cache(label, "miss" if rendered is not None else "hit")
+        response = tile_http.tile_response(request, cached, version, self.content_type)
+        metrics.observe(label, timing, content=rendered)
+        if rendered is not None:
+            lean.sample_savings(layers, int(z), int(x), int(y))
+        if rendered is not None and slow_tiles.is_slow(timing):
+            z, x, y = int(z), int(x), int(y)
+            slow_tiles.check(
+                label, timing, request, self.get_render_sql(layers, z, x, y),
+                layers=[lyr.id for lyr in layers], z=z, x=x, y=y,
+                size=len(rendered), features=feature_count(rendered),
+            )
+        return metrics.with_server_timing(response, timing)
+
+# ---- 레이어 타일 / TileJSON — urls.py 가 vector_layers.LAYERS 로 경로 생성 ----
+# /tiles/{url_path}/{z}/{x}/{y}.pbf  (이격: /tiles/{kind}_setback/{dist}/...)
+# /tiles/{id}.json
+class LayerTileView(_BaseTile, _KeyCachedTile, MVTView):
+    layer_id = None
+
+    def get_layer_classes(self):
+        return [LAYERS[self.layer_id]]
+
+    def get(self, request, z, x, y, *args, **kwargs):
+        if "dist" in self.kwargs:
+            try:
+                parse_dist(self.kwargs["dist"])
+            except Exception:
+                return HttpResponseBadRequest("invalid dist")
+        return super().get(request, z, x, y, *args, **kwargs)
+
+class LayerTileJSON(_BaseTile, TileJSONView):
+    layer_id = None
+
+    def __init__(self, **kwargs):
+        # TileJSONView.__init__ 은 View 가 as_view() 인자를 넣기 전에 레이어 줌 범위를 검사한다
+        self.layer_id = kwargs.get("layer_id", self.layer_id)
+        super().__init__(**kwargs)
+
+    def get_layer_classes(self):
+        return [LAYERS[self.layer_id]]
+
+
+# ---- Composite (여러 레이어를 한 타일로) --------------------------------
+# /tiles/composite/{z}/{x}/{y}.pbf?layers=road,jimok,nonglim
+# 요청된 레이어를 한 번의 SQL 왕복으로 만들고, 정규화된 레이어 집합으로 캐시한다.
+
+def composite_layer_ids(request):
+    return [lid for lid in canonical_values(request, "layers") if lid in VECTOR_LAYERS]
+
+class CompositeTileView(_BaseTile, _KeyCachedTile, MVTView):
+    def get_layer_ids(self):
+        return composite_layer_ids(self.request)
+
+    def get_metrics_label(self, layer_ids):
+        # 레이어 조합별로 나누면 시계열이 폭증하므로 하나로 (레이어별 feature 수는 따로 기록됨)
+        return "composite"
+
+    def get_layer_classes(self):
+        return [VECTOR_LAYERS[lid] for lid in self.get_layer_ids()]
+
+    def get_layer_tiles(self, z, x, y):
+        archived, live = self.split_archived(self.get_layers(), z, x, y)
+        if live:
+            archived.append(fetch_tile(*union_tile_sql([lyr.get_tile_sql(x, y, z) for lyr in live])))
+        return b"".join(archived)
+
+    def get(self, request, z, x, y, *args, **kwargs):
+        if not self.get_layer_ids():
+            return HttpResponseBadRequest("invalid layers")
+        return super().get(request, z, x, y, *args, **kwargs)
+
+# /tiles/composite.json?layers=road,jimok — tiles[0] 은 정규화된 ?layers= 와 ?v= 가 붙은 복합 타일 템플릿
+class CompositeTileJSON(_BaseTile, TileJSONView):
+    def get_layer_classes(self):
+        # TileJSONView.__init__ 은 요청 전에 부른다 (레이어 없음 → 기본 줌 범위)
+        request = getattr(self, "request", None)
+        return [VECTOR_LAYERS[lid] for lid in composite_layer_ids(request)] if request is not None else []
+
+    def get_tile_path(self, layers):
+        return f"/{self.prefix_url}/composite/{{z}}/{{x}}/{{y}}.pbf"
+
+    def get_tile_query(self, layers):
+        query = super().get_tile_query(layers)
+        query["layers"] = ",".join(lyr.id for lyr in layers)
+        return query
+
+    def get(self, request, *args, **kwargs):
+        if not self.get_layer_classes():
+            return HttpResponseBadRequest("invalid layers")
+        return super().get(request, *args, **kwargs)
 
 
 # ---------------------------------------------------------------------
 # VWorld WMTS 프록시
 # ---------------------------------------------------------------------
-@cache_page(60 * 5)
 def vworld_wmts_proxy(request, layer, z, y, x, ext):
     key = getattr(settings, "VWORLD_KEY", "")
     if not key:
         return HttpResponseServerError("VWORLD_KEY not set")
 
-    LAYERS = {"Base", "Satellite", "Hybrid"}
-    EXTS = {"png", "jpeg"}
-    if layer not in LAYERS or ext not in EXTS:
+    if layer not in wmts_cache.LAYERS or ext not in wmts_cache.EXTS:
         return HttpResponseBadRequest("invalid layer/ext")
 
-    url = f"https://api.vworld.kr/req/wmts/1.0.0/{key}/{layer}/{z}/{y}/{x}.{ext}"
+    # 디스크 캐시(재검증 포함)에서 파일로 바로 스트리밍
+    timing = metrics.start()
+    t0 = timing.elapsed()
+    # (파일을 연 채로 받는다 — 경로만 받아 나중에 열면 그 사이 다른 워커의 LRU 삭제와 겹칠 수 있다)
     try:
-        r = requests.get(url, timeout=6)
-        resp = HttpResponse(r.content, status=r.status_code)
-        ctype = r.headers.get("Content-Type", "image/png")
-        resp["Content-Type"] = ctype
-        resp["Cache-Control"] = "public, max-age=300"
-        return resp
+        f, ctype, status, state = wmts_cache.get_cache().open_tile(layer, z, y, x, ext, key)
     except Exception as e:
         return HttpResponseServerError(str(e))
+    wmts_timing(timing, state, timing.elapsed() - t0)
+    if f is None:
+        resp = HttpResponse(status=status, content_type=ctype)
+    else:
+        resp = FileResponse(f, content_type=ctype or "image/png")
+        resp["Cache-Control"] = "public, max-age=86400"
+        resp["X-Tile-Cache"] = state
+    metrics.observe("vworld_wmts", timing, size=os.fstat(f.fileno()).st_size if f else None)
+    return metrics.with_server_timing(resp, timing)
+
+def wmts_timing(timing, state, seconds):
+    # 디스크 적중이면 cache, 재검증/원본 요청이면 upstream 단계
+    timing.add("cache" if state == wmts_cache.HIT else "upstream", seconds)
+    metrics.count_cache("vworld_wmts", state)
 
 # ---------------------------------------------------------------------
-# (유지) 도로이격(시각) GeoJSON
+# 도로/주거 이격 GeoJSON (bbox) — 표준 거리는 사전계산 테이블 사용
+#  - PostGIS 가 만든 Feature JSON 을 서버사이드 커서로 받아 그대로 스트리밍
+#    (fetchall/json.loads/재직렬화 없음, 메모리 사용량 일정)
+#  - 스트리밍 응답은 cache_page 대상이 아니므로 캐시 데코레이터는 두지 않는다
 # ---------------------------------------------------------------------
-@cache_page(60 * 5)
-def road_setback_geojson(request):
-    dist_raw = request.GET.get("dist", "50")
-    bbox_str = request.GET.get("bbox")
+GEOJSON_FETCH_SIZE = 500
+FEATURE_COLLECTION_HEAD, FEATURE_COLLECTION_TAIL = '{"type":"FeatureCollection","features":[', "]}"
+
+class _FeatureStream:
+    """
+    Feature JSON 행 → FeatureCollection 스트림.
+    close() 가 한 번만 커서/커넥션을 돌려주고 done(bytes, feature 수) 로 지표/느린 요청을 기록한다.
+    StreamingHttpResponse 가 close() 를 resource closer 로 등록하므로, 한 번도 순회하지 않은 응답
+    (클라이언트 중단, 미들웨어의 응답 교체)도 response.close() 에서 정리된다.
+    """
+    def __init__(self, cur, close, first_rows, done):
+        self.cur, self._close, self.first_rows, self.done = cur, close, first_rows, done
+        self.size, self.features = len(FEATURE_COLLECTION_HEAD) + len(FEATURE_COLLECTION_TAIL), 0
+        self.closed = False
+
+    def __iter__(self):
+        try:
+            yield FEATURE_COLLECTION_HEAD
+            rows, sep = self.first_rows, ""
+            while rows:
+                chunk = sep + ",".join(r[0] for r in rows)
+                self.size += len(chunk)
+                self.features += len(rows)
+                yield chunk
+                sep = ","
+                rows = self.cur.fetchmany(GEOJSON_FETCH_SIZE)
+            yield FEATURE_COLLECTION_TAIL
+        finally:
+            # 다 보냈으면 response.close() 를 기다리지 않고 바로 커넥션을 돌려준다
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._close()
+        finally:
+            self.done(self.size, self.features)
+
+
+def setback_geojson_args(request):
+    """(dist, bbox 또는 None, dissolve, z) — 잘못된 값이면 ValueError(메시지)."""
     try:
-        dist = float(dist_raw)
-        if dist <= 0:
-            raise ValueError
+        # 비동기 뷰와 같은 범위 (MIN_DIST~MAX_DIST) — nan/inf/과대값이 ST_Buffer 까지 가지 않게
+        dist = parse_dist(request.GET.get("dist", "50"))
     except Exception:
-        return JsonResponse({"error": "invalid dist"}, status=400)
-    if not bbox_str:
+        raise ValueError("invalid dist")
+    bbox_str = request.GET.get("bbox")
+    bbox = None
+    if bbox_str:
+        try:
+            bbox = [float(v) for v in bbox_str.split(",")]
+            if len(bbox) != 4:
+                raise ValueError
+        except Exception:
+            raise ValueError("invalid bbox")
+    # ?dissolve=1 : bbox 안 버퍼를 union 한 폴리곤만
+    # ?z=     : 줌에 맞춘 단순화/좌표 자릿수
+    dissolve = request.GET.get("dissolve") in ("1", "true")
+    try:
+        z = int(request.GET["z"]) if request.GET.get("z") else None
+    except ValueError:
+        raise ValueError("invalid z")
+    return dist, bbox, dissolve, z
+
+def _setback_geojson(request, kind):
+    try:
+        dist, bbox, dissolve, z = setback_geojson_args(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if bbox is None:
         return JsonResponse({"type": "FeatureCollection", "features": []})
+
+    timing = metrics.start()
+    with metrics.phase("encode"):
+        sql, params = setback_features_sql(kind, dist, bbox, dissolve=dissolve, z=z)
+    # 첫 배치까지는 응답 전에 받아 SQL 오류를 500 으로 돌려준다
+    # (Server-Timing 은 헤더라 첫 배치까지의 db 시간만 담긴다)
     try:
-        minx, miny, maxx, maxy = map(float, bbox_str.split(","))
-    except Exception:
-        return JsonResponse({"error": "invalid bbox"}, status=400)
-
-    ROAD_TABLE = 'filter."3.4_road_lsmd_cont_ui101_44_202508"'
-    sql = f"""
-        WITH bbox AS (
-          SELECT ST_Transform(ST_MakeEnvelope(%s,%s,%s,%s,4326),5186) AS g
-        ),
-        cand AS (
-          SELECT r.gid, r.geom
-          FROM {ROAD_TABLE} AS r, bbox
-          WHERE ST_Intersects(r.geom, bbox.g)
-        ),
-        buf AS (
-          SELECT gid, ST_Buffer(geom, %s) AS g
-          FROM cand
-        )
-        SELECT gid, ST_AsGeoJSON(ST_Transform(g,4326)) AS geojson
-        FROM buf
-    """
-    features = []
+        with metrics.phase("db"):
+            cur, close = db_pool.open_server_cursor(sql, params, name="setback_geojson")
+    except Exception as e:
+        return JsonResponse({"error": f"DB error: {e}"}, status=500)
     try:
-        with connection.cursor() as cur:
-            cur.execute(sql, [minx, miny, maxx, maxy, dist])
-            for gid, gj in cur.fetchall():
-                if not gj:
-                    continue
-                features.append({
-                    "type": "Feature",
-                    "properties": {"gid": gid, "dist": dist},
-                    "geometry": json.loads(gj)
-                })
+        with metrics.phase("db"):
+            first_rows = cur.fetchmany(GEOJSON_FETCH_SIZE)
     except Exception as e:
+        close()
         return JsonResponse({"error": f"DB error: {e}"}, status=500)
 
-    return JsonResponse({"type": "FeatureCollection", "features": features})
+    def done(size, features):
+        label = f"{kind}_setback_geojson"
+        metrics.observe(label, timing, size=size, features=features)
+        slow_tiles.check(label, timing, request, (sql, params), layers=[f"{kind}_setback"],
+                         size=size, features=features)
+
+    response = StreamingHttpResponse(
+        _FeatureStream(cur, close, first_rows, done),
+        content_type="application/json",
+    )
+    return metrics.with_server_timing(response, timing)
+
+# (유지) 도로이격(시각) GeoJSON
+def road_setback_geojson(request):
+    return _setback_geojson(request, "road")
 
-# ---------------------------------------------------------------------
 # ✅ 주거이격(제척) GeoJSON — (usability 필터/프룬 제거 버전)
-# ---------------------------------------------------------------------
-@cache_page(60 * 5)
 def resi_setback_geojson(request):
-    dist_raw = request.GET.get("dist", "50")
-    bbox_str = request.GET.get("bbox")
-    try:
-        dist = float(dist_raw)
-        if dist <= 0:
-            raise ValueError
-    except Exception:
-        return JsonResponse({"error": "invalid dist"}, status=400)
+    return _setback_geojson(request, "resi")
 
-    if not bbox_str:
-        return JsonResponse({"type": "FeatureCollection", "features": []})
-    try:
-        minx, miny, maxx, maxy = map(float, bbox_str.split(","))
-    except Exception:
-        return JsonResponse({"error": "invalid bbox"}, status=400)
-
-    RESI_TABLE = 'filter."3.4_f_fac_building_44_202509"'
-
-    sql = f"""
-        WITH bbox AS (
-          SELECT ST_Transform(
-                   ST_MakeEnvelope(%s,%s,%s,%s,4326),
-                   5186
-                 ) AS g
-        ),
-        cand AS (
-          SELECT r.gid, r.geom
-          FROM {RESI_TABLE} AS r, bbox
-          WHERE ST_Intersects(r.geom, bbox.g)
-        ),
-        buf AS (
-          SELECT gid, ST_Buffer(geom, %s) AS g
-          FROM cand
-        )
-        SELECT gid,
-               ST_AsGeoJSON(ST_Transform(g,4326)) AS geojson
-        FROM buf
-    """
 
-    features = []
+# ---------------------------------------------------------------------
+# 태양광 입지 적합성 조회 — /api/suitability/
+#   ?scenario=  (기본 settings.SUITABILITY_DEFAULT_SCENARIO)
+#   ?pnu=       필지 하나
+#   ?bbox=minx,miny,maxx,maxy (4326)  ?min_area=㎡  ?limit= (최대 1000)
+#   사용 가능 면적 큰 순
+# ---------------------------------------------------------------------
+SUITABILITY_MAX_LIMIT = 1000
+
+def suitability_api(request):
+    scenario = request.GET.get("scenario", settings.SUITABILITY_DEFAULT_SCENARIO)
     try:
-        with connection.cursor() as cur:
-            cur.execute(sql, [minx, miny, maxx, maxy, dist])
-            for gid, gj in cur.fetchall():
-                if not gj:
-                    continue
-                features.append({
-                    "type": "Feature",
-                    "properties": {"gid": gid, "dist": dist},
-                    "geometry": json.loads(gj)
-                })
-    except Exception as e:
-        return JsonResponse({"error": f"DB error: {e}"}, status=500)
+        suitability.parse_scenario(scenario)
+        min_area = float(request.GET.get("min_area", 0))
+        limit = max(1, min(int(request.GET.get("limit", 100)), SUITABILITY_MAX_LIMIT))
+        bbox = request.GET.get("bbox")
+        if bbox:
+            bbox = [float(v) for v in bbox.split(",")]
+            if len(bbox) != 4:
+                raise ValueError("bbox must be minx,miny,maxx,maxy")
+    except ValueError as e:
+        return JsonResponse({"error": str(e) or "invalid parameters"}, status=400)
+
+    qs = Suitability.objects.filter(scenario=scenario, usable_area__gte=min_area)
+    pnu = request.GET.get("pnu")
+    if pnu:
+        qs = qs.filter(pnu=pnu)
+    if bbox:
+        area = Polygon.from_bbox(bbox)
+        area.srid = 4326
+        qs = qs.filter(geom__intersects=area)
+    rows = list(
+        qs.order_by("-usable_area")
+          .values("gid", "pnu", "a20", "parcel_area", "usable_area", "usable_ratio")[:limit]
+    )
+    return JsonResponse({"scenario": scenario, "count": len(rows), "results": rows})
 
-    return JsonResponse({"type": "FeatureCollection", "features": features})
 
+# ---------------------------------------------------------------------
+# 식별 — /api/identify/?lon=&lat=  또는  ?pnu=
+#   필지 + 소유 속성 + 용도지역 + 이격 (SQL 한 번, PNU 단위 캐시)
+# ---------------------------------------------------------------------
+def identify_api(request):
+    pnu = request.GET.get("pnu", "").strip()
+    try:
+        if pnu:
+            result = identify.identify_pnu(pnu)
+        else:
+            lon, lat = float(request.GET["lon"]), float(request.GET["lat"])
+            if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+                raise ValueError
+            result = identify.identify_point(lon, lat)
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "pnu 또는 lon/lat 필요"}, status=400)
+    if result is None:
+        return JsonResponse({"error": "parcel not found"}, status=404)
+    return JsonResponse(result)
@@ -0,0 +1,318 @@
+# main/vworld.py
+# VWorld API 클라이언트
+#  - keep-alive 커넥션 풀 세션 (요청마다 새 연결 X)
+#  - 주소검색: 정규화된 키로 LRU+TTL 캐시 (메모리) + sqlite 영속 캐시 (재시작 후에도 유지)
+#  - 동일 질의가 동시에 들어오면 한 번만 upstream 호출 (single-flight)
+# upstream 주소는 settings.VWORLD_GEOCODE_URL 로 바꿀 수 있고, Geocoder 에 세션(requests)/클라이언트(httpx)를
+# 넘기면 스텁 어댑터·httpx.MockTransport 로 오프라인 테스트 가능 (main/tests.py).
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import metrics
+
+# ---------------------------------------------------------------------
+# 공용 세션 (커넥션 풀)
+# ---------------------------------------------------------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=getattr(settings, "VWORLD_POOL_SIZE", 32),
+                    max_retries=Retry(total=2, backoff_factor=0.2,
+                                      status_forcelist=(502, 503, 504),
+                                      allowed_methods=("GET",)),
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+# ---------------------------------------------------------------------
+# 비동기(ASGI) 경로용 httpx 클라이언트 (이벤트 루프당 하나)
+# ---------------------------------------------------------------------
+_async_client = None
+
+
+def get_async_client():
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        size = getattr(settings, "VWORLD_POOL_SIZE", 32)
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+    return _async_client
+
+
+# ---------------------------------------------------------------------
+# 주소검색 캐시
+# ---------------------------------------------------------------------
+_ws = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """NFC + 공백 정리 + 대소문자 무시 — '천안시  동남구 ' 와 '천안시 동남구' 는 같은 키."""
+    return _ws.sub(" ", unicodedata.normalize("NFC", query)).strip().casefold()
+
+
+class GeocodeCache:
+    """메모리 LRU(+TTL) 앞단, sqlite 영속 저장소 뒷단."""
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path, ttl, max_entries=2048, max_disk_entries=50000):
+        self.path = str(path) if path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+
+    def _conn(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache "
+                "(key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+        return self._db
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                value, expires = item
+                if expires > now:
+                    self._mem.move_to_end(key)
+                    return value
+                del self._mem[key]
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT value, expires FROM geocode_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires)
+            db = self._conn()
+            if db is None:
+                return
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires),
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    db.execute("DELETE FROM geocode_cache WHERE expires <= ?", (time.time(),))
+                    db.execute(
+                        "DELETE FROM geocode_cache WHERE key NOT IN "
+                        "(SELECT key FROM geocode_cache ORDER BY expires DESC LIMIT ?)",
+                        (self.max_disk_entries,),
+                    )
+
+    def _remember(self, key, value, expires):
+        self._mem[key] = (value, expires)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def __len__(self):
+        return len(self._mem)
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# Geocoder 통계 이름 -> /metrics 캐시 결과
+_CACHE_RESULTS = {"hits": "hit", "misses": "miss", "coalesced": "coalesced"}
+
+
+class Geocoder:
+    def __init__(self, cache, url, timeout=5, session=None, client=None):
+        self.cache = cache
+        self.url = url
+        self.timeout = timeout
+        # None 이면 공용 세션/클라이언트 (get_session, get_async_client)
+        self.session = session
+        self.client = client
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        if name in _CACHE_RESULTS:
+            metrics.count_cache("vworld_geocode", _CACHE_RESULTS[name])
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["memory_entries"] = len(self.cache)
+        return stats
+
+    def geocode(self, query, addr_type, key):
+        cache_key = f"{addr_type}:{normalize_query(query)}"
+        with metrics.phase("cache"):
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        with self._lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = _Flight()
+
+        if not leader:
+            # 같은 질의를 처리 중인 요청의 결과를 기다린다
+            self._count("coalesced")
+            if not flight.event.wait(self.timeout + 1):
+                raise TimeoutError("geocode timeout")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        self._count("misses")
+        try:
+            with metrics.phase("upstream"):
+                flight.result = self._fetch(query, addr_type, key)
+            if self._cacheable(flight.result):
+                self.cache.set(cache_key, flight.result)
+            return flight.result
+        except Exception as e:
+            self._count("errors")
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            flight.event.set()
+
+    def _params(self, query, addr_type, key):
+        return {
+            "service": "address",
+            "request": "getCoord",
+            "version": "2.0",
+            "crs": "EPSG:4326",
+            "format": "json",
+            "type": addr_type,
+            "address": query,
+            "key": key,
+        }
+
+    def _fetch(self, query, addr_type, key):
+        session = self.session or get_session()
+        r = session.get(self.url, params=self._params(query, addr_type, key), timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    @staticmethod
+    def _cacheable(result):
+        # 정상 응답(OK / NOT_FOUND)만 캐시 — ERROR(키 오류 등)는 다시 시도
+        return (result.get("response") or {}).get("status") in ("OK", "NOT_FOUND")
+
+    # ---- 비동기 (같은 캐시/통계 공유, single-flight 는 asyncio.Future) ----
+    async def ageocode(self, query, addr_type, key):
+        cache_key = f"{addr_type}:{normalize_query(query)}"
+        with metrics.phase("cache"):
+            cached = await sync_to_async(self.cache.get, thread_sensitive=False)(cache_key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        flights = self._async_inflight()
+        flight = flights.get(cache_key)
+        if flight is not None:
+            self._count("coalesced")
+            return await asyncio.wait_for(asyncio.shield(flight), self.timeout + 1)
+
+        self._count("misses")
+        flight = flights[cache_key] = asyncio.get_running_loop().create_future()
+        try:
+            with metrics.phase("upstream"):
+                client = self.client or get_async_client()
+                r = await client.get(
+                    self.url, params=self._params(query, addr_type, key), timeout=self.timeout
+                )
+            r.raise_for_status()
+            result = r.json()
+            if self._cacheable(result):
+                await sync_to_async(self.cache.set, thread_sensitive=False)(cache_key, result)
+            flight.set_result(result)
+            return result
+        except Exception as e:
+            self._count("errors")
+            flight.set_exception(e)
+            flight.exception()  # 기다리는 쪽이 없어도 'never retrieved' 경고가 나지 않게
+            raise
+        finally:
+            flights.pop(cache_key, None)
+
+    def _async_inflight(self):
+        loop = asyncio.get_running_loop()
+        inflight = getattr(self, "_async_flights", None)
+        if inflight is None or inflight[0] is not loop:
+            inflight = self._async_flights = (loop, {})
+        return inflight[1]
+
+
+_geocoder = None
+
+
+def get_geocoder():
+    global _geocoder
+    if _geocoder is None:
+        with _session_lock:
+            if _geocoder is None:
+                _geocoder = Geocoder(
+                    GeocodeCache(
+                        getattr(settings, "GEOCODE_CACHE_PATH", None),
+                        getattr(settings, "GEOCODE_CACHE_TTL", 60 * 60 * 24 * 7),
+                    ),
+                    getattr(settings, "VWORLD_GEOCODE_URL", "https://api.vworld.kr/req/address"),
+                )
+    return _geocoder
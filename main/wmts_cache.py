@@ -0,0 +1,276 @@
+# main/wmts_cache.py
+# VWorld WMTS 배경지도 디스크 캐시
+#  - {WMTS_CACHE_DIR}/{layer}/{z}/{y}/{x}.{ext}  + 옆에 .json (ETag/Last-Modified/Content-Type)
+#  - 신선기간이 지나면 If-None-Match / If-Modified-Since 로 재검증 (304 면 본문 재전송 없음)
+#  - 총 용량이 상한을 넘으면 가장 오래 안 쓴 타일부터 삭제 (읽을 때 mtime 갱신 = LRU)
+#    용량은 누계 카운터로 추적하고, 최초 스캔과 LRU 삭제는 백그라운드 스레드에서 돈다
+#    (요청 경로에서는 디렉터리 전체를 훑지 않는다)
+#  - upstream 실패 시 오래된 사본이라도 있으면 그걸 준다
+import json
+import os
+import threading
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .vworld import get_async_client, get_session
+
+WMTS_URL = "https://api.vworld.kr/req/wmts/1.0.0/{key}/{layer}/{z}/{y}/{x}.{ext}"
+LAYERS = {"Base", "Satellite", "Hybrid"}
+EXTS = {"png", "jpeg"}
+
+HIT, REVALIDATED, MISS, STALE = "hit", "revalidated", "miss", "stale"
+
+
+class WMTSCache:
+    def __init__(self, root, max_bytes, fresh_seconds, timeout=6):
+        self.root = str(root)
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.timeout = timeout
+        self._size = 0  # 바이트 누계 — 최초 스캔 결과가 백그라운드에서 더해진다
+        self._scan_started = False
+        self._scanned = False
+        self._evicting = False
+        self._lock = threading.Lock()
+
+    def tile_path(self, layer, z, y, x, ext):
+        return os.path.join(self.root, layer, str(z), str(y), f"{x}.{ext}")
+
+    # -----------------------------------------------------------------
+    def _begin(self, layer, z, y, x, ext, key):
+        """(경로, meta, 신선하면 결과 튜플, upstream URL, 조건부 헤더)"""
+        path = self.tile_path(layer, z, y, x, ext)
+        meta = self._read_meta(path)
+        if meta and time.time() - meta.get("fetched", 0) < self.fresh_seconds:
+            self._touch(path)
+            return path, meta, (path, meta.get("content_type"), 200, HIT), None, None
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        url = WMTS_URL.format(key=key, layer=layer, z=z, y=y, x=x, ext=ext)
+        return path, meta, None, url, headers
+
+    def _not_modified(self, path, meta):
+        meta["fetched"] = time.time()
+        self._write_meta(path, meta)
+        self._touch(path)
+        return path, meta.get("content_type"), 200, REVALIDATED
+
+    def _unusable(self, path, meta, status, ctype):
+        if meta:
+            return path, meta.get("content_type"), 200, STALE
+        return None, ctype, status, MISS
+
+    def _stored(self, path, headers, ctype, size):
+        self._write_meta(path, {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content_type": ctype,
+            "fetched": time.time(),
+        })
+        self._account(size)
+        return path, ctype, 200, MISS
+
+    def fetch(self, layer, z, y, x, ext, key):
+        """
+        (경로 또는 None, content_type, status, 캐시상태).
+        경로가 None 이면 upstream 오류 응답 — status 를 그대로 돌려준다.
+        """
+        path, meta, fresh, url, headers = self._begin(layer, z, y, x, ext, key)
+        if fresh:
+            return fresh
+        try:
+            r = get_session().get(url, headers=headers, timeout=self.timeout, stream=True)
+        except Exception:
+            if meta:
+                return path, meta.get("content_type"), 200, STALE
+            raise
+
+        with r:
+            if r.status_code == 304 and meta:
+                return self._not_modified(path, meta)
+            ctype = r.headers.get("Content-Type", "image/png")
+            if r.status_code != 200 or not ctype.startswith("image/"):
+                return self._unusable(path, meta, r.status_code, ctype)
+            size = self._write_body(path, r.iter_content(64 * 1024))
+        return self._stored(path, r.headers, ctype, size)
+
+    def open_tile(self, layer, z, y, x, ext, key, attempts=2):
+        """
+        fetch() + 파일 열기 -> (열린 파일 또는 None, content_type, status, 캐시상태).
+        fetch 와 open 사이에 다른 워커의 LRU 삭제로 파일이 사라지면 다시 받는다
+        (메타도 같이 지워지므로 다음 fetch 는 upstream 에서 새로 받는다).
+        """
+        for attempt in range(attempts):
+            path, ctype, status, state = self.fetch(layer, z, y, x, ext, key)
+            if path is None:
+                return None, ctype, status, state
+            try:
+                return open(path, "rb"), ctype, status, state
+            except OSError:
+                if attempt == attempts - 1:
+                    raise
+
+    async def afetch(self, layer, z, y, x, ext, key):
+        """
+        fetch() 의 비동기판 (httpx) — 디스크 구조/메타는 동일.
+        이벤트 루프에서는 upstream 스트림만 돌고, 메타/본문 읽기·쓰기는 스레드로 넘긴다.
+        """
+        path, meta, fresh, url, headers = await _off_loop(self._begin)(layer, z, y, x, ext, key)
+        if fresh:
+            return fresh
+        try:
+            async with get_async_client().stream("GET", url, headers=headers, timeout=self.timeout) as r:
+                if r.status_code == 304 and meta:
+                    return await _off_loop(self._not_modified)(path, meta)
+                ctype = r.headers.get("Content-Type", "image/png")
+                if r.status_code != 200 or not ctype.startswith("image/"):
+                    return self._unusable(path, meta, r.status_code, ctype)
+                body = [chunk async for chunk in r.aiter_bytes(64 * 1024)]
+        except httpx.HTTPError:
+            if meta:
+                return path, meta.get("content_type"), 200, STALE
+            raise
+        size = await _off_loop(self._write_body)(path, body)
+        return await _off_loop(self._stored)(path, r.headers, ctype, size)
+
+    async def aread_tile(self, layer, z, y, x, ext, key, attempts=2):
+        """open_tile() 의 비동기판 -> (본문 bytes 또는 None, content_type, status, 캐시상태)"""
+        for attempt in range(attempts):
+            path, ctype, status, state = await self.afetch(layer, z, y, x, ext, key)
+            if path is None:
+                return None, ctype, status, state
+            try:
+                return await _off_loop(_read_file)(path), ctype, status, state
+            except OSError:
+                if attempt == attempts - 1:
+                    raise
+
+    # -----------------------------------------------------------------
+    def _read_meta(self, path):
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(path) else None
+
+    def _write_meta(self, path, meta):
+        tmp = f"{path}.json.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path + ".json")
+
+    def _write_body(self, path, chunks):
+        # 임시 파일로 받아서 교체 (읽는 쪽은 항상 완전한 파일만 본다)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        size = 0
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        old = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp, path)
+        return size - old
+
+    def _touch(self, path):
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    # ---- 용량 상한 / LRU 삭제 -----------------------------------------
+    def _scan(self):
+        files = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".json") or name.endswith(".tmp"):
+                    continue
+                p = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, p))
+        return files
+
+    def _account(self, delta):
+        """요청 경로에서는 카운터만 갱신 — 스캔/삭제는 백그라운드 스레드에 맡긴다"""
+        with self._lock:
+            self._size += delta
+            if not self._scan_started:
+                self._scan_started = True
+                _spawn(self._initial_scan)
+            elif self._scanned and self._size > self.max_bytes and not self._evicting:
+                self._evicting = True
+                _spawn(self._evict)
+
+    def _initial_scan(self):
+        # 스캔 중에 쓰인 타일은 누계와 스캔 양쪽에 잡힐 수 있다 — 약간 크게 잡히는 쪽이라 무해,
+        # 다음 LRU 삭제 때 실제 값으로 맞춰진다
+        total = sum(size for _, size, _ in self._scan())
+        with self._lock:
+            self._size += total
+            self._scanned = True
+            if self._size <= self.max_bytes or self._evicting:
+                return
+            self._evicting = True
+        self._evict()
+
+    def _evict(self):
+        try:
+            with self._lock:
+                before = self._size
+            files = sorted(self._scan())
+            total = sum(size for _, size, _ in files)
+            target = self.max_bytes * 0.9
+            for _, size, p in files:
+                if total <= target:
+                    break
+                for victim in (p, p + ".json"):
+                    try:
+                        os.remove(victim)
+                    except OSError:
+                        pass
+                total -= size
+            with self._lock:
+                # 실제 디스크 합계로 보정하되, 삭제 도중 들어온 증감은 살린다
+                self._size = total + (self._size - before)
+        finally:
+            with self._lock:
+                self._evicting = False
+
+
+def _spawn(target):
+    threading.Thread(target=target, name="wmts-cache", daemon=True).start()
+
+
+def _off_loop(func):
+    return sync_to_async(func, thread_sensitive=False)
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = WMTSCache(
+            settings.WMTS_CACHE_DIR,
+            getattr(settings, "WMTS_CACHE_MAX_BYTES", 2 * 1024 ** 3),
+            getattr(settings, "WMTS_CACHE_FRESH", 60 * 60 * 24 * 7),
+        )
+    return _cache
@@ -26,7 +26,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.middleware.gzip.GZipMiddleware',
+    # GZipMiddleware + 압축 시간을 Server-Timing 에 추가 (main/metrics.py)
+    'main.metrics.ServerTimingGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -59,11 +60,15 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.contrib.gis.db.backends.postgis',
-        'NAME': 'autosolar1',
+        # 벤치마크 fixture DB 로 바꿀 때: DB_NAME=autosolar_bench (manage.py load_bench_fixture)
+        'NAME': os.getenv("DB_NAME", "autosolar1"),
         'USER': 'postgres',
         'PASSWORD': '1234',
         'HOST': 'localhost',
         'PORT': '5432',
+        # 요청마다 새 커넥션을 열지 않도록 유지 (타일 경로는 아래 TILE_DB_POOL 사용)
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -86,6 +91,46 @@ STATIC_URL = '/static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 오프라인 타일 아카이브(MBTiles) 경로 — manage.py build_tile_archive 로 생성
+TILE_ARCHIVE_DIR = BASE_DIR / "tile_archive"
+
+# 레이어별 타일 커버리지 인덱스 (manage.py build_coverage, 테이블 재적재 시 자동 재생성)
+COVERAGE_DIR = TILE_ARCHIVE_DIR / "coverage"
+COVERAGE_CHECK_SECONDS = 60          # 원본 테이블 지문 확인 주기
+COVERAGE_AUTO_REBUILD = True         # 지문이 바뀌면 백그라운드 스레드로 다시 생성
+EMPTY_TILE_MAX_AGE = 60 * 60 * 24    # 데이터 밖 빈 타일 Cache-Control
+
+# 타일 HTTP 캐시 — ETag(내용 해시) + 데이터 버전(원본 테이블 지문)
+TILE_MAX_AGE = 60 * 5                # ?v= 없는 요청의 Cache-Control max-age (이후 ETag 재검증)
+TILE_GZIP_LEVEL = 6                  # 캐시에 넣을 때 한 번만 압축 (main/tile_http.py)
+TILE_BROTLI_QUALITY = 5              # Brotli 미설치면 gzip 만
+TILE_VERSION_CHECK_SECONDS = 60      # 원본 테이블 지문(버전) 확인 주기
+
+# 태양광 입지 적합성 기본 시나리오 (manage.py build_suitability 기본값과 같게)
+SUITABILITY_DEFAULT_SCENARIO = "road50_resi100_nonglim-nongupjinheung-nongupseisangiban"
+
+# 느린 타일 기록 (admin "Slow tiles" / manage.py slow_tiles) — 0 이면 끔
+SLOW_TILE_MS = 1000                  # 이 시간(ms) 이상 걸린 타일/이격 응답을 기록
+SLOW_TILE_EXPLAIN_SAMPLE = 0.2       # 기록 중 EXPLAIN (ANALYZE, BUFFERS) 를 뜰 비율
+SLOW_TILE_EXPLAIN_TIMEOUT = 30       # EXPLAIN statement_timeout (초)
+SLOW_TILE_KEEP = 1000                # 최근 N 건만 유지
+
+# 운영 통계 (/metrics, /api/dbpool/stats/, /api/geocode/stats/) — 스태프 로그인 또는 이 IP 만
+#   Prometheus 가 다른 호스트에서 수집하면 METRICS_ALLOWED_IPS=127.0.0.1,10.0.0.5 처럼 추가
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()
+]
+
+# 데이터셋 릴리스 레지스트리 (manage.py swap_dataset) — 데이터셋마다 최근 N 개 릴리스 기록 유지
+#   (더 오래된 기록이 지워지면 그 뒤로 안 바뀐 타일도 캐시 키가 한 번 바뀐다)
+DATASET_RELEASE_KEEP = 12
+
+# ?lean=1 경량 타일 — 렌더링한 경량 타일 중 이 비율만 전체 모드로도 렌더링해 절감 bytes 를 /metrics 에
+LEAN_SAVINGS_SAMPLE = 0.02
+
+# /api/identify/ 결과 캐시 (PNU 단위, 키에 테이블 버전 포함)
+IDENTIFY_CACHE_TIMEOUT = 60 * 60
+
 # library path 지정
 GDAL_LIBRARY_PATH = "C:/OSGeo4W/bin/gdal311.dll"
 
@@ -94,3 +139,25 @@ load_dotenv(BASE_DIR / ".env")  # 프로젝트 루트의 .env 로드
 
 # vworld key 지정 (.env에 VWORLD_KEY=... 로 저장 권장)
 VWORLD_KEY = os.getenv("VWORLD_KEY","")
+
+# VWorld 주소검색 — URL 을 로컬 스텁으로 바꾸면 오프라인 테스트 가능
+VWORLD_GEOCODE_URL = os.getenv("VWORLD_GEOCODE_URL", "https://api.vworld.kr/req/address")
+GEOCODE_CACHE_PATH = BASE_DIR / "cache" / "geocode.sqlite3"
+GEOCODE_CACHE_TTL = 60 * 60 * 24 * 7  # 7일
+
+# VWorld WMTS 디스크 캐시 — manage.py seed_wmts 로 충남 범위 미리 채우기
+WMTS_CACHE_DIR = BASE_DIR / "cache" / "wmts"
+WMTS_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2GB, 초과 시 LRU 삭제
+WMTS_CACHE_FRESH = 60 * 60 * 24 * 7   # 7일 후 ETag/Last-Modified 재검증
+
+# ASGI(uvicorn 등)로 띄울 때 타일/이격/VWorld 경로를 비동기 뷰로 서비스
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "") == "1"
+ASYNC_LAYER_CONCURRENCY = 4  # 레이어(엔드포인트)별 동시 DB/upstream 요청 수
+
+# 타일/이격 SQL 을 psycopg_pool 풀 + prepared statement 로 실행 (통계: /api/dbpool/stats/)
+TILE_DB_POOL = True
+
+# psycopg_pool 커넥션 풀 크기
+DB_POOL_MIN_SIZE = 2
+DB_POOL_MAX_SIZE = 20
+DB_POOL_TIMEOUT = 10  # 풀에서 커넥션을 기다리는 최대 시간(초)
@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', include('main.urls')),
-]
\ No newline at end of file
+]
+
+# ASGI 배포: 타일/이격/VWorld 경로를 비동기 뷰로 (같은 URL, 먼저 매칭)
+if settings.ASYNC_VIEWS:
+    urlpatterns.append(path('', include('main.async_urls')))
+
+urlpatterns.append(path('', include('main.urls')))
\ No newline at end of file